@@ -8,6 +8,7 @@ class AsyncPoller extends LitElement {
     triggerEvent: {type: String},
     action: {type: Object},
     polling_interval: {type: Number},
+    live: {type: Boolean},
   };
 
   render() {
@@ -19,9 +20,10 @@ class AsyncPoller extends LitElement {
       return;
     }
     if (this.action) {
+      // Live updates start streaming right away.
       setTimeout(() => {
         this.runTimeout(this.action)
-      }, this.polling_interval * 1000);
+      }, this.live ? 0 : this.polling_interval * 1000);
     }
   }
 
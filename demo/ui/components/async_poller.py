@@ -19,6 +19,7 @@ def async_poller(
     trigger_event: Callable[[mel.WebEvent], Any],
     action: AsyncAction | None = None,
     key: str | None = None,
+    live: bool = False,
 ):
     """Creates an invisible component that will delay state changes asynchronously.
 
@@ -34,6 +35,9 @@ def async_poller(
     The other benefit of this component is that it works generically (rather than
     say implementing a custom snackbar widget as a web component).
 
+    In live mode the event fires right away and then once per duration, each
+    time starting a handler that streams updates for that long.
+
     Returns:
       The web component that was created.
     """
@@ -46,5 +50,6 @@ def async_poller(
         properties={
             'polling_interval': action.duration_seconds if action else 1,
             'action': asdict(action) if action else {},
+            'live': live,
         },
     )
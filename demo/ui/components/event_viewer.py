@@ -1,11 +1,38 @@
-import asyncio
-from typing import Tuple
+import time
 
 import mesop as me
-import pandas as pd
 
-from state.host_agent_service import GetEvents
-from state.host_agent_service import convert_event_to_state
+from state.host_agent_service import GetEventsAfter, convert_event_to_state
+from state.state import AppState, StateEvent
+
+
+# Events per page, only one page is held in state and rendered.
+EVENT_PAGE_SIZE = 50
+
+COLUMNS = ['Conversation ID', 'Actor', 'Role', 'Id', 'Content']
+GRID_COLUMNS = '2fr 1fr 1fr 2fr 4fr'
+
+TIME_WINDOWS = [
+    ('All time', '0'),
+    ('Last 5 minutes', '300'),
+    ('Last hour', '3600'),
+    ('Last day', '86400'),
+]
+
+
+@me.stateclass
+class EventViewerState:
+    """Filters and the current page of the event viewer"""
+
+    conversation_id: str = ''
+    actor: str = ''
+    # Seconds back from now, 0 for all events.
+    window: int = 0
+    events: list[StateEvent]
+    # The cursor each visited page was read after, the last is the current.
+    page_cursors: list[int]
+    next_cursor: int = 0
+    has_more: bool = False
 
 
 def flatten_content(content: list[tuple[str, str]]) -> str:
@@ -19,46 +46,191 @@ def flatten_content(content: list[tuple[str, str]]) -> str:
     return '\n'.join(parts)
 
 
+async def read_event_page(after: int = 0):
+    """Reads the page of events after the cursor into the viewer state."""
+    state = me.state(EventViewerState)
+    events, cursor = await GetEventsAfter(
+        after,
+        EVENT_PAGE_SIZE,
+        conversation_id=state.conversation_id or None,
+        actor=state.actor or None,
+        start_time=time.time() - state.window if state.window else None,
+    )
+    state.events = [convert_event_to_state(e) for e in events]
+    state.next_cursor = cursor
+    state.has_more = len(events) == EVENT_PAGE_SIZE
+
+
+async def load_first_event_page():
+    """Starts paging from the first matching event."""
+    me.state(EventViewerState).page_cursors = [0]
+    await read_event_page(0)
+
+
 @me.component
 def event_list():
     """Events list component"""
-    df_data = {
-        'Conversation ID': [],
-        'Actor': [],
-        'Role': [],
-        'Id': [],
-        'Content': [],
-    }
-    events = asyncio.run(GetEvents())
-    for e in events:
-        event = convert_event_to_state(e)
-        df_data['Conversation ID'].append(event.context_id)
-        df_data['Role'].append(event.role)
-        df_data['Id'].append(event.id)
-        df_data['Content'].append(flatten_content(event.content))
-        df_data['Actor'].append(event.actor)
-    if not df_data['Conversation ID']:
+    state = me.state(EventViewerState)
+    event_filters(state)
+    if not state.events:
         me.text('No events found')
-        return
-    df = pd.DataFrame(
-        pd.DataFrame(df_data),
-        columns=['Conversation ID', 'Actor', 'Role', 'Id', 'Content'],
-    )
+    else:
+        event_table(state.events)
+    with me.box(
+        style=me.Style(
+            display='flex',
+            flex_direction='row',
+            align_items='center',
+            gap=10,
+            margin=me.Margin(top=10),
+        )
+    ):
+        me.button(
+            'Previous',
+            on_click=previous_page,
+            disabled=len(state.page_cursors) <= 1,
+        )
+        me.text(f'Page {max(len(state.page_cursors), 1)}')
+        me.button('Next', on_click=next_page, disabled=not state.has_more)
+        with me.content_button(type='raised', on_click=refresh_page):
+            me.icon('refresh')
+
+
+def event_filters(state: EventViewerState):
+    app_state = me.state(AppState)
     with me.box(
         style=me.Style(
             display='flex',
-            justify_content='space-between',
-            flex_direction='column',
+            flex_direction='row',
+            align_items='center',
+            gap=10,
         )
     ):
-        me.table(
-            df,
-            header=me.TableHeader(sticky=True),
-            columns={
-                'Conversation ID': me.TableColumn(sticky=True),
-                'Actor': me.TableColumn(sticky=True),
-                'Role': me.TableColumn(sticky=True),
-                'Id': me.TableColumn(sticky=True),
-                'Content': me.TableColumn(sticky=True),
-            },
+        me.select(
+            label='Conversation',
+            options=[me.SelectOption(label='All', value='')]
+            + [
+                me.SelectOption(
+                    label=c.conversation_name or c.conversation_id,
+                    value=c.conversation_id,
+                )
+                for c in app_state.conversations
+            ],
+            value=state.conversation_id,
+            on_selection_change=on_conversation_change,
+        )
+        me.input(
+            label='Actor',
+            value=state.actor,
+            on_enter=on_actor_enter,
+            on_blur=on_actor_blur,
+        )
+        me.select(
+            label='Time',
+            options=[
+                me.SelectOption(label=label, value=value)
+                for label, value in TIME_WINDOWS
+            ],
+            value=str(state.window),
+            on_selection_change=on_window_change,
         )
+
+
+def event_table(events: list[StateEvent]):
+    """Renders the page of events as a grid.
+
+    Only the current page is ever in state or in the DOM, however long the
+    event log is, and rows scroll inside a fixed height viewport.
+    """
+    cell = me.Style(
+        padding=me.Padding.all(8),
+        border=me.Border(
+            bottom=me.BorderSide(
+                width=1, style='solid', color=me.theme_var('outline-variant')
+            )
+        ),
+        overflow_x='hidden',
+        text_overflow='ellipsis',
+    )
+    with me.box(
+        style=me.Style(
+            display='grid',
+            grid_template_columns=GRID_COLUMNS,
+            max_height='70vh',
+            overflow_y='auto',
+        )
+    ):
+        for column in COLUMNS:
+            me.text(
+                column,
+                style=me.Style(
+                    padding=me.Padding.all(8),
+                    font_weight='bold',
+                    position='sticky',
+                    top=0,
+                    background=me.theme_var('surface'),
+                ),
+            )
+        for event in events:
+            me.text(event.context_id, style=cell)
+            me.text(event.actor, style=cell)
+            me.text(event.role, style=cell)
+            me.text(event.id, style=cell)
+            me.text(
+                flatten_content(event.content),
+                style=me.Style(
+                    padding=cell.padding,
+                    border=cell.border,
+                    white_space='pre-wrap',
+                    max_height=120,
+                    overflow_y='auto',
+                ),
+            )
+
+
+async def on_conversation_change(e: me.SelectSelectionChangeEvent):
+    me.state(EventViewerState).conversation_id = e.value
+    await load_first_event_page()
+    yield
+
+
+async def on_window_change(e: me.SelectSelectionChangeEvent):
+    me.state(EventViewerState).window = int(e.value)
+    await load_first_event_page()
+    yield
+
+
+async def on_actor_enter(e: me.InputEnterEvent):
+    me.state(EventViewerState).actor = e.value.strip()
+    await load_first_event_page()
+    yield
+
+
+async def on_actor_blur(e: me.InputBlurEvent):
+    state = me.state(EventViewerState)
+    if state.actor == e.value.strip():
+        return
+    state.actor = e.value.strip()
+    await load_first_event_page()
+    yield
+
+
+async def next_page(e: me.ClickEvent):  # pylint: disable=unused-argument
+    state = me.state(EventViewerState)
+    state.page_cursors.append(state.next_cursor)
+    await read_event_page(state.next_cursor)
+    yield
+
+
+async def previous_page(e: me.ClickEvent):  # pylint: disable=unused-argument
+    state = me.state(EventViewerState)
+    if len(state.page_cursors) > 1:
+        state.page_cursors.pop()
+    await read_event_page(state.page_cursors[-1])
+    yield
+
+
+async def refresh_page(e: me.ClickEvent):  # pylint: disable=unused-argument
+    state = me.state(EventViewerState)
+    await read_event_page(state.page_cursors[-1] if state.page_cursors else 0)
+    yield
@@ -1,7 +1,11 @@
 import mesop as me
 import mesop.labs as mel
 
-from state.host_agent_service import UpdateAppState
+from state.host_agent_service import (
+    LIVE_WINDOW_SECONDS,
+    StreamAppState,
+    UpdateAppState,
+)
 from state.state import AppState
 from styles.styles import (
     MAIN_COLUMN_STYLE,
@@ -19,6 +23,12 @@ async def refresh_app_state(e: mel.WebEvent):  # pylint: disable=unused-argument
     """Refresh app state event handler"""
     yield
     app_state = me.state(AppState)
+    if app_state.polling_interval < 0:
+        async for _ in StreamAppState(
+            app_state, app_state.current_conversation_id
+        ):
+            yield
+        return
     await UpdateAppState(app_state, app_state.current_conversation_id)
     yield
 
@@ -27,14 +37,18 @@ async def refresh_app_state(e: mel.WebEvent):  # pylint: disable=unused-argument
 def page_scaffold():
     """Page scaffold component"""
     app_state = me.state(AppState)
+    live = app_state.polling_interval < 0
     action = (
         AsyncAction(
-            value=app_state, duration_seconds=app_state.polling_interval
+            value=app_state,
+            duration_seconds=LIVE_WINDOW_SECONDS
+            if live
+            else app_state.polling_interval,
         )
         if app_state
         else None
     )
-    async_poller(action=action, trigger_event=refresh_app_state)
+    async_poller(action=action, trigger_event=refresh_app_state, live=live)
 
     sidenav('')
 
@@ -17,6 +17,7 @@ def polling_buttons():
         me.button_toggle(
             value=[str(state.polling_interval)],
             buttons=[
+                me.ButtonToggleButton(label='Live', value='-1'),
                 me.ButtonToggleButton(label='1s', value='1'),
                 me.ButtonToggleButton(label='5s', value='5'),
                 me.ButtonToggleButton(label='30s', value='30'),
@@ -10,6 +10,7 @@ from contextlib import asynccontextmanager
 import mesop as me
 
 from components.api_key_dialog import api_key_dialog
+from components.event_viewer import load_first_event_page
 from components.page_scaffold import page_scaffold
 from dotenv import load_dotenv
 from fastapi import FastAPI
@@ -53,6 +54,14 @@ def on_load(e: me.LoadEvent):  # pylint: disable=unused-argument
         state.api_key_dialog_open = True
 
 
+async def on_event_list_load(e: me.LoadEvent):
+    """On load event of the event list, reads its first page"""
+    on_load(e)
+    yield
+    await load_first_event_page()
+    yield
+
+
 # Policy to allow the lit custom element to load
 security_policy = me.SecurityPolicy(
     allowed_script_srcs=[
@@ -103,7 +112,7 @@ def chat_page():
 @me.page(
     path='/event_list',
     title='Event List',
-    on_load=on_load,
+    on_load=on_event_list_load,
     security_policy=security_policy,
 )
 def event_page():
@@ -177,6 +186,7 @@ async def lifespan(app: FastAPI):
     )
     app.setup()
     yield
+    await agent_server.close()
     await httpx_client_wrapper.stop()
 
 if __name__ == '__main__':
@@ -1,9 +1,15 @@
+import asyncio
 import json
+import threading
 
+from collections.abc import AsyncIterator
 from typing import Any
 
 import httpx
 
+from httpx_sse import aconnect_sse
+from pydantic import BaseModel
+
 from service.types import (
     AgentClientHTTPError,
     AgentClientJSONError,
@@ -26,12 +32,76 @@ from service.types import (
     RegisterAgentResponse,
     SendMessageRequest,
     SendMessageResponse,
+    StateDelta,
 )
 
 
+class SharedHTTPClient:
+    """Process-wide httpx client that keeps its connections alive.
+
+    Mesop runs every event handler on an event loop of its own, while httpx
+    connections belong to the loop that opened them. The client therefore
+    runs on a dedicated loop thread: requests from any loop are handed to
+    it, so consecutive refreshes reuse the same pooled connections.
+    """
+
+    _instance: 'SharedHTTPClient | None' = None
+    _instance_lock = threading.Lock()
+
+    def __init__(
+        self,
+        timeout: float = 30,
+        limits: httpx.Limits | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        if limits is None:
+            limits = httpx.Limits(
+                max_connections=20, max_keepalive_connections=10
+            )
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever,
+            name='conversation-client',
+            daemon=True,
+        )
+        self._thread.start()
+        self._client = httpx.AsyncClient(
+            timeout=timeout, limits=limits, transport=transport
+        )
+
+    @classmethod
+    def instance(cls) -> 'SharedHTTPClient':
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    async def request(
+        self, method: str, url: str, **kwargs
+    ) -> httpx.Response:
+        future = asyncio.run_coroutine_threadsafe(
+            self._client.request(method, url, **kwargs), self._loop
+        )
+        return await asyncio.wrap_future(future)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request('POST', url, **kwargs)
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request('GET', url, **kwargs)
+
+    def close(self):
+        asyncio.run_coroutine_threadsafe(
+            self._client.aclose(), self._loop
+        ).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+
 class ConversationClient:
-    def __init__(self, base_url):
+    def __init__(self, base_url, http_client: SharedHTTPClient | None = None):
         self.base_url = base_url.rstrip('/')
+        self._http = http_client or SharedHTTPClient.instance()
 
     async def send_message(
         self, payload: SendMessageRequest
@@ -39,23 +109,27 @@ class ConversationClient:
         
         return SendMessageResponse(**await self._send_request(payload))
 
-    async def _send_request(self, request: JSONRPCRequest) -> dict[str, Any]:
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    self.base_url + '/' + request.method,
-                    json=request.model_dump(mode='json', exclude_none=True),
-                )
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                print("http error", e)
-                raise AgentClientHTTPError(
-                    e.response.status_code, str(e)
-                ) from e
-            except json.JSONDecodeError as e:
-                print("decode error", e)
-                raise AgentClientJSONError(str(e)) from e
+    async def _send_request(
+        self,
+        request: JSONRPCRequest,
+        query: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        try:
+            response = await self._http.post(
+                self.base_url + '/' + request.method,
+                json=request.model_dump(mode='json', exclude_none=True),
+                params=query,
+            )
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            print("http error", e)
+            raise AgentClientHTTPError(
+                e.response.status_code, str(e)
+            ) from e
+        except json.JSONDecodeError as e:
+            print("decode error", e)
+            raise AgentClientJSONError(str(e)) from e
 
     async def create_conversation(
         self, payload: CreateConversationRequest
@@ -65,15 +139,21 @@ class ConversationClient:
     async def list_conversation(
         self, payload: ListConversationRequest
     ) -> ListConversationResponse:
-        return ListConversationResponse(**await self._send_request(payload))
+        return ListConversationResponse(
+            **await self._send_request(payload, _query(payload.params))
+        )
 
     async def get_events(self, payload: GetEventRequest) -> GetEventResponse:
-        return GetEventResponse(**await self._send_request(payload))
+        return GetEventResponse(
+            **await self._send_request(payload, _query(payload.params))
+        )
 
     async def list_messages(
         self, payload: ListMessageRequest
     ) -> ListMessageResponse:
-        return ListMessageResponse(**await self._send_request(payload))
+        return ListMessageResponse(
+            **await self._send_request(payload, _query(payload.query))
+        )
 
     async def get_pending_messages(
         self, payload: PendingMessageRequest
@@ -81,7 +161,9 @@ class ConversationClient:
         return PendingMessageResponse(**await self._send_request(payload))
 
     async def list_tasks(self, payload: ListTaskRequest) -> ListTaskResponse:
-        return ListTaskResponse(**await self._send_request(payload))
+        return ListTaskResponse(
+            **await self._send_request(payload, _query(payload.params))
+        )
 
     async def register_agent(
         self, payload: RegisterAgentRequest
@@ -90,3 +172,66 @@ class ConversationClient:
 
     async def list_agents(self, payload: ListAgentRequest) -> ListAgentResponse:
         return ListAgentResponse(**await self._send_request(payload))
+
+    async def get_state_snapshot(
+        self,
+        since: int = 0,
+        conversation_id: str = '',
+        message_offset: int = 0,
+    ) -> StateDelta:
+        """Everything that changed after since, in one round trip."""
+        try:
+            response = await self._http.get(
+                self.base_url + '/state/snapshot',
+                params={
+                    'since': since,
+                    'conversation_id': conversation_id,
+                    'message_offset': message_offset,
+                },
+            )
+            response.raise_for_status()
+            return StateDelta.model_validate_json(response.content)
+        except httpx.HTTPStatusError as e:
+            raise AgentClientHTTPError(
+                e.response.status_code, str(e)
+            ) from e
+
+    async def stream_state(
+        self,
+        since: int = 0,
+        conversation_id: str = '',
+        message_offset: int = 0,
+        event_after: int | None = None,
+    ) -> AsyncIterator[StateDelta]:
+        """Yields a StateDelta each time the server state changes.
+
+        The stream stays open for as long as it is read, so it gets a
+        connection of its own rather than holding one of the pool's.
+        """
+        query: dict[str, Any] = {
+            'since': since,
+            'conversation_id': conversation_id,
+            'message_offset': message_offset,
+        }
+        if event_after is not None:
+            query['event_after'] = event_after
+        async with httpx.AsyncClient(timeout=None) as client:
+            try:
+                async with aconnect_sse(
+                    client,
+                    'GET',
+                    self.base_url + '/state/stream',
+                    params=query,
+                ) as event_source:
+                    event_source.response.raise_for_status()
+                    async for sse in event_source.aiter_sse():
+                        yield StateDelta.model_validate_json(sse.data)
+            except httpx.HTTPStatusError as e:
+                raise AgentClientHTTPError(
+                    e.response.status_code, str(e)
+                ) from e
+
+
+def _query(params: BaseModel | None) -> dict[str, Any] | None:
+    """Query string for the params of list and event requests."""
+    return params.model_dump(exclude_none=True) if params else None
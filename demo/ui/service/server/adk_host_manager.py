@@ -2,6 +2,7 @@ import base64
 import datetime
 import json
 import os
+import threading
 import uuid
 
 from typing import Optional, Tuple
@@ -31,14 +32,19 @@ from google.adk.events.event import Event as ADKEvent
 from google.adk.events.event_actions import EventActions as ADKEventActions
 from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
 from google.adk.sessions.in_memory_session_service import InMemorySessionService
+from google.adk.tools.tool_context import ToolContext
 from google.genai import types
-from hosts.multiagent.host_agent import HostAgent
+from hosts.multiagent.host_agent import HostAgent, RemoteUpdate
 from hosts.multiagent.remote_agent_connection import (
     TaskCallbackArg,
 )
 from utils.agent_card import get_agent_card
 
 from service.server.application_manager import ApplicationManager
+from service.server.artifact_assembler import ArtifactAssembler
+from service.server.change_tracker import ChangeTracker
+from service.server.event_log import EventLog
+from service.server.versioned_map import VersionedMap
 from service.types import Conversation, Event
 
 
@@ -56,17 +62,32 @@ class ADKHostManager(ApplicationManager):
         api_key: str = '',
         uses_vertex_ai: bool = False,
     ):
-        self._conversations: list[Conversation] = []
+        # Serializes writes to the state read by request threads.
+        self._lock = threading.RLock()
+        # Conversations and tasks are keyed by id, in insertion order. They
+        # are replaced, never mutated, once stored so that snapshots stay
+        # consistent.
+        self._conversations: VersionedMap[Conversation] = VersionedMap(
+            self._lock
+        )
         self._messages: list[Message] = []
-        self._tasks: list[Task] = []
-        self._events: dict[str, Event] = {}
-        self._pending_message_ids: list[str] = []
+        self._tasks: VersionedMap[Task] = VersionedMap(self._lock)
+        # Message ids already in each task's history, by task id.
+        self._task_history_ids: dict[str, set[str]] = {}
+        self._events = EventLog()
+        self._changes = ChangeTracker()
+        # Used as an insertion ordered set.
+        self._pending_message_ids: VersionedMap[None] = VersionedMap(
+            self._lock
+        )
         self._agents: list[AgentCard] = []
-        self._artifact_chunks: dict[str, list[Artifact]] = {}
+        self._artifacts = ArtifactAssembler()
         self._session_service = InMemorySessionService()
         self._artifact_service = InMemoryArtifactService()
         self._memory_service = InMemoryMemoryService()
-        self._host_agent = HostAgent([], http_client, self.task_callback)
+        self._host_agent = HostAgent(
+            [], http_client, self.task_callback, part_callback=self.relay_parts
+        )
         self._context_to_conversation: dict[str, str] = {}
         self.user_id = 'test_user'
         self.app_name = 'A2A'
@@ -110,7 +131,9 @@ class ADKHostManager(ApplicationManager):
         )
         conversation_id = session.id
         c = Conversation(conversation_id=conversation_id, is_active=True)
-        self._conversations.append(c)
+        with self._lock:
+            self._conversations.set(conversation_id, c)
+            self._changes.touch('conversations', conversation_id)
         return c
 
     def update_api_key(self, api_key: str):
@@ -135,24 +158,19 @@ class ADKHostManager(ApplicationManager):
             # Check if the last event in the conversation was tied to a task.
             if conversation.messages:
                 task_id = conversation.messages[-1].taskId
-                if task_id and task_still_open(
-                    next(
-                        filter(lambda x: x and x.id == task_id, self._tasks),
-                        None,
-                    )
-                ):
+                if task_id and task_still_open(self._tasks.get(task_id)):
                     message.taskId = task_id
         return message
 
     async def process_message(self, message: Message):
         message_id = message.messageId
         if message_id:
-            self._pending_message_ids.append(message_id)
+            with self._lock:
+                self._pending_message_ids.set(message_id, None)
+                self._changes.touch('pending', message_id)
         context_id = message.contextId
-        conversation = self.get_conversation(context_id)
         self._messages.append(message)
-        if conversation:
-            conversation.messages.append(message)
+        self._append_to_conversation(context_id, message)
         self.add_event(
             Event(
                 id=str(uuid.uuid4()),
@@ -216,36 +234,118 @@ class ADKHostManager(ApplicationManager):
                 final_event.content, context_id, task_id
             )
             self._messages.append(response)
+            self._append_to_conversation(context_id, response)
+        with self._lock:
+            self._pending_message_ids.pop(message_id, None)
+            self._changes.touch('pending', message_id)
 
-        if conversation and response:
-            conversation.messages.append(response)
-        self._pending_message_ids.remove(message_id)
+    def _append_to_conversation(
+        self, conversation_id: str | None, message: Message
+    ):
+        """Replaces the conversation with a copy that ends with message."""
+        with self._lock:
+            conversation = self.get_conversation(conversation_id)
+            if not conversation:
+                return
+            self._conversations.set(
+                conversation.conversation_id,
+                conversation.model_copy(
+                    update={'messages': [*conversation.messages, message]}
+                ),
+            )
+            self._changes.touch('conversations', conversation_id)
+
+    async def relay_parts(
+        self, agent_name: str, update: RemoteUpdate, tool_context: ToolContext
+    ):
+        """Shows a remote agent's output in the conversation as it streams.
+
+        Each delegation gets one message, keyed by the tool call, ahead of
+        the host's reply. Appended chunks extend it, other updates replace
+        its parts with what the agent says now. Every update bumps the
+        message's change version, so synced UIs fetch it again.
+        """
+        context_id = tool_context.state.get('context_id')
+        message_id = tool_context.function_call_id or agent_name
+        with self._lock:
+            conversation = self.get_conversation(context_id)
+            if not conversation:
+                return
+            messages = conversation.messages
+            if messages and messages[-1].messageId == message_id:
+                messages, last = messages[:-1], messages[-1]
+                parts = merge_parts(
+                    last.parts if update.append else [], update.parts
+                )
+                message = last.model_copy(update={'parts': parts})
+            else:
+                message = Message(
+                    messageId=message_id,
+                    role=Role.agent,
+                    parts=merge_parts([], update.parts),
+                    contextId=context_id,
+                    taskId=tool_context.state.get('task_id'),
+                )
+            self._conversations.set(
+                conversation.conversation_id,
+                conversation.model_copy(
+                    update={'messages': [*messages, message]}
+                ),
+            )
+            self._changes.touch('messages', message_id)
+            self._changes.touch('conversations', context_id)
 
     def add_task(self, task: Task):
-        self._tasks.append(task)
+        with self._lock:
+            self._index_history(task)
+            self._store_task(task)
 
     def update_task(self, task: Task):
-        for i, t in enumerate(self._tasks):
-            if t.id == task.id:
-                self._tasks[i] = task
+        with self._lock:
+            current = self._tasks.get(task.id)
+            if current is None:
                 return
+            if current is not task:
+                self._index_history(task)
+            self._store_task(task)
+
+    def _store_task(self, task: Task):
+        self._tasks.set(task.id, task)
+        self._changes.touch('tasks', task.id)
+
+    def _index_history(self, task: Task):
+        self._task_history_ids[task.id] = {
+            m.messageId for m in task.history or [] if m.messageId
+        }
 
     def task_callback(self, task: TaskCallbackArg, agent_card: AgentCard):
+        with self._lock:
+            return self._apply_task_update(task, agent_card)
+
+    def _apply_task_update(
+        self, task: TaskCallbackArg, agent_card: AgentCard
+    ):
         self.emit_event(task, agent_card)
+        self._expire_artifacts()
+        # Updates go to a copy of the stored task, which then replaces it.
         if isinstance(task, TaskStatusUpdateEvent):
-            current_task = self.add_or_get_task(task)
+            current_task = self.add_or_get_task(task).model_copy()
             current_task.status = task.status
             self.attach_message_to_task(task.status.message, current_task.id)
             self.insert_message_history(current_task, task.status.message)
-            self.update_task(current_task)
+            if task.final:
+                # Artifacts still streaming will get no more chunks.
+                for artifact in self._artifacts.close_task(current_task.id):
+                    self._put_artifact(current_task, artifact)
+            self._store_task(current_task)
             return current_task
         elif isinstance(task, TaskArtifactUpdateEvent):
-            current_task = self.add_or_get_task(task)
-            self.process_artifact_event(current_task, task)
-            self.update_task(current_task)
+            current_task = self.add_or_get_task(task).model_copy()
+            if self.process_artifact_event(current_task, task):
+                self._store_task(current_task)
             return current_task
         # Otherwise this is a Task, either new or updated
-        elif not any(filter(lambda x: x and x.id == task.id, self._tasks)):
+        elif task.id not in self._tasks:
             self.attach_message_to_task(task.status.message, task.id)
             self.add_task(task)
             return task
@@ -319,14 +419,18 @@ class ADKHostManager(ApplicationManager):
         message_id = message.messageId
         if not message_id:
             return
+        history_ids = self._task_history_ids.setdefault(task.id, set())
         if task.history and (
             task.status.message
             and task.status.message.messageId
-            not in [x.messageId for x in task.history]
+            not in history_ids
         ):
-            task.history.append(task.status.message)
+            task.history = [*task.history, task.status.message]
+            history_ids.add(task.status.message.messageId)
         elif not task.history and task.status.message:
             task.history = [task.status.message]
+            history_ids.clear()
+            history_ids.add(task.status.message.messageId)
         else:
             print(
                 'Message id already in history',
@@ -344,9 +448,7 @@ class ADKHostManager(ApplicationManager):
             task_id = event.taskId
         if not task_id:
             task_id = str(uuid.uuid4())
-        current_task = next(
-            filter(lambda x: x.id == task_id, self._tasks), None
-        )
+        current_task = self._tasks.get(task_id)
         if not current_task:
             context_id = event.contextId
             current_task = Task(
@@ -363,62 +465,60 @@ class ADKHostManager(ApplicationManager):
 
     def process_artifact_event(
         self, current_task: Task, task_update_event: TaskArtifactUpdateEvent
-    ):
-        artifact = task_update_event.artifact
-        if not task_update_event.append:
-            # received the first chunk or entire payload for an artifact
-            if (
-                task_update_event.lastChunk is None
-                or task_update_event.lastChunk
-            ):
-                # lastChunk bit is missing or is set to true, so this is the entire payload
-                # add this to artifacts
-                if not current_task.artifacts:
-                    current_task.artifacts = []
-                current_task.artifacts.append(artifact)
-            else:
-                # this is a chunk of an artifact, stash it in temp store for assembling
-                if artifact.artifactId not in self._artifact_chunks:
-                    self._artifact_chunks[artifact.artifactId] = []
-                self._artifact_chunks[artifact.artifactId].append(artifact)
+    ) -> bool:
+        """Adds an artifact chunk, returning whether the task changed."""
+        artifact = self._artifacts.add(current_task.id, task_update_event)
+        if artifact is None:
+            return False
+        self._put_artifact(current_task, artifact)
+        return True
+
+    def _put_artifact(self, task: Task, artifact: Artifact):
+        """Sets the artifact on the task, replacing its partial version."""
+        artifacts = list(task.artifacts or [])
+        for i, a in enumerate(artifacts):
+            partial = (a.metadata or {}).get('partial')
+            if partial and a.artifactId == artifact.artifactId:
+                artifacts[i] = artifact
+                break
         else:
-            # we received an append chunk, add to the existing temp artifact
-            current_temp_artifact = self._artifact_chunks[artifact.artifactId][
-                -1
-            ]
-            # TODO handle if current_temp_artifact is missing
-            current_temp_artifact.parts.extend(artifact.parts)
-            if task_update_event.lastChunk:
-                if current_task.artifacts:
-                    current_task.artifacts.append(current_temp_artifact)
-                else:
-                    current_task.artifacts = [current_temp_artifact]
-                del self._artifact_chunks[artifact.artifactId][-1]
+            artifacts.append(artifact)
+        task.artifacts = artifacts
+
+    def _expire_artifacts(self):
+        """Stores what was received of artifacts that stopped streaming."""
+        for task_id, artifact in self._artifacts.expire():
+            task = self._tasks.get(task_id)
+            if task is None:
+                continue
+            task = task.model_copy()
+            self._put_artifact(task, artifact)
+            self._store_task(task)
+
+    def close(self):
+        self._artifacts.close()
 
     def add_event(self, event: Event):
-        self._events[event.id] = event
+        with self._lock:
+            self._events.append(event)
+            self._changes.notify()
 
     def get_conversation(
         self, conversation_id: Optional[str]
     ) -> Optional[Conversation]:
         if not conversation_id:
             return None
-        return next(
-            filter(
-                lambda c: c and c.conversation_id == conversation_id,
-                self._conversations,
-            ),
-            None,
-        )
+        return self._conversations.get(conversation_id)
+
+    def get_task(self, task_id: str) -> Task | None:
+        return self._tasks.get(task_id)
 
     def get_pending_messages(self) -> list[tuple[str, str]]:
         rval = []
-        for message_id in self._pending_message_ids:
+        for message_id in self._pending_message_ids.snapshot():
             if message_id in self._task_map:
                 task_id = self._task_map[message_id]
-                task = next(
-                    filter(lambda x: x.id == task_id, self._tasks), None
-                )
+                task = self._tasks.get(task_id)
                 if not task:
                     rval.append((message_id, ''))
                 elif task.history and task.history[-1].parts:
@@ -453,15 +553,32 @@ class ADKHostManager(ApplicationManager):
 
     @property
     def conversations(self) -> list[Conversation]:
-        return self._conversations
+        return self._conversations.values()
 
     @property
     def tasks(self) -> list[Task]:
-        return self._tasks
+        return self._tasks.values()
 
     @property
     def events(self) -> list[Event]:
-        return sorted(self._events.values(), key=lambda x: x.timestamp)
+        return self._events.all()
+
+    @property
+    def changes(self) -> ChangeTracker:
+        return self._changes
+
+    def get_events(
+        self,
+        after: int = 0,
+        limit: int | None = None,
+        conversation_id: str | None = None,
+        actor: str | None = None,
+        start_time: float | None = None,
+        end_time: float | None = None,
+    ) -> tuple[list[Event], int]:
+        return self._events.read(
+            after, limit, conversation_id, actor, start_time, end_time
+        )
 
     def adk_content_from_message(self, message: Message) -> types.Content:
         parts: list[types.Part] = []
@@ -634,3 +751,22 @@ def task_still_open(task: Task | None) -> bool:
         TaskState.working,
         TaskState.input_required,
     ]
+
+
+def merge_parts(parts: list[Part], converted: list) -> list[Part]:
+    """Appends the host agent's converted parts to A2A parts.
+
+    Text continues the last text part, so that streamed chunks read as one.
+    """
+    parts = list(parts)
+    for value in converted:
+        if isinstance(value, str):
+            if parts and isinstance(parts[-1].root, TextPart):
+                parts[-1] = Part(root=TextPart(text=parts[-1].root.text + value))
+            else:
+                parts.append(Part(root=TextPart(text=value)))
+        elif isinstance(value, DataPart):
+            parts.append(Part(root=value))
+        else:
+            parts.append(Part(root=DataPart(data=value)))
+    return parts
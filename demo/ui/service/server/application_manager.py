@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 
 from a2a.types import AgentCard, Message, Task
+from service.server.change_tracker import ChangeTracker
 from service.types import Conversation, Event
 
 
@@ -31,6 +32,10 @@ class ApplicationManager(ABC):
     ) -> Conversation | None:
         pass
 
+    @abstractmethod
+    def get_task(self, task_id: str) -> Task | None:
+        pass
+
     @property
     @abstractmethod
     def conversations(self) -> list[Conversation]:
@@ -50,3 +55,20 @@ class ApplicationManager(ABC):
     @abstractmethod
     def events(self) -> list[Event]:
         pass
+
+    @property
+    @abstractmethod
+    def changes(self) -> ChangeTracker:
+        """Versions changes to conversations, tasks, pending and events."""
+
+    @abstractmethod
+    def get_events(
+        self,
+        after: int = 0,
+        limit: int | None = None,
+        conversation_id: str | None = None,
+        actor: str | None = None,
+        start_time: float | None = None,
+        end_time: float | None = None,
+    ) -> tuple[list[Event], int]:
+        """Returns the matching events after the cursor and the next cursor."""
@@ -0,0 +1,299 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from a2a.types import Artifact, Part, TaskArtifactUpdateEvent
+
+
+# Metadata key of an optional chunk sequence number set by the agent.
+CHUNK_INDEX_KEY = 'chunk_index'
+
+
+def part_size(part: Part) -> int:
+    """Approximate size in bytes of a part's payload."""
+    p = part.root
+    if p.kind == 'text':
+        return len(p.text)
+    if p.kind == 'file':
+        return len(getattr(p.file, 'bytes', '') or '') + len(
+            getattr(p.file, 'uri', '') or ''
+        )
+    return len(json.dumps(p.data))
+
+
+@dataclass
+class _Assembly:
+    artifact: Artifact
+    started: float
+    updated: float
+    # Chunk index to parts, only while held in memory.
+    chunks: dict[int, list[Part]] = field(default_factory=dict)
+    # Indexes received, in memory or spilled.
+    indexes: set[int] = field(default_factory=set)
+    # Parts of the chunks 0..contiguous-1, in order.
+    prefix: list[Part] = field(default_factory=list)
+    contiguous: int = 0
+    # Index of the chunk marked lastChunk, once received.
+    last: int | None = None
+    # Next index for chunks that do not carry one.
+    next_arrival: int = 1
+    size: int = 0
+    spill_path: str | None = None
+    exposed: float = 0.0
+
+    @property
+    def complete(self) -> bool:
+        return self.last is not None and self.contiguous > self.last
+
+
+class ArtifactAssembler:
+    """Assembles artifacts streamed in chunks, keyed by task and artifact.
+
+    A chunk's position is its metadata['chunk_index'] when the agent sets
+    one, so chunks may arrive out of order and repeated chunks are ignored.
+    Otherwise the first chunk (append false) is chunk 0 and appends follow
+    in arrival order, so appends arriving before the first chunk are kept
+    rather than failing.
+
+    Limits keep memory bounded: an artifact over max_artifact_bytes is cut
+    off and returned truncated, one with no chunk for timeout seconds is
+    returned incomplete by expire(), and when chunks held in memory exceed
+    memory_budget bytes the largest assemblies spill to disk until they
+    complete. While incomplete, a partial view is returned at most every
+    expose_interval seconds for the UI.
+    """
+
+    def __init__(
+        self,
+        max_artifact_bytes: int = 64 * 1024 * 1024,
+        memory_budget: int = 32 * 1024 * 1024,
+        timeout: float = 300.0,
+        expose_interval: float = 0.25,
+        spill_directory: str | None = None,
+        max_closed: int = 1024,
+    ):
+        self.max_artifact_bytes = max_artifact_bytes
+        self.memory_budget = memory_budget
+        self.timeout = timeout
+        self.expose_interval = expose_interval
+        self._spill_directory = spill_directory
+        self._owns_directory = spill_directory is None
+        self.memory_size = 0
+        # Assemblies in progress, least recently updated first.
+        self._assemblies: OrderedDict[tuple[str, str], _Assembly] = (
+            OrderedDict()
+        )
+        # Recently finished assemblies, to drop their late chunks.
+        self._closed: OrderedDict[tuple[str, str], None] = OrderedDict()
+        self._max_closed = max_closed
+
+    def __len__(self) -> int:
+        return len(self._assemblies)
+
+    def add(
+        self, task_id: str, event: TaskArtifactUpdateEvent
+    ) -> Artifact | None:
+        """Adds a chunk, returning the artifact to expose, if any.
+
+        The returned artifact is complete, truncated, or a partial view with
+        metadata partial set to True.
+        """
+        artifact = event.artifact
+        key = (task_id, artifact.artifactId)
+        index = (artifact.metadata or {}).get(CHUNK_INDEX_KEY)
+        if (
+            not event.append
+            and event.lastChunk is not False
+            and index is None
+        ):
+            # The entire artifact in one event.
+            self._drop(key)
+            return artifact
+        now = time.monotonic()
+        assembly = self._assemblies.get(key)
+        if assembly is None:
+            if key in self._closed:
+                if event.append or index is not None:
+                    # A late or repeated chunk of a finished artifact.
+                    return None
+                # The artifact is being streamed again.
+                del self._closed[key]
+            assembly = _Assembly(artifact=artifact, started=now, updated=now)
+            self._assemblies[key] = assembly
+        if index is None:
+            if event.append:
+                index = assembly.next_arrival
+                assembly.next_arrival += 1
+            else:
+                index = 0
+        if not event.append and index == 0:
+            # The first chunk carries the artifact's name and metadata.
+            assembly.artifact = artifact
+        if index in assembly.indexes:
+            return None
+        assembly.updated = now
+        self._assemblies.move_to_end(key)
+        assembly.indexes.add(index)
+        if event.lastChunk:
+            assembly.last = index
+        size = sum(part_size(p) for p in artifact.parts)
+        assembly.size += size
+        if assembly.spill_path:
+            self._write_chunk(assembly, index, artifact.parts)
+        else:
+            assembly.chunks[index] = list(artifact.parts)
+            self.memory_size += size
+            self._advance(assembly)
+        if assembly.size > self.max_artifact_bytes:
+            return self._finish(key, {'truncated': True})
+        if assembly.complete:
+            return self._finish(key)
+        self._spill()
+        if now - assembly.exposed < self.expose_interval:
+            return None
+        assembly.exposed = now
+        if assembly.spill_path:
+            # Reading the spilled chunks back on every exposure would undo
+            # the spill, report progress only.
+            return assembly.artifact.model_copy(
+                update={
+                    'parts': [],
+                    'metadata': {
+                        **(assembly.artifact.metadata or {}),
+                        'partial': True,
+                        'received_bytes': assembly.size,
+                    },
+                }
+            )
+        return self._view(assembly, {'partial': True})
+
+    def expire(self) -> list[tuple[str, Artifact]]:
+        """Ends assemblies idle for longer than timeout.
+
+        Returns their task ids with what was received, marked incomplete.
+        """
+        expired = []
+        deadline = time.monotonic() - self.timeout
+        while self._assemblies:
+            key, assembly = next(iter(self._assemblies.items()))
+            if assembly.updated > deadline:
+                break
+            expired.append((key[0], self._finish(key, {'incomplete': True})))
+        return expired
+
+    def close_task(self, task_id: str) -> list[Artifact]:
+        """Ends the assemblies of a finished task, marked incomplete."""
+        keys = [key for key in self._assemblies if key[0] == task_id]
+        return [self._finish(key, {'incomplete': True}) for key in keys]
+
+    def close(self):
+        """Drops every assembly, removing the spill directory if owned."""
+        for key in list(self._assemblies):
+            self._drop(key)
+        if self._owns_directory and self._spill_directory:
+            shutil.rmtree(self._spill_directory, ignore_errors=True)
+            self._spill_directory = None
+
+    def _advance(self, assembly: _Assembly):
+        while assembly.contiguous in assembly.chunks:
+            assembly.prefix.extend(assembly.chunks[assembly.contiguous])
+            assembly.contiguous += 1
+
+    def _view(self, assembly: _Assembly, flags: dict) -> Artifact:
+        """The artifact with the parts of the contiguous chunks."""
+        if assembly.spill_path:
+            parts = [
+                p for _, chunk in self._read_chunks(assembly) for p in chunk
+            ]
+        else:
+            parts = list(assembly.prefix)
+        metadata = assembly.artifact.metadata
+        if flags:
+            metadata = {**(metadata or {}), **flags}
+        return assembly.artifact.model_copy(
+            update={'parts': parts, 'metadata': metadata}
+        )
+
+    def _finish(
+        self, key: tuple[str, str], flags: dict | None = None
+    ) -> Artifact:
+        assembly = self._assemblies[key]
+        artifact = self._view(assembly, flags or {})
+        self._drop(key)
+        self._closed[key] = None
+        if len(self._closed) > self._max_closed:
+            self._closed.popitem(last=False)
+        return artifact
+
+    def _drop(self, key: tuple[str, str]):
+        assembly = self._assemblies.pop(key, None)
+        if assembly is None:
+            return
+        self.memory_size -= sum(
+            part_size(p) for chunk in assembly.chunks.values() for p in chunk
+        )
+        if assembly.spill_path:
+            try:
+                os.remove(assembly.spill_path)
+            except FileNotFoundError:
+                pass
+
+    def _spill(self):
+        while self.memory_size > self.memory_budget:
+            in_memory = [a for a in self._assemblies.values() if a.chunks]
+            if not in_memory:
+                return
+            assembly = max(in_memory, key=lambda a: a.size)
+            if self._spill_directory is None:
+                self._spill_directory = tempfile.mkdtemp(
+                    prefix='a2a-ui-artifacts-'
+                )
+            os.makedirs(self._spill_directory, exist_ok=True)
+            fd, assembly.spill_path = tempfile.mkstemp(
+                dir=self._spill_directory, suffix='.jsonl'
+            )
+            os.close(fd)
+            for index, parts in assembly.chunks.items():
+                self._write_chunk(assembly, index, parts)
+                self.memory_size -= sum(part_size(p) for p in parts)
+            assembly.chunks = {}
+            assembly.prefix = []
+
+    def _write_chunk(
+        self, assembly: _Assembly, index: int, parts: list[Part]
+    ):
+        with open(assembly.spill_path, 'a', encoding='utf-8') as f:
+            f.write(
+                json.dumps(
+                    {
+                        'index': index,
+                        'parts': [
+                            p.model_dump(mode='json', exclude_none=True)
+                            for p in parts
+                        ],
+                    }
+                )
+                + '\n'
+            )
+        # Contiguity of spilled chunks is tracked by index alone.
+        while assembly.contiguous in assembly.indexes:
+            assembly.contiguous += 1
+
+    def _read_chunks(
+        self, assembly: _Assembly
+    ) -> list[tuple[int, list[Part]]]:
+        """Chunks 0..contiguous-1 from the spill file, in order."""
+        chunks: dict[int, list[Part]] = {}
+        with open(assembly.spill_path, encoding='utf-8') as f:
+            for line in f:
+                record = json.loads(line)
+                if record['index'] < assembly.contiguous:
+                    chunks[record['index']] = [
+                        Part.model_validate(p) for p in record['parts']
+                    ]
+        return sorted(chunks.items())
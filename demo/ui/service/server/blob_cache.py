@@ -0,0 +1,117 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+
+from collections import OrderedDict
+from dataclasses import dataclass
+
+
+@dataclass
+class Blob:
+    media_type: str
+    size: int
+    # Set while the blob is held in memory, None once spilled to path.
+    data: bytes | None
+    path: str
+
+    @property
+    def etag(self) -> str:
+        return f'"{os.path.basename(self.path)}"'
+
+
+class BlobCache:
+    """Content-addressed store for the files served by the UI server.
+
+    Blobs are keyed by the sha256 of their content, so the same file sent
+    twice is stored once and its id never changes meaning. The most recently
+    used blobs are kept in memory up to memory_budget bytes; older ones are
+    written to directory and served from disk from then on. It is used from
+    both the server loop and request threads, so updates hold a lock.
+    """
+
+    def __init__(
+        self,
+        directory: str | None = None,
+        memory_budget: int = 64 * 1024 * 1024,
+    ):
+        self._owns_directory = directory is None
+        self.directory = directory or tempfile.mkdtemp(prefix='a2a-ui-files-')
+        os.makedirs(self.directory, exist_ok=True)
+        self.memory_budget = memory_budget
+        self.memory_size = 0
+        self._blobs: dict[str, Blob] = {}
+        # Ids of the blobs held in memory, least recently used first.
+        self._in_memory: OrderedDict[str, None] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, blob_id: str) -> bool:
+        return blob_id in self._blobs
+
+    def __len__(self) -> int:
+        return len(self._blobs)
+
+    def put(self, data: bytes, media_type: str) -> str:
+        """Stores data unless already present and returns its id."""
+        blob_id = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            if blob_id in self._blobs:
+                self._touch(blob_id)
+                return blob_id
+            self._blobs[blob_id] = Blob(
+                media_type=media_type,
+                size=len(data),
+                data=data,
+                path=os.path.join(self.directory, blob_id),
+            )
+            self._in_memory[blob_id] = None
+            self.memory_size += len(data)
+            self._spill()
+        return blob_id
+
+    def get(self, blob_id: str) -> Blob | None:
+        with self._lock:
+            blob = self._blobs.get(blob_id)
+            if blob is not None:
+                self._touch(blob_id)
+        return blob
+
+    def read(
+        self, blob: Blob, start: int = 0, end: int | None = None
+    ) -> bytes:
+        """Reads bytes start to end, exclusive, of a blob."""
+        end = blob.size if end is None else end
+        data = blob.data
+        if data is not None:
+            return data[start:end]
+        with open(blob.path, 'rb') as f:
+            f.seek(start)
+            return f.read(end - start)
+
+    def _touch(self, blob_id: str):
+        if blob_id in self._in_memory:
+            self._in_memory.move_to_end(blob_id)
+
+    def _spill(self):
+        while self.memory_size > self.memory_budget and self._in_memory:
+            blob_id, _ = self._in_memory.popitem(last=False)
+            blob = self._blobs[blob_id]
+            if not os.path.exists(blob.path):
+                # Written under a temporary name so readers never see a
+                # partial file.
+                partial = blob.path + '.partial'
+                with open(partial, 'wb') as f:
+                    f.write(blob.data)
+                os.replace(partial, blob.path)
+            self.memory_size -= blob.size
+            blob.data = None
+
+    def close(self):
+        """Drops every blob, removing the directory if it was created here."""
+        with self._lock:
+            self._blobs.clear()
+            self._in_memory.clear()
+            self.memory_size = 0
+        if self._owns_directory:
+            shutil.rmtree(self.directory, ignore_errors=True)
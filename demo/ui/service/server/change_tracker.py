@@ -0,0 +1,102 @@
+import asyncio
+import threading
+
+
+class ChangeTracker:
+    """Versions the changes made to an application manager's collections.
+
+    Every change bumps a global version. For each collection the changed ids
+    are kept ordered by the version they last changed at, so listing what
+    changed since a version costs O(changes), not O(collection). Waiters on
+    the server loop are woken on every change.
+
+    Changes may be recorded from any thread and read from request threads,
+    so the version and the changed ids are kept under a lock. Waiters are
+    woken on the loop they wait on.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self._changed: dict[str, dict[str, int]] = {}
+        self._wakeup = asyncio.Event()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock = threading.Lock()
+
+    def touch(self, collection: str, item_id: str) -> int:
+        """Records that item_id of collection changed, returns the version."""
+        with self._lock:
+            items = self._changed.setdefault(collection, {})
+            # Re-insert so the dict stays ordered by version.
+            items.pop(item_id, None)
+            self.version += 1
+            version = items[item_id] = self.version
+            wakeup = self._next_wakeup()
+        self._wake(wakeup)
+        return version
+
+    def notify(self) -> int:
+        """Bumps the version without recording an item."""
+        with self._lock:
+            self.version += 1
+            version = self.version
+            wakeup = self._next_wakeup()
+        self._wake(wakeup)
+        return version
+
+    def _next_wakeup(self) -> asyncio.Event:
+        """Swaps in a fresh event, returns the one to set. Needs the lock."""
+        wakeup, self._wakeup = self._wakeup, asyncio.Event()
+        return wakeup
+
+    def _wake(self, wakeup: asyncio.Event):
+        loop = self._loop
+        if loop is None:
+            # Nobody has waited yet.
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            wakeup.set()
+        elif not loop.is_closed():
+            loop.call_soon_threadsafe(wakeup.set)
+
+    def changed_since(self, collection: str, since: int) -> list[str]:
+        """Ids of collection changed after version since, oldest first."""
+        changed = []
+        with self._lock:
+            for item_id, version in reversed(
+                self._changed.get(collection, {}).items()
+            ):
+                if version <= since:
+                    break
+                changed.append(item_id)
+        changed.reverse()
+        return changed
+
+    def item_version(self, collection: str, item_id: str) -> int:
+        with self._lock:
+            return self._changed.get(collection, {}).get(item_id, 0)
+
+    def item_versions(
+        self, collection: str, item_ids: list[str]
+    ) -> dict[str, int]:
+        """Versions of the item_ids that ever changed, under one lock."""
+        with self._lock:
+            items = self._changed.get(collection, {})
+            return {i: items[i] for i in item_ids if i in items}
+
+    async def wait(self, since: int, timeout: float | None = None) -> bool:
+        """Waits until the version passes since, False on timeout."""
+        with self._lock:
+            if self.version > since:
+                return True
+            # Read with the version, a change made after this sets it.
+            wakeup = self._wakeup
+            self._loop = asyncio.get_running_loop()
+        try:
+            await asyncio.wait_for(wakeup.wait(), timeout)
+        except TimeoutError:
+            return False
+        return True
@@ -0,0 +1,87 @@
+import bisect
+
+from service.types import Event
+
+
+class EventLog:
+    """Append-only log of events in insertion order.
+
+    Every appended event gets a sequence number, starting at 1, that clients
+    use as a cursor: reading after a cursor costs O(log n + new events)
+    instead of re-sorting the whole log. Events are also indexed by
+    conversation and actor. Re-adding an event id replaces it in place and
+    keeps its sequence number.
+    """
+
+    def __init__(self):
+        self._entries: list[Event] = []
+        self._seq_by_id: dict[str, int] = {}
+        self._by_conversation: dict[str, list[int]] = {}
+        self._by_actor: dict[str, list[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def last_seq(self) -> int:
+        return len(self._entries)
+
+    def append(self, event: Event) -> int:
+        seq = self._seq_by_id.get(event.id)
+        if seq is not None:
+            self._entries[seq - 1] = event
+            return seq
+        self._entries.append(event)
+        seq = len(self._entries)
+        self._seq_by_id[event.id] = seq
+        conversation_id = event.content.contextId or ''
+        self._by_conversation.setdefault(conversation_id, []).append(seq)
+        self._by_actor.setdefault(event.actor, []).append(seq)
+        return seq
+
+    def read(
+        self,
+        after: int = 0,
+        limit: int | None = None,
+        conversation_id: str | None = None,
+        actor: str | None = None,
+        start_time: float | None = None,
+        end_time: float | None = None,
+    ) -> tuple[list[Event], int]:
+        """Returns up to limit matching events after the cursor.
+
+        Also returns the next cursor: the sequence number of the last event
+        looked at, or after itself when there is nothing new. Events are
+        looked up through the conversation or actor index when filtering
+        by them, the time window [start_time, end_time) is checked per
+        event.
+        """
+        after = max(after, 0)
+        index = None
+        if conversation_id is not None:
+            index = self._by_conversation.get(conversation_id, [])
+        elif actor is not None:
+            index = self._by_actor.get(actor, [])
+        if index is None:
+            seqs = range(after + 1, len(self._entries) + 1)
+        else:
+            start = bisect.bisect_right(index, after)
+            seqs = (index[i] for i in range(start, len(index)))
+        events: list[Event] = []
+        cursor = after
+        for seq in seqs:
+            if limit is not None and len(events) >= limit:
+                break
+            cursor = seq
+            event = self._entries[seq - 1]
+            if (
+                (actor is not None and event.actor != actor)
+                or (start_time is not None and event.timestamp < start_time)
+                or (end_time is not None and event.timestamp >= end_time)
+            ):
+                continue
+            events.append(event)
+        return events, cursor
+
+    def all(self) -> list[Event]:
+        return list(self._entries)
@@ -18,6 +18,7 @@ from utils.agent_card import get_agent_card
 
 from service.server import test_image
 from service.server.application_manager import ApplicationManager
+from service.server.change_tracker import ChangeTracker
 from service.types import Conversation, Event
 
 
@@ -46,11 +47,13 @@ class InMemoryFakeAgentManager(ApplicationManager):
         self._next_message_idx = 0
         self._agents = []
         self._task_map = {}
+        self._changes = ChangeTracker()
 
     def create_conversation(self) -> Conversation:
         conversation_id = str(uuid.uuid4())
         c = Conversation(conversation_id=conversation_id, is_active=True)
         self._conversations.append(c)
+        self._changes.touch('conversations', conversation_id)
         return c
 
     def sanitize_message(self, message: Message) -> Message:
@@ -80,9 +83,11 @@ class InMemoryFakeAgentManager(ApplicationManager):
         task_id = message.taskId or ''
         if message_id:
             self._pending_message_ids.append(message_id)
+            self._changes.touch('pending', message_id)
         conversation = self.get_conversation(context_id)
         if conversation:
             conversation.messages.append(message)
+            self._changes.touch('conversations', context_id)
         self._events.append(
             Event(
                 id=str(uuid.uuid4()),
@@ -109,6 +114,7 @@ class InMemoryFakeAgentManager(ApplicationManager):
         response = self.next_message()
         if conversation:
             conversation.messages.append(response)
+            self._changes.touch('conversations', context_id)
         self._events.append(
             Event(
                 id=str(uuid.uuid4()),
@@ -118,6 +124,7 @@ class InMemoryFakeAgentManager(ApplicationManager):
             )
         )
         self._pending_message_ids.remove(message_id)
+        self._changes.touch('pending', message_id)
         # Now clean up the task
         if task:
             task.status.state = TaskState.completed
@@ -136,11 +143,13 @@ class InMemoryFakeAgentManager(ApplicationManager):
 
     def add_task(self, task: Task):
         self._tasks.append(task)
+        self._changes.touch('tasks', task.id)
 
     def update_task(self, task: Task):
         for i, t in enumerate(self._tasks):
             if t.id == task.id:
                 self._tasks[i] = task
+                self._changes.touch('tasks', task.id)
                 return
 
     def add_event(self, event: Event):
@@ -166,6 +175,9 @@ class InMemoryFakeAgentManager(ApplicationManager):
             None,
         )
 
+    def get_task(self, task_id: str) -> Task | None:
+        return next(filter(lambda x: x.id == task_id, self._tasks), None)
+
     def get_pending_messages(self) -> list[tuple[str, str]]:
         rval: list[tuple[str, str]] = []
         for message_id in self._pending_message_ids:
@@ -216,6 +228,21 @@ class InMemoryFakeAgentManager(ApplicationManager):
     def events(self) -> list[Event]:
         return []
 
+    @property
+    def changes(self) -> ChangeTracker:
+        return self._changes
+
+    def get_events(
+        self,
+        after: int = 0,
+        limit: int | None = None,
+        conversation_id: str | None = None,
+        actor: str | None = None,
+        start_time: float | None = None,
+        end_time: float | None = None,
+    ) -> tuple[list[Event], int]:
+        return [], after
+
 
 _contextId = str(uuid.uuid4())
 
@@ -0,0 +1,108 @@
+import asyncio
+import itertools
+import traceback
+
+from collections import deque
+from collections.abc import Awaitable, Callable
+
+from a2a.types import Message
+
+
+class MessageQueueFullError(Exception):
+    """Raised when the pool already holds max_queued messages."""
+
+
+class MessageWorkerPool:
+    """Processes messages as tasks on the server's own event loop.
+
+    At most `concurrency` messages are processed at once. Messages of one
+    conversation are processed one at a time in arrival order, while
+    different conversations run in parallel. Conversations waiting for a
+    worker are served by priority (lower first), then arrival. At most
+    `max_queued` messages wait; beyond that submit raises
+    MessageQueueFullError.
+    """
+
+    def __init__(
+        self,
+        process: Callable[[Message], Awaitable[None]],
+        concurrency: int = 8,
+        max_queued: int = 1000,
+    ):
+        self._process = process
+        self.concurrency = concurrency
+        self.max_queued = max_queued
+        self._ready: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        # Per conversation FIFO of (priority, message).
+        self._conversations: dict[str, deque[tuple[int, Message]]] = {}
+        # Conversations that are either ready or being processed.
+        self._scheduled: set[str] = set()
+        self._counter = itertools.count()
+        self._workers: list[asyncio.Task] = []
+        self._queued = 0
+        self._in_flight = 0
+        self._processed = 0
+        self._failed = 0
+        self._max_depth = 0
+
+    def submit(self, message: Message, priority: int = 0):
+        if self._queued >= self.max_queued:
+            raise MessageQueueFullError(
+                f'{self._queued} messages already queued'
+            )
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._work())
+                for _ in range(self.concurrency)
+            ]
+        # Messages without a conversation never share ordering.
+        key = message.contextId or f'message:{message.messageId}'
+        self._conversations.setdefault(key, deque()).append(
+            (priority, message)
+        )
+        self._queued += 1
+        self._max_depth = max(self._max_depth, self._queued)
+        if key not in self._scheduled:
+            self._schedule(key, priority)
+
+    def _schedule(self, key: str, priority: int):
+        self._scheduled.add(key)
+        self._ready.put_nowait((priority, next(self._counter), key))
+
+    async def _work(self):
+        while True:
+            _, _, key = await self._ready.get()
+            pending = self._conversations[key]
+            _, message = pending.popleft()
+            self._queued -= 1
+            self._in_flight += 1
+            try:
+                await self._process(message)
+                self._processed += 1
+            except Exception:
+                self._failed += 1
+                traceback.print_exc()
+            finally:
+                self._in_flight -= 1
+            if pending:
+                self._schedule(key, pending[0][0])
+            else:
+                del self._conversations[key]
+                self._scheduled.discard(key)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'queue_depth': self._queued,
+            'max_queue_depth': self._max_depth,
+            'in_flight': self._in_flight,
+            'processed': self._processed,
+            'failed': self._failed,
+            'concurrency': self.concurrency,
+            'max_queued': self.max_queued,
+        }
+
+    async def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
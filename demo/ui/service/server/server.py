@@ -1,16 +1,16 @@
-import asyncio
 import base64
 import os
 import threading
-import uuid
 
 import httpx
 
-from a2a.types import FilePart, FileWithUri, Message, Part
+from a2a.types import FilePart, FileWithBytes, FileWithUri, Message, Part
 from fastapi import APIRouter, FastAPI, Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
 
 from service.types import (
     CreateConversationResponse,
+    JSONRPCError,
     GetEventResponse,
     ListAgentResponse,
     ListConversationResponse,
@@ -20,11 +20,14 @@ from service.types import (
     PendingMessageResponse,
     RegisterAgentResponse,
     SendMessageResponse,
+    StateDelta,
 )
 
 from .adk_host_manager import ADKHostManager, get_message_id
 from .application_manager import ApplicationManager
+from .blob_cache import BlobCache
 from .in_memory_manager import InMemoryFakeAgentManager
+from .message_worker_pool import MessageQueueFullError, MessageWorkerPool
 
 
 class ConversationServer:
@@ -52,8 +55,27 @@ class ConversationServer:
             )
         else:
             self.manager = InMemoryFakeAgentManager()
-        self._file_cache = {}  # dict[str, FilePart] maps file id to message data
-        self._message_to_cache = {}  # dict[str, str] maps message id to cache id
+        self._blobs = BlobCache(
+            os.environ.get('A2A_UI_FILE_CACHE_DIR'),
+            memory_budget=int(
+                os.environ.get('A2A_UI_FILE_CACHE_MEMORY_MB', '64')
+            )
+            * 1024
+            * 1024,
+        )
+        # Message id -> (stored message, its copy with file parts pointing
+        # at the cache). Filled from the loop and from request threads.
+        self._cached_messages: dict[str, tuple[Message, Message]] = {}
+        self._cached_messages_lock = threading.Lock()
+        self._message_pool = MessageWorkerPool(
+            self.manager.process_message,
+            concurrency=int(
+                os.environ.get('A2A_UI_MAX_CONCURRENT_MESSAGES', '8')
+            ),
+            max_queued=int(
+                os.environ.get('A2A_UI_MAX_QUEUED_MESSAGES', '1000')
+            ),
+        )
 
         app.add_api_route(
             '/conversation/create', self._create_conversation, methods=['POST']
@@ -69,6 +91,9 @@ class ConversationServer:
         app.add_api_route(
             '/message/pending', self._pending_messages, methods=['POST']
         )
+        app.add_api_route(
+            '/message/queue', self._message_queue_stats, methods=['POST']
+        )
         app.add_api_route('/task/list', self._list_tasks, methods=['POST'])
         app.add_api_route(
             '/agent/register', self._register_agent, methods=['POST']
@@ -80,6 +105,16 @@ class ConversationServer:
         app.add_api_route(
             '/api_key/update', self._update_api_key, methods=['POST']
         )
+        app.add_api_route('/state/stream', self._stream_state, methods=['GET'])
+        app.add_api_route(
+            '/state/snapshot', self._state_snapshot, methods=['GET']
+        )
+
+    async def close(self):
+        await self._message_pool.stop()
+        self._blobs.close()
+        if isinstance(self.manager, ADKHostManager):
+            self.manager.close()
 
     # Update API key in manager
     def update_api_key(self, api_key: str):
@@ -94,10 +129,14 @@ class ConversationServer:
         message_data = await request.json()
         message = Message(**message_data['params'])
         message = self.manager.sanitize_message(message)
-        t = threading.Thread(
-            target=lambda: asyncio.run(self.manager.process_message(message))
-        )
-        t.start()
+        # Replies to an open task go first, the user is waiting on them.
+        priority = 0 if message.taskId else 1
+        try:
+            self._message_pool.submit(message, priority)
+        except MessageQueueFullError as e:
+            return SendMessageResponse(
+                error=JSONRPCError(code=-32000, message=f'Server busy: {e}')
+            )
         return SendMessageResponse(
             result=MessageInfo(
                 message_id=message.messageId,
@@ -105,65 +144,299 @@ class ConversationServer:
             )
         )
 
-    async def _list_messages(self, request: Request):
+    async def _list_messages(
+        self,
+        request: Request,
+        since: int | None = None,
+        cursor: int = 0,
+        limit: int | None = None,
+    ):
+        """Lists a page of a conversation's messages from offset cursor.
+
+        With since, nothing is returned unless the conversation changed after
+        that version.
+        """
         message_data = await request.json()
         conversation_id = message_data['params']
+        changes = self.manager.changes
+        version = changes.version
         conversation = self.manager.get_conversation(conversation_id)
-        if conversation:
-            return ListMessageResponse(
-                result=self.cache_content(conversation.messages)
-            )
-        return ListMessageResponse(result=[])
+        if not conversation or (
+            since is not None
+            and changes.item_version('conversations', conversation_id)
+            <= since
+        ):
+            return ListMessageResponse(result=[], version=version)
+        messages, next_cursor = _page(conversation.messages, cursor, limit)
+        return ListMessageResponse(
+            result=self.cache_content(messages),
+            version=version,
+            next_cursor=next_cursor,
+        )
+
+    def cache_content(self, messages: list[Message]) -> list[Message]:
+        """The messages with inline file bytes replaced by cache urls.
 
-    def cache_content(self, messages: list[Message]):
+        Stored messages are shared with the manager and other readers, so
+        they are never changed: a message with files is served as a copy,
+        made once per message.
+        """
         rval = []
         for m in messages:
             message_id = get_message_id(m)
-            if not message_id:
+            if not message_id or not any(
+                p.root.kind == 'file' and isinstance(p.root.file, FileWithBytes)
+                for p in m.parts
+            ):
                 rval.append(m)
                 continue
-            new_parts: list[Part] = []
-            for i, p in enumerate(m.parts):
-                part = p.root
-                if part.kind != 'file':
-                    new_parts.append(p)
-                    continue
-                message_part_id = f'{message_id}:{i}'
-                if message_part_id in self._message_to_cache:
-                    cache_id = self._message_to_cache[message_part_id]
-                else:
-                    cache_id = str(uuid.uuid4())
-                    self._message_to_cache[message_part_id] = cache_id
-                # Replace the part data with a url reference
-                new_parts.append(
-                    Part(
-                        root=FilePart(
-                            file=FileWithUri(
-                                mimeType=part.file.mimeType,
-                                uri=f'/message/file/{cache_id}',
-                            )
+            with self._cached_messages_lock:
+                source, cached = self._cached_messages.get(
+                    message_id, (None, None)
+                )
+                # A message updated under the same id is a new object.
+                if source is not m:
+                    cached = m.model_copy(
+                        update={'parts': self._cache_parts(m.parts)}
+                    )
+                    self._cached_messages[message_id] = (m, cached)
+            rval.append(cached)
+        return rval
+
+    def _cache_parts(self, parts: list[Part]) -> list[Part]:
+        new_parts: list[Part] = []
+        for p in parts:
+            part = p.root
+            if part.kind != 'file' or not isinstance(part.file, FileWithBytes):
+                new_parts.append(p)
+                continue
+            mime_type = part.file.mimeType or 'application/octet-stream'
+            # Images are served decoded, other files as sent.
+            data = (
+                base64.b64decode(part.file.bytes)
+                if 'image' in mime_type
+                else part.file.bytes.encode()
+            )
+            blob_id = self._blobs.put(data, mime_type)
+            # Replace the part data with a url reference
+            new_parts.append(
+                Part(
+                    root=FilePart(
+                        file=FileWithUri(
+                            mimeType=part.file.mimeType,
+                            uri=f'/message/file/{blob_id}',
                         )
                     )
                 )
-                if cache_id not in self._file_cache:
-                    self._file_cache[cache_id] = part
-            m.parts = new_parts
-            rval.append(m)
-        return rval
+            )
+        return new_parts
+
+    def _message_queue_stats(self):
+        return self._message_pool.stats()
+
+    def state_delta(
+        self,
+        since: int,
+        conversation_id: str = '',
+        message_offset: int = 0,
+        event_after: int | None = None,
+    ) -> StateDelta:
+        """Collects what changed after version since.
+
+        Only the messages of conversation_id past message_offset are sent,
+        from the first earlier one updated after since, if any, and events
+        only when event_after is given.
+        """
+        changes = self.manager.changes
+        delta = StateDelta(version=changes.version)
+        for changed_id in changes.changed_since('conversations', since):
+            conversation = self.manager.get_conversation(changed_id)
+            if not conversation:
+                continue
+            delta.conversations.append(
+                conversation.model_copy(update={'messages': []})
+            )
+            delta.message_ids[changed_id] = [
+                m.messageId for m in conversation.messages
+            ]
+            if changed_id == conversation_id:
+                self._add_messages(
+                    delta, conversation.messages, since, message_offset
+                )
+        for task_id in changes.changed_since('tasks', since):
+            task = self.manager.get_task(task_id)
+            if task:
+                delta.tasks.append(task)
+                delta.task_versions[task_id] = changes.item_version(
+                    'tasks', task_id
+                )
+        if changes.changed_since('pending', since):
+            delta.pending = self.manager.get_pending_messages()
+        if event_after is not None:
+            delta.events, delta.event_cursor = self.manager.get_events(
+                event_after
+            )
+        return delta
+
+    def _add_messages(
+        self,
+        delta: StateDelta,
+        messages: list[Message],
+        since: int,
+        message_offset: int,
+    ) -> None:
+        """Puts the messages the caller lacks in delta, with versions."""
+        changes = self.manager.changes
+        updated = set(changes.changed_since('messages', since))
+        start = message_offset
+        if updated:
+            start = next(
+                (
+                    i
+                    for i, m in enumerate(messages[:message_offset])
+                    if m.messageId in updated
+                ),
+                message_offset,
+            )
+        if start < message_offset:
+            delta.message_start = start
+        delta.messages = self.cache_content(messages[start:])
+        delta.message_versions = changes.item_versions(
+            'messages', [m.messageId for m in delta.messages]
+        )
+
+    def _state_snapshot(
+        self,
+        since: int = 0,
+        conversation_id: str = '',
+        message_offset: int = 0,
+    ):
+        """The state_delta since a version, always with the pending list.
+
+        Gives a polling UI everything it refreshes in one request.
+        """
+        delta = self.state_delta(since, conversation_id, message_offset)
+        delta.pending = self.manager.get_pending_messages()
+        return delta
+
+    async def _stream_state(
+        self,
+        request: Request,
+        since: int = 0,
+        conversation_id: str = '',
+        message_offset: int = 0,
+        event_after: int | None = None,
+    ):
+        """Server-sent events with a StateDelta on every change.
+
+        The first delta after since=0 carries the whole state.
+        """
+
+        async def deltas():
+            nonlocal since, message_offset, event_after
+            while not await request.is_disconnected():
+                if not await self.manager.changes.wait(since, timeout=15):
+                    yield ': keep-alive\n\n'
+                    continue
+                delta = self.state_delta(
+                    since, conversation_id, message_offset, event_after
+                )
+                since = delta.version
+                if delta.message_start is not None:
+                    message_offset = delta.message_start
+                message_offset += len(delta.messages)
+                if delta.event_cursor is not None:
+                    event_after = delta.event_cursor
+                yield f'data: {delta.model_dump_json(exclude_none=True)}\n\n'
+
+        return StreamingResponse(deltas(), media_type='text/event-stream')
 
     async def _pending_messages(self):
         return PendingMessageResponse(
             result=self.manager.get_pending_messages()
         )
 
-    def _list_conversation(self):
-        return ListConversationResponse(result=self.manager.conversations)
+    def _list_conversation(
+        self,
+        since: int | None = None,
+        cursor: int = 0,
+        limit: int | None = None,
+    ):
+        if since is None:
+            conversations, next_cursor = _page(
+                self.manager.conversations, cursor, limit
+            )
+            return ListConversationResponse(
+                result=conversations,
+                version=self.manager.changes.version,
+                next_cursor=next_cursor,
+            )
+        changed_ids, version, next_cursor = self._changed_page(
+            'conversations', since, limit
+        )
+        return ListConversationResponse(
+            result=[
+                c
+                for c in map(self.manager.get_conversation, changed_ids)
+                if c
+            ],
+            version=version,
+            next_cursor=next_cursor,
+        )
+
+    def _get_events(
+        self,
+        after: int = 0,
+        limit: int | None = None,
+        conversation_id: str | None = None,
+        actor: str | None = None,
+        start_time: float | None = None,
+        end_time: float | None = None,
+    ):
+        events, cursor = self.manager.get_events(
+            after, limit, conversation_id, actor, start_time, end_time
+        )
+        return GetEventResponse(result=events, cursor=cursor)
+
+    def _list_tasks(
+        self,
+        since: int | None = None,
+        cursor: int = 0,
+        limit: int | None = None,
+    ):
+        if since is None:
+            tasks, next_cursor = _page(self.manager.tasks, cursor, limit)
+            return ListTaskResponse(
+                result=tasks,
+                version=self.manager.changes.version,
+                next_cursor=next_cursor,
+            )
+        changed_ids, version, next_cursor = self._changed_page(
+            'tasks', since, limit
+        )
+        return ListTaskResponse(
+            result=[t for t in map(self.manager.get_task, changed_ids) if t],
+            version=version,
+            next_cursor=next_cursor,
+        )
 
-    def _get_events(self):
-        return GetEventResponse(result=self.manager.events)
+    def _changed_page(
+        self, collection: str, since: int, limit: int | None
+    ) -> tuple[list[str], int, int | None]:
+        """Ids of collection changed after since, oldest change first.
 
-    def _list_tasks(self):
-        return ListTaskResponse(result=self.manager.tasks)
+        Delta pages are keyed by version rather than offset, as an item that
+        changes again moves to the end: when limit cuts the list, the
+        version of the last returned item is both the response version and
+        the next cursor, to be passed back as since.
+        """
+        changes = self.manager.changes
+        changed_ids = changes.changed_since(collection, since)
+        if limit is None or len(changed_ids) <= limit:
+            return changed_ids, changes.version, None
+        changed_ids = changed_ids[:limit]
+        version = changes.item_version(collection, changed_ids[-1])
+        return changed_ids, version, version
 
     async def _register_agent(self, request: Request):
         message_data = await request.json()
@@ -174,16 +447,48 @@ class ConversationServer:
     async def _list_agents(self):
         return ListAgentResponse(result=self.manager.agents)
 
-    def _files(self, file_id):
-        if file_id not in self._file_cache:
+    def _files(self, file_id: str, request: Request):
+        """Serves a cached file, honouring ETag and single Range requests."""
+        blob = self._blobs.get(file_id)
+        if blob is None:
             raise Exception('file not found')
-        part = self._file_cache[file_id]
-        if 'image' in part.file.mimeType:
+        headers = {
+            'ETag': blob.etag,
+            'Accept-Ranges': 'bytes',
+            # Ids are content hashes, so a file never changes.
+            'Cache-Control': 'public, max-age=31536000, immutable',
+        }
+        if blob.etag in request.headers.get('if-none-match', ''):
+            return Response(status_code=304, headers=headers)
+        byte_range = request.headers.get('range')
+        if_range = request.headers.get('if-range')
+        if byte_range and (if_range is None or if_range == blob.etag):
+            bounds = _parse_range(byte_range, blob.size)
+            if bounds is None:
+                return Response(
+                    status_code=416,
+                    headers={'Content-Range': f'bytes */{blob.size}'},
+                )
+            if bounds != (0, blob.size):
+                start, end = bounds
+                headers['Content-Range'] = (
+                    f'bytes {start}-{end - 1}/{blob.size}'
+                )
+                return Response(
+                    content=self._blobs.read(blob, start, end),
+                    status_code=206,
+                    media_type=blob.media_type,
+                    headers=headers,
+                )
+        # Read once, the blob may be spilled by another request meanwhile.
+        data = blob.data
+        if data is not None:
             return Response(
-                content=base64.b64decode(part.file.bytes),
-                media_type=part.file.mimeType,
+                content=data, media_type=blob.media_type, headers=headers
             )
-        return Response(content=part.file.bytes, media_type=part.file.mimeType)
+        return FileResponse(
+            blob.path, media_type=blob.media_type, headers=headers
+        )
 
     async def _update_api_key(self, request: Request):
         """Update the API key"""
@@ -198,3 +503,39 @@ class ConversationServer:
             return {'status': 'error', 'message': 'No API key provided'}
         except Exception as e:
             return {'status': 'error', 'message': str(e)}
+
+
+def _page(
+    items: list, cursor: int, limit: int | None
+) -> tuple[list, int | None]:
+    """Slices a page from items, returning it and the next page's cursor."""
+    cursor = max(cursor, 0)
+    if limit is None or cursor + limit >= len(items):
+        return items[cursor:], None
+    return items[cursor : cursor + limit], cursor + limit
+
+
+def _parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """Parses a single bytes range into (start, end exclusive).
+
+    Returns the whole file for forms that are not a single range, and None
+    when the range cannot be satisfied.
+    """
+    unit, _, spec = header.partition('=')
+    if unit.strip() != 'bytes' or ',' in spec:
+        return 0, size
+    first, _, last = spec.strip().partition('-')
+    try:
+        if not first:
+            # A suffix range, the last N bytes.
+            length = int(last)
+            if length <= 0:
+                return None
+            return max(size - length, 0), size
+        start = int(first)
+        end = min(int(last) + 1, size) if last else size
+    except ValueError:
+        return 0, size
+    if start >= size or end <= start:
+        return None
+    return start, end
@@ -0,0 +1,63 @@
+import threading
+
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Generic, TypeVar
+
+
+V = TypeVar('V')
+
+
+class VersionedMap(Generic[V]):
+    """Insertion ordered map of id to item with consistent snapshot reads.
+
+    Writers are serialized by a lock, which may be shared with other maps,
+    and every write bumps the version. snapshot() copies the map under the
+    lock once per version and caches the read-only copy, so readers on
+    request threads never iterate a dict that is being written, and reads
+    between two writes share one copy without locking. Items are replaced,
+    never mutated, once stored.
+    """
+
+    def __init__(self, lock: 'threading.RLock | None' = None):
+        self._lock = lock or threading.RLock()
+        self._items: dict[str, V] = {}
+        self.version = 0
+        self._snapshot: tuple[int, Mapping[str, V]] = (
+            0,
+            MappingProxyType({}),
+        )
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: str, default: V | None = None) -> V | None:
+        return self._items.get(key, default)
+
+    def set(self, key: str, value: V):
+        with self._lock:
+            self._items[key] = value
+            self.version += 1
+
+    def pop(self, key: str, default: V | None = None) -> V | None:
+        with self._lock:
+            value = self._items.pop(key, default)
+            self.version += 1
+            return value
+
+    def snapshot(self) -> Mapping[str, V]:
+        version, items = self._snapshot
+        if version == self.version:
+            return items
+        with self._lock:
+            version, items = self._snapshot
+            if version != self.version:
+                items = MappingProxyType(dict(self._items))
+                self._snapshot = (self.version, items)
+            return items
+
+    def values(self) -> list[V]:
+        return list(self.snapshot().values())
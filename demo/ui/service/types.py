@@ -52,13 +52,30 @@ class SendMessageRequest(JSONRPCRequest):
     params: Message
 
 
+class ListQueryParams(BaseModel):
+    # Only items changed after this version, None for all of them.
+    since: int | None = None
+    # Offset of the first item to return.
+    cursor: int = 0
+    limit: int | None = None
+
+
+class ListResponse(JSONRPCResponse):
+    # Pass back as `since` to list only later changes.
+    version: int | None = None
+    # Pass back as `cursor` for the next page, None on the last page.
+    next_cursor: int | None = None
+
+
 class ListMessageRequest(JSONRPCRequest):
     method: Literal['message/list'] = 'message/list'
     # This is the conversation id
     params: str
+    # Sent as query parameters, message/list?since=<version>&cursor=<offset>
+    query: ListQueryParams | None = None
 
 
-class ListMessageResponse(JSONRPCResponse):
+class ListMessageResponse(ListResponse):
     result: list[Message] | None = None
 
 
@@ -71,19 +88,36 @@ class SendMessageResponse(JSONRPCResponse):
     result: Message | MessageInfo | None = None
 
 
+class EventQueryParams(BaseModel):
+    # Sequence number of the last event already seen, 0 for the start.
+    after: int = 0
+    limit: int | None = None
+    conversation_id: str | None = None
+    actor: str | None = None
+    # Time window of event timestamps, start inclusive and end exclusive.
+    start_time: float | None = None
+    end_time: float | None = None
+
+
 class GetEventRequest(JSONRPCRequest):
     method: Literal['events/get'] = 'events/get'
+    # Sent as query parameters, events/get?after=<seq>&limit=N
+    params: EventQueryParams | None = None
 
 
 class GetEventResponse(JSONRPCResponse):
     result: list[Event] | None = None
+    # Pass back as `after` to read only newer events.
+    cursor: int | None = None
 
 
 class ListConversationRequest(JSONRPCRequest):
     method: Literal['conversation/list'] = 'conversation/list'
+    # Sent as query parameters, like ListMessageRequest.query
+    params: ListQueryParams | None = None
 
 
-class ListConversationResponse(JSONRPCResponse):
+class ListConversationResponse(ListResponse):
     result: list[Conversation] | None = None
 
 
@@ -105,9 +139,11 @@ class CreateConversationResponse(JSONRPCResponse):
 
 class ListTaskRequest(JSONRPCRequest):
     method: Literal['task/list'] = 'task/list'
+    # Sent as query parameters, like ListMessageRequest.query
+    params: ListQueryParams | None = None
 
 
-class ListTaskResponse(JSONRPCResponse):
+class ListTaskResponse(ListResponse):
     result: list[Task] | None = None
 
 
@@ -129,6 +165,31 @@ class ListAgentResponse(JSONRPCResponse):
     result: list[AgentCard] | None = None
 
 
+class StateDelta(BaseModel):
+    """Changes since a version, from /state/snapshot and /state/stream."""
+
+    version: int
+    # Changed conversations, sent without their messages.
+    conversations: list[Conversation] = Field(default_factory=list)
+    # Message ids of each changed conversation.
+    message_ids: dict[str, list[str]] = Field(default_factory=dict)
+    # New messages of the watched conversation, in order.
+    messages: list[Message] = Field(default_factory=list)
+    # Position of the first of messages when it is before message_offset,
+    # because a message already sent was updated in place.
+    message_start: int | None = None
+    # Change version of each sent message that was updated in place.
+    message_versions: dict[str, int] = Field(default_factory=dict)
+    tasks: list[Task] = Field(default_factory=list)
+    # Change version of each task, to tell an updated task from a resent one.
+    task_versions: dict[str, int] = Field(default_factory=dict)
+    # New events, only when subscribed with event_after.
+    events: list[Event] = Field(default_factory=list)
+    event_cursor: int | None = None
+    # The whole pending list, only when it changed or from /state/snapshot.
+    pending: list[tuple[str, str]] | None = None
+
+
 AgentRequest = TypeAdapter(
     Annotated[
         SendMessageRequest | ListConversationRequest,
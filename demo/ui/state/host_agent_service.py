@@ -1,10 +1,17 @@
+import asyncio
+import copy
+import functools
 import json
 import os
 import sys
+import time
 import traceback
 import uuid
 
-from typing import Any
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+
+from typing import Any, TypeVar
 
 from a2a.types import FileWithBytes, Message, Part, Role, Task, TaskState
 from service.client.client import ConversationClient
@@ -12,6 +19,7 @@ from service.types import (
     Conversation,
     CreateConversationRequest,
     Event,
+    EventQueryParams,
     GetEventRequest,
     ListAgentRequest,
     ListConversationRequest,
@@ -21,6 +29,7 @@ from service.types import (
     PendingMessageRequest,
     RegisterAgentRequest,
     SendMessageRequest,
+    StateDelta,
 )
 
 from .state import (
@@ -33,11 +42,26 @@ from .state import (
 )
 
 
+_T = TypeVar('_T')
+
 server_url = 'http://localhost:12000'
 
+# How long one live update handler streams before handing back to the UI.
+LIVE_WINDOW_SECONDS = 10
+
+
+@functools.cache
+def _conversation_client(url: str) -> ConversationClient:
+    return ConversationClient(url)
+
+
+def GetClient() -> ConversationClient:
+    """The client for server_url, sharing the process-wide connection pool."""
+    return _conversation_client(server_url)
+
 
 async def ListConversations() -> list[Conversation]:
-    client = ConversationClient(server_url)
+    client = GetClient()
     try:
         response = await client.list_conversation(ListConversationRequest())
         return response.result if response.result else []
@@ -47,7 +71,7 @@ async def ListConversations() -> list[Conversation]:
 
 
 async def SendMessage(message: Message) -> Message | MessageInfo | None:
-    client = ConversationClient(server_url)
+    client = GetClient()
     try:
         response = await client.send_message(SendMessageRequest(params=message))
         return response.result
@@ -58,7 +82,7 @@ async def SendMessage(message: Message) -> Message | MessageInfo | None:
 
 
 async def CreateConversation() -> Conversation:
-    client = ConversationClient(server_url)
+    client = GetClient()
     try:
         response = await client.create_conversation(CreateConversationRequest())
         return (
@@ -72,7 +96,7 @@ async def CreateConversation() -> Conversation:
 
 
 async def ListRemoteAgents():
-    client = ConversationClient(server_url)
+    client = GetClient()
     try:
         response = await client.list_agents(ListAgentRequest())
         return response.result
@@ -81,7 +105,7 @@ async def ListRemoteAgents():
 
 
 async def AddRemoteAgent(path: str):
-    client = ConversationClient(server_url)
+    client = GetClient()
     try:
         await client.register_agent(RegisterAgentRequest(params=path))
     except Exception as e:
@@ -89,7 +113,7 @@ async def AddRemoteAgent(path: str):
 
 
 async def GetEvents() -> list[Event]:
-    client = ConversationClient(server_url)
+    client = GetClient()
     try:
         response = await client.get_events(GetEventRequest())
         return response.result if response.result else []
@@ -98,8 +122,40 @@ async def GetEvents() -> list[Event]:
     return []
 
 
+async def GetEventsAfter(
+    after: int = 0,
+    limit: int | None = None,
+    conversation_id: str | None = None,
+    actor: str | None = None,
+    start_time: float | None = None,
+    end_time: float | None = None,
+) -> tuple[list[Event], int]:
+    """Reads the matching events after the cursor.
+
+    Returns them and the cursor to read the next ones after.
+    """
+    client = GetClient()
+    try:
+        response = await client.get_events(
+            GetEventRequest(
+                params=EventQueryParams(
+                    after=after,
+                    limit=limit,
+                    conversation_id=conversation_id,
+                    actor=actor,
+                    start_time=start_time,
+                    end_time=end_time,
+                )
+            )
+        )
+        return response.result or [], response.cursor or after
+    except Exception as e:
+        print('Failed to get events', e)
+    return [], after
+
+
 async def GetProcessingMessages():
-    client = ConversationClient(server_url)
+    client = GetClient()
     try:
         response = await client.get_pending_messages(PendingMessageRequest())
         return dict(response.result)
@@ -112,7 +168,7 @@ def GetMessageAliases():
 
 
 async def GetTasks():
-    client = ConversationClient(server_url)
+    client = GetClient()
     try:
         response = await client.list_tasks(ListTaskRequest())
         return response.result
@@ -121,7 +177,7 @@ async def GetTasks():
 
 
 async def ListMessages(conversation_id: str) -> list[Message]:
-    client = ConversationClient(server_url)
+    client = GetClient()
     try:
         response = await client.list_messages(
             ListMessageRequest(params=conversation_id)
@@ -133,38 +189,239 @@ async def ListMessages(conversation_id: str) -> list[Message]:
 
 
 async def UpdateAppState(state: AppState, conversation_id: str):
-    """Update the app state."""
+    """Update the app state with what changed since the last update."""
     try:
-        if conversation_id:
-            state.current_conversation_id = conversation_id
-            messages = await ListMessages(conversation_id)
-            if not messages:
-                state.messages = []
-            else:
-                state.messages = [convert_message_to_state(x) for x in messages]
-        conversations = await ListConversations()
-        if not conversations:
-            state.conversations = []
-        else:
-            state.conversations = [
-                convert_conversation_to_state(x) for x in conversations
-            ]
-
-        state.task_list = []
-        for task in await GetTasks():
-            state.task_list.append(
-                SessionTask(
-                    context_id=extract_conversation_id(task),
-                    task=convert_task_to_state(task),
-                )
-            )
-        state.background_tasks = await GetProcessingMessages()
+        ResetSyncedState(state, conversation_id)
+        delta = await GetClient().get_state_snapshot(
+            state.state_version,
+            conversation_id,
+            state.streamed_message_count,
+        )
+        ApplyStateDelta(state, delta)
         state.message_aliases = GetMessageAliases()
     except Exception as e:
         print('Failed to update state: ', e)
         traceback.print_exc(file=sys.stdout)
 
 
+def ResetSyncedState(state: AppState, conversation_id: str):
+    """Starts a full sync when the watched conversation changed.
+
+    Messages are synced per conversation, so switching conversations, or
+    a version of 0, clears the synced state and lists everything again.
+    """
+    if (
+        conversation_id == state.streamed_conversation_id
+        and state.state_version
+    ):
+        return
+    state.streamed_conversation_id = conversation_id
+    state.current_conversation_id = conversation_id
+    state.messages = []
+    state.streamed_message_count = 0
+    state.state_version = 0
+    state.conversations = []
+    state.task_list = []
+
+
+def ApplyStateDelta(state: AppState, delta: StateDelta):
+    """Applies a StateDelta to the app state in place.
+
+    Only changed entries are converted and assigned, so unchanged ones
+    never show up in the Mesop state diff.
+    """
+    if delta.conversations:
+        positions = {
+            c.conversation_id: i for i, c in enumerate(state.conversations)
+        }
+        for conversation in delta.conversations:
+            converted = convert_conversation_to_state(conversation)
+            converted.message_ids = delta.message_ids.get(
+                conversation.conversation_id, []
+            )
+            position = positions.get(conversation.conversation_id)
+            if position is None:
+                state.conversations.append(converted)
+            elif state.conversations[position] != converted:
+                state.conversations[position] = converted
+    if delta.messages:
+        ApplyMessages(
+            state, delta.messages, delta.message_start, delta.message_versions
+        )
+    if delta.tasks:
+        positions = {t.task.task_id: i for i, t in enumerate(state.task_list)}
+        for task in delta.tasks:
+            session_task = SessionTask(
+                context_id=extract_conversation_id(task),
+                task=cached_task_state(task, delta.task_versions.get(task.id)),
+            )
+            position = positions.get(task.id)
+            if position is None:
+                state.task_list.append(session_task)
+            elif state.task_list[position] != session_task:
+                state.task_list[position] = session_task
+    if delta.pending is not None:
+        pending = dict(delta.pending)
+        if state.background_tasks != pending:
+            state.background_tasks = pending
+    state.state_version = delta.version
+
+
+def ApplyMessages(
+    state: AppState,
+    messages: list[Message],
+    start: int | None = None,
+    versions: dict[str, int] | None = None,
+):
+    """Adds messages from the server after the ones already synced.
+
+    state.messages holds the synced messages in server order, followed by
+    the messages added locally that the server has not sent yet. A server
+    message takes the place of its local copy, so only that short local
+    tail is searched, whatever the length of the conversation.
+
+    Messages from position start up to the synced count were updated on
+    the server after they were synced, and replace theirs in place.
+    """
+    versions = versions or {}
+    if start is not None:
+        resent = max(0, state.streamed_message_count - start)
+        for position, message in enumerate(messages[:resent], start):
+            converted = cached_message_state(
+                message, versions.get(message.messageId, 0)
+            )
+            if state.messages[position] != converted:
+                state.messages[position] = converted
+        messages = messages[resent:]
+    for message in messages:
+        converted = cached_message_state(
+            message, versions.get(message.messageId, 0)
+        )
+        synced = state.streamed_message_count
+        local = next(
+            (
+                i
+                for i in range(synced, len(state.messages))
+                if state.messages[i].message_id == message.messageId
+            ),
+            None,
+        )
+        if local == synced:
+            if state.messages[local] != converted:
+                state.messages[local] = converted
+        else:
+            if local is not None:
+                del state.messages[local]
+            state.messages.insert(synced, converted)
+        state.streamed_message_count += 1
+
+
+# Converted messages and tasks by id and version, least recently used first.
+# They are templates shared by all sessions, callers only get copies.
+_message_states: OrderedDict[tuple[str, int], StateMessage] = OrderedDict()
+_task_states: OrderedDict[tuple[str, int], StateTask] = OrderedDict()
+MAX_CACHED_MESSAGES = 50_000
+MAX_CACHED_TASKS = 10_000
+
+
+def cached_message_state(message: Message, version: int = 0) -> StateMessage:
+    """convert_message_to_state, memoized by message id and change version.
+
+    Most messages never change once the server has them and keep version
+    0. Streamed ones are updated in place and get a new version each time.
+    A conversation synced again, or the same message in another session,
+    is not converted twice. Each call returns a copy, since Mesop sessions
+    edit their state in place.
+    """
+    if not message.messageId:
+        return convert_message_to_state(message)
+    key = (message.messageId, version)
+    converted = _message_states.get(key)
+    if converted is None:
+        converted = convert_message_to_state(message)
+        _message_states[key] = converted
+        if len(_message_states) > MAX_CACHED_MESSAGES:
+            _message_states.popitem(last=False)
+    else:
+        _message_states.move_to_end(key)
+    return copy_message_state(converted)
+
+
+def cached_task_state(task: Task, version: int | None) -> StateTask:
+    """convert_task_to_state, memoized by task id and change version."""
+    if version is None:
+        return convert_task_to_state(task)
+    key = (task.id, version)
+    converted = _task_states.get(key)
+    if converted is None:
+        converted = convert_task_to_state(task)
+        _task_states[key] = converted
+        if len(_task_states) > MAX_CACHED_TASKS:
+            _task_states.popitem(last=False)
+    else:
+        _task_states.move_to_end(key)
+    task_state = shallow_copy(converted)
+    task_state.message = copy_message_state(converted.message)
+    task_state.artifacts = [copy_content(c) for c in converted.artifacts]
+    return task_state
+
+
+def copy_message_state(message: StateMessage) -> StateMessage:
+    message_state = shallow_copy(message)
+    message_state.content = copy_content(message.content)
+    return message_state
+
+
+def shallow_copy(value: _T) -> _T:
+    """copy.copy for the state dataclasses, without the pickle protocol."""
+    duplicate = object.__new__(type(value))
+    duplicate.__dict__.update(value.__dict__)
+    return duplicate
+
+
+def copy_content(
+    content: list[tuple[str | dict[str, Any], str]],
+) -> list[tuple[str | dict[str, Any], str]]:
+    """Copies the mutable parts of extracted content.
+
+    Strings, such as base64 file bytes, are shared. Form data is copied.
+    """
+    if not any(isinstance(value, dict) for value, _ in content):
+        return list(content)
+    return [
+        (copy.deepcopy(value) if isinstance(value, dict) else value, media_type)
+        for value, media_type in content
+    ]
+
+
+async def StreamAppState(
+    state: AppState,
+    conversation_id: str,
+    duration: float = LIVE_WINDOW_SECONDS,
+) -> AsyncIterator[None]:
+    """Applies the server's pushed deltas for up to duration seconds.
+
+    Yields after every applied delta so the caller can render it.
+    """
+    ResetSyncedState(state, conversation_id)
+    stream = GetClient().stream_state(
+        state.state_version, conversation_id, state.streamed_message_count
+    )
+    deadline = time.monotonic() + duration
+    try:
+        while (remaining := deadline - time.monotonic()) > 0:
+            try:
+                delta = await asyncio.wait_for(anext(stream), remaining)
+            except (TimeoutError, StopAsyncIteration):
+                break
+            ApplyStateDelta(state, delta)
+            yield
+    except Exception as e:
+        print('Failed to stream state: ', e)
+    finally:
+        await stream.aclose()
+
+
 async def UpdateApiKey(api_key: str):
     """Update the API key"""
     import httpx
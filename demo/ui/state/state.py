@@ -91,7 +91,12 @@ class AppState:
     )
     # This is used to track the message sent to agent with form data
     form_responses: dict[str, str] = dataclasses.field(default_factory=dict)
-    polling_interval: int = 1
+    # Seconds between refreshes, 0 disables them and -1 streams live updates.
+    polling_interval: int = -1
+    # Cursors of the live update stream.
+    state_version: int = 0
+    streamed_conversation_id: str = ''
+    streamed_message_count: int = 0
 
     # Added for API key management
     api_key: str = ''
@@ -0,0 +1,93 @@
+import time
+import unittest
+import uuid
+
+import httpx
+import pytest
+
+from a2a.types import (
+    AgentCapabilities,
+    AgentCard,
+    Message,
+    Part,
+    Role,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+from service.server.adk_host_manager import ADKHostManager
+
+
+pytestmark = pytest.mark.benchmark
+
+AGENT_CARD = AgentCard(
+    name='benchmark_agent',
+    description='Replays task events',
+    url='http://localhost:10000',
+    version='1.0.0',
+    capabilities=AgentCapabilities(streaming=True),
+    defaultInputModes=['text'],
+    defaultOutputModes=['text'],
+    skills=[],
+)
+
+
+def status_event(task_id: str, context_id: str) -> TaskStatusUpdateEvent:
+    return TaskStatusUpdateEvent(
+        taskId=task_id,
+        contextId=context_id,
+        final=False,
+        status=TaskStatus(
+            state=TaskState.working,
+            message=Message(
+                role=Role.agent,
+                parts=[Part(root=TextPart(text='working'))],
+                messageId=str(uuid.uuid4()),
+                contextId=context_id,
+                taskId=task_id,
+            ),
+        ),
+    )
+
+
+class ADKHostManagerBenchmark(unittest.TestCase):
+    """Replays task events and prints the per-event cost by batch.
+
+    Every event lands on a new or recent task, so with linear scans over
+    all tasks ever seen the last batch would be far slower than the first.
+    """
+
+    num_events = 100_000
+    batch = 10_000
+    events_per_task = 4
+
+    def setUp(self) -> None:
+        self.manager = ADKHostManager(httpx.AsyncClient())
+
+    def test_per_event_cost_stays_flat(self) -> None:
+        events = [
+            status_event(
+                f'task-{i // self.events_per_task}',
+                f'context-{i // (self.events_per_task * 10)}',
+            )
+            for i in range(self.num_events)
+        ]
+        timings = []
+        for start in range(0, self.num_events, self.batch):
+            began = time.perf_counter()
+            for event in events[start : start + self.batch]:
+                self.manager.task_callback(event, AGENT_CARD)
+            timings.append((time.perf_counter() - began) / self.batch)
+
+        print(
+            '\nper-event microseconds by batch:',
+            ' '.join(f'{t * 1e6:.1f}' for t in timings),
+        )
+        self.assertEqual(
+            len(self.manager.tasks), self.num_events // self.events_per_task
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
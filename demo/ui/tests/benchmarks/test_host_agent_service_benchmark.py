@@ -0,0 +1,62 @@
+import time
+import unittest
+
+import pytest
+
+from service.types import StateDelta
+from state.host_agent_service import (
+    ApplyStateDelta,
+    ResetSyncedState,
+    convert_message_to_state,
+)
+from state.state import AppState
+from test_host_agent_service import make_message
+
+
+pytestmark = pytest.mark.benchmark
+
+
+class StateConversionBenchmark(unittest.TestCase):
+    """Compares refreshes of a 10k-message conversation.
+
+    Before, each refresh converted every message again; a delta now only
+    converts and places what is new.
+    """
+
+    num_messages = 10_000
+
+    def test_refresh_cost(self) -> None:
+        messages = [make_message(i) for i in range(self.num_messages)]
+
+        began = time.perf_counter()
+        [convert_message_to_state(m) for m in messages]
+        rebuild = time.perf_counter() - began
+
+        state = AppState()
+        ResetSyncedState(state, 'conversation')
+        ApplyStateDelta(state, StateDelta(version=1, messages=messages))
+
+        new = make_message(self.num_messages)
+        began = time.perf_counter()
+        ApplyStateDelta(state, StateDelta(version=2, messages=[new]))
+        incremental = time.perf_counter() - began
+
+        # Switching back to the conversation resends it, but nothing is
+        # converted again.
+        ResetSyncedState(state, 'other')
+        ResetSyncedState(state, 'conversation')
+        delta = StateDelta(version=2, messages=[*messages, new])
+        began = time.perf_counter()
+        ApplyStateDelta(state, delta)
+        resync = time.perf_counter() - began
+
+        print(
+            f'\nfull rebuild {rebuild * 1e3:.1f}ms, '
+            f'one new message {incremental * 1e3:.3f}ms, '
+            f'memoized resync {resync * 1e3:.1f}ms'
+        )
+        self.assertEqual(len(state.messages), self.num_messages + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
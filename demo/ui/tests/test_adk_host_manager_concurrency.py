@@ -0,0 +1,137 @@
+import asyncio
+import threading
+import unittest
+import uuid
+
+import httpx
+
+from a2a.types import (
+    AgentCapabilities,
+    AgentCard,
+    Message,
+    Part,
+    Role,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+from fastapi import FastAPI
+from service.server.server import ConversationServer
+
+
+AGENT_CARD = AgentCard(
+    name='stress_agent',
+    description='Updates tasks concurrently',
+    url='http://localhost:10000',
+    version='1.0.0',
+    capabilities=AgentCapabilities(streaming=True),
+    defaultInputModes=['text'],
+    defaultOutputModes=['text'],
+    skills=[],
+)
+
+
+def make_message(context_id: str, task_id: str, role: Role) -> Message:
+    return Message(
+        role=role,
+        parts=[Part(root=TextPart(text='step'))],
+        messageId=str(uuid.uuid4()),
+        contextId=context_id,
+        taskId=task_id,
+    )
+
+
+class ADKHostManagerConcurrencyTest(unittest.TestCase):
+    """Reads snapshots on request threads while 1000 conversations write."""
+
+    num_conversations = 1000
+    steps = 5
+    num_readers = 4
+
+    def setUp(self) -> None:
+        self.server = ConversationServer(FastAPI(), httpx.AsyncClient())
+        self.manager = self.server.manager
+        self.errors: list[BaseException] = []
+        self.reads = 0
+
+    def tearDown(self) -> None:
+        self.server._blobs.close()
+
+    async def converse(self, context_id: str):
+        task_id = f'task-{context_id}'
+        for _ in range(self.steps):
+            self.manager._append_to_conversation(
+                context_id, make_message(context_id, task_id, Role.user)
+            )
+            await asyncio.sleep(0)
+            self.manager.task_callback(
+                TaskStatusUpdateEvent(
+                    taskId=task_id,
+                    contextId=context_id,
+                    final=False,
+                    status=TaskStatus(
+                        state=TaskState.working,
+                        message=make_message(context_id, task_id, Role.agent),
+                    ),
+                ),
+                AGENT_CARD,
+            )
+            await asyncio.sleep(0)
+
+    def read(self, done: threading.Event):
+        since = 0
+        try:
+            while not done.is_set():
+                tasks = self.manager.tasks
+                before = [t.model_dump_json() for t in tasks[:50]]
+                delta = self.server.state_delta(since)
+                since = delta.version
+                self.server._list_conversation(since=0)
+                self.manager.get_pending_messages()
+                for task in tasks:
+                    ids = [m.messageId for m in task.history or []]
+                    if len(ids) != len(set(ids)):
+                        raise AssertionError(f'duplicate history in {task.id}')
+                # Snapshot items are never written to once read.
+                if [t.model_dump_json() for t in tasks[:50]] != before:
+                    raise AssertionError('snapshot changed after it was read')
+                self.reads += 1
+        except BaseException as e:
+            self.errors.append(e)
+
+    async def run_stress(self):
+        conversations = [
+            await self.manager.create_conversation()
+            for _ in range(self.num_conversations)
+        ]
+        done = threading.Event()
+        readers = [
+            threading.Thread(target=self.read, args=(done,))
+            for _ in range(self.num_readers)
+        ]
+        for reader in readers:
+            reader.start()
+        await asyncio.gather(
+            *(self.converse(c.conversation_id) for c in conversations)
+        )
+        done.set()
+        for reader in readers:
+            reader.join()
+
+    def test_concurrent_conversations(self) -> None:
+        asyncio.run(self.run_stress())
+        self.assertEqual(self.errors, [])
+        self.assertGreater(self.reads, 0)
+        conversations = self.manager.conversations
+        self.assertEqual(len(conversations), self.num_conversations)
+        for conversation in conversations:
+            self.assertEqual(len(conversation.messages), self.steps)
+        tasks = self.manager.tasks
+        self.assertEqual(len(tasks), self.num_conversations)
+        for task in tasks:
+            self.assertEqual(len(task.history), self.steps)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,182 @@
+import tempfile
+import time
+import unittest
+
+import httpx
+
+from a2a.types import (
+    AgentCapabilities,
+    AgentCard,
+    Artifact,
+    Part,
+    TaskArtifactUpdateEvent,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+from service.server.adk_host_manager import ADKHostManager
+from service.server.artifact_assembler import (
+    CHUNK_INDEX_KEY,
+    ArtifactAssembler,
+)
+
+
+AGENT_CARD = AgentCard(
+    name='chunk_agent',
+    description='Streams artifacts in chunks',
+    url='http://localhost:10000',
+    version='1.0.0',
+    capabilities=AgentCapabilities(streaming=True),
+    defaultInputModes=['text'],
+    defaultOutputModes=['text'],
+    skills=[],
+)
+
+
+def chunk(
+    text: str,
+    append: bool = True,
+    last: bool = False,
+    index: int | None = None,
+    artifact_id: str = 'artifact-1',
+) -> TaskArtifactUpdateEvent:
+    return TaskArtifactUpdateEvent(
+        taskId='task-1',
+        contextId='conversation',
+        append=append,
+        lastChunk=last,
+        artifact=Artifact(
+            artifactId=artifact_id,
+            parts=[Part(root=TextPart(text=text))],
+            metadata={CHUNK_INDEX_KEY: index} if index is not None else None,
+        ),
+    )
+
+
+def texts(artifact: Artifact) -> str:
+    return ''.join(p.root.text for p in artifact.parts)
+
+
+class ArtifactAssemblerTest(unittest.TestCase):
+    """Tests chunk ordering, limits and spilling of the assembler."""
+
+    def setUp(self) -> None:
+        self.assembler = ArtifactAssembler(expose_interval=0)
+
+    def tearDown(self) -> None:
+        self.assembler.close()
+
+    def test_whole_artifact_is_returned_as_is(self) -> None:
+        event = chunk('all', append=False, last=True)
+        self.assertIs(self.assembler.add('task-1', event), event.artifact)
+        self.assertEqual(len(self.assembler), 0)
+
+    def test_out_of_order_and_repeated_chunks(self) -> None:
+        events = [
+            chunk('c', index=2, last=True),
+            chunk('a', append=False, index=0),
+            chunk('a', append=False, index=0),
+            chunk('b', index=1),
+        ]
+        results = [self.assembler.add('task-1', e) for e in events]
+        # Nothing is exposed while chunk 0 is missing, the repeated chunk
+        # is ignored, and chunk 1 completes the artifact.
+        self.assertEqual(texts(results[0]), '')
+        self.assertEqual(texts(results[1]), 'a')
+        self.assertIsNone(results[2])
+        self.assertEqual(texts(results[3]), 'abc')
+        self.assertNotIn('partial', results[3].metadata or {})
+        # Late chunks of a finished artifact are dropped.
+        self.assertIsNone(self.assembler.add('task-1', chunk('b', index=1)))
+
+    def test_append_before_first_chunk(self) -> None:
+        partial = self.assembler.add('task-1', chunk('b'))
+        self.assertTrue(partial.metadata['partial'])
+        self.assertEqual(texts(partial), '')
+        self.assembler.add('task-1', chunk('a', append=False))
+        done = self.assembler.add('task-1', chunk('c', last=True))
+        self.assertEqual(texts(done), 'abc')
+
+    def test_partial_views_are_rate_limited(self) -> None:
+        self.assembler.expose_interval = 60
+        first = self.assembler.add('task-1', chunk('a', append=False))
+        self.assertTrue(first.metadata['partial'])
+        self.assertIsNone(self.assembler.add('task-1', chunk('b')))
+        done = self.assembler.add('task-1', chunk('c', last=True))
+        self.assertEqual(texts(done), 'abc')
+
+    def test_size_limit_truncates(self) -> None:
+        self.assembler.max_artifact_bytes = 5
+        self.assembler.add('task-1', chunk('abc', append=False))
+        truncated = self.assembler.add('task-1', chunk('def'))
+        self.assertTrue(truncated.metadata['truncated'])
+        self.assertEqual(texts(truncated), 'abcdef')
+        self.assertEqual(len(self.assembler), 0)
+        self.assertEqual(self.assembler.memory_size, 0)
+
+    def test_idle_assemblies_expire(self) -> None:
+        self.assembler.timeout = 0
+        self.assembler.add('task-1', chunk('a', append=False))
+        time.sleep(0.01)
+        [(task_id, artifact)] = self.assembler.expire()
+        self.assertEqual(task_id, 'task-1')
+        self.assertTrue(artifact.metadata['incomplete'])
+        self.assertEqual(texts(artifact), 'a')
+        self.assertEqual(self.assembler.expire(), [])
+
+    def test_spills_to_disk_over_the_memory_budget(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            assembler = ArtifactAssembler(
+                memory_budget=10, expose_interval=0, spill_directory=directory
+            )
+            assembler.add('task-1', chunk('01234', append=False, index=0))
+            assembler.add('task-1', chunk('fghij', index=2))
+            partial = assembler.add('task-1', chunk('56789', index=3))
+            self.assertEqual(assembler.memory_size, 0)
+            self.assertEqual(partial.parts, [])
+            self.assertEqual(partial.metadata['received_bytes'], 15)
+            partial = assembler.add('task-1', chunk('abcde', index=1))
+            self.assertEqual(partial.metadata['received_bytes'], 20)
+            done = assembler.add('task-1', chunk('!', index=4, last=True))
+            self.assertEqual(texts(done), '01234abcdefghij56789!')
+            assembler.close()
+
+
+class ADKHostManagerArtifactTest(unittest.TestCase):
+    """Tests streamed artifacts on the manager's tasks."""
+
+    def setUp(self) -> None:
+        self.manager = ADKHostManager(httpx.AsyncClient())
+        self.manager._artifacts.expose_interval = 0
+
+    def tearDown(self) -> None:
+        self.manager.close()
+
+    def test_partial_artifact_is_replaced_when_complete(self) -> None:
+        self.manager.task_callback(chunk('a', append=False), AGENT_CARD)
+        [partial] = self.manager.get_task('task-1').artifacts
+        self.assertTrue(partial.metadata['partial'])
+        self.manager.task_callback(chunk('b', last=True), AGENT_CARD)
+        [artifact] = self.manager.get_task('task-1').artifacts
+        self.assertEqual(texts(artifact), 'ab')
+        self.assertIsNone(artifact.metadata)
+
+    def test_final_status_closes_streaming_artifacts(self) -> None:
+        self.manager.task_callback(chunk('a', append=False), AGENT_CARD)
+        self.manager.task_callback(
+            TaskStatusUpdateEvent(
+                taskId='task-1',
+                contextId='conversation',
+                final=True,
+                status=TaskStatus(state=TaskState.completed),
+            ),
+            AGENT_CARD,
+        )
+        [artifact] = self.manager.get_task('task-1').artifacts
+        self.assertTrue(artifact.metadata['incomplete'])
+        self.assertEqual(len(self.manager._artifacts), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
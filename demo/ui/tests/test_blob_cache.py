@@ -0,0 +1,100 @@
+import base64
+import os
+import tempfile
+import unittest
+
+import httpx
+
+from a2a.types import FilePart, FileWithBytes, Message, Part, Role
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from service.server.blob_cache import BlobCache
+from service.server.server import ConversationServer
+
+
+class BlobCacheTest(unittest.TestCase):
+    """Tests the memory budget, spilling and dedupe of BlobCache."""
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = BlobCache(self.directory.name, memory_budget=10)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_same_content_is_stored_once(self) -> None:
+        first = self.cache.put(b'abc', 'text/plain')
+        self.assertEqual(self.cache.put(b'abc', 'text/plain'), first)
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(self.cache.memory_size, 3)
+
+    def test_least_recently_used_blobs_spill_to_disk(self) -> None:
+        a = self.cache.put(b'aaaa', 'text/plain')
+        b = self.cache.put(b'bbbb', 'text/plain')
+        self.cache.get(a)
+        c = self.cache.put(b'cccc', 'text/plain')
+
+        self.assertIsNone(self.cache.get(b).data)
+        self.assertTrue(os.path.exists(self.cache.get(b).path))
+        self.assertIsNotNone(self.cache.get(a).data)
+        self.assertIsNotNone(self.cache.get(c).data)
+        self.assertLessEqual(self.cache.memory_size, 10)
+        self.assertEqual(self.cache.read(self.cache.get(b), 1, 3), b'bb')
+
+
+class FileEndpointTest(unittest.TestCase):
+    """Tests serving cached files with ETag and Range support."""
+
+    def setUp(self) -> None:
+        app = FastAPI()
+        self.server = ConversationServer(app, httpx.AsyncClient())
+        self.server._blobs.memory_budget = 0
+        self.client = TestClient(app)
+        self.data = bytes(range(256)) * 4
+        message = Message(
+            messageId='message-1',
+            role=Role.agent,
+            parts=[
+                Part(
+                    root=FilePart(
+                        file=FileWithBytes(
+                            bytes=base64.b64encode(self.data).decode(),
+                            mimeType='image/png',
+                        )
+                    )
+                )
+            ],
+            metadata={'message_id': 'message-1'},
+        )
+        cached = self.server.cache_content([message])[0]
+        self.uri = cached.parts[0].root.file.uri
+
+    def tearDown(self) -> None:
+        self.server._blobs.close()
+
+    def test_full_file_from_disk(self) -> None:
+        response = self.client.get(self.uri)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, self.data)
+        self.assertEqual(response.headers['content-type'], 'image/png')
+
+    def test_etag_revalidation(self) -> None:
+        etag = self.client.get(self.uri).headers['etag']
+        response = self.client.get(self.uri, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+
+    def test_ranges(self) -> None:
+        response = self.client.get(self.uri, headers={'Range': 'bytes=10-19'})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.content, self.data[10:20])
+        self.assertEqual(
+            response.headers['content-range'], f'bytes 10-19/{len(self.data)}'
+        )
+        suffix = self.client.get(self.uri, headers={'Range': 'bytes=-5'})
+        self.assertEqual(suffix.content, self.data[-5:])
+        outside = self.client.get(self.uri, headers={'Range': 'bytes=5000-'})
+        self.assertEqual(outside.status_code, 416)
+
+
+if __name__ == '__main__':
+    unittest.main()
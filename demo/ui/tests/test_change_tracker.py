@@ -0,0 +1,43 @@
+import asyncio
+import threading
+import unittest
+
+from service.server.change_tracker import ChangeTracker
+
+
+class ChangeTrackerTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for the versioned change feed of the application managers."""
+
+    def test_changed_since_is_ordered_and_deduplicated(self) -> None:
+        changes = ChangeTracker()
+        for item_id in ('a', 'b', 'c', 'a'):
+            changes.touch('tasks', item_id)
+        self.assertEqual(changes.version, 4)
+        self.assertEqual(changes.changed_since('tasks', 0), ['b', 'c', 'a'])
+        self.assertEqual(changes.changed_since('tasks', 2), ['c', 'a'])
+        self.assertEqual(changes.changed_since('tasks', 4), [])
+        self.assertEqual(changes.changed_since('conversations', 0), [])
+        self.assertEqual(changes.item_version('tasks', 'a'), 4)
+
+    async def test_wait_wakes_on_change(self) -> None:
+        changes = ChangeTracker()
+        self.assertFalse(await changes.wait(0, timeout=0.01))
+        waiter = asyncio.create_task(changes.wait(0, timeout=1))
+        await asyncio.sleep(0)
+        changes.notify()
+        self.assertTrue(await waiter)
+        self.assertTrue(await changes.wait(0))
+
+    async def test_changes_from_other_threads_wake_the_loop(self) -> None:
+        changes = ChangeTracker()
+        waiter = asyncio.create_task(changes.wait(0, timeout=1))
+        await asyncio.sleep(0)
+        thread = threading.Thread(target=changes.touch, args=('tasks', 'a'))
+        thread.start()
+        self.assertTrue(await waiter)
+        thread.join()
+        self.assertEqual(changes.item_version('tasks', 'a'), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
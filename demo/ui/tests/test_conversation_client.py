@@ -0,0 +1,46 @@
+import asyncio
+import threading
+import unittest
+
+import httpx
+
+from service.client.client import ConversationClient, SharedHTTPClient
+from service.types import ListTaskRequest
+
+
+class SharedHTTPClientTest(unittest.TestCase):
+    """Tests the pooled client used from the per-handler event loops."""
+
+    def setUp(self) -> None:
+        self.threads: set[str] = set()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.threads.add(threading.current_thread().name)
+            return httpx.Response(
+                200, json={'jsonrpc': '2.0', 'result': [], 'version': 3}
+            )
+
+        self.http = SharedHTTPClient(transport=httpx.MockTransport(handler))
+        self.client = ConversationClient('http://ui/', self.http)
+
+    def tearDown(self) -> None:
+        self.http.close()
+
+    def test_requests_from_separate_loops(self) -> None:
+        # Mesop runs each event handler on a new event loop.
+        for _ in range(3):
+            response = asyncio.run(self.client.list_tasks(ListTaskRequest()))
+            self.assertEqual(response.version, 3)
+        self.assertEqual(self.threads, {'conversation-client'})
+
+    def test_concurrent_requests(self) -> None:
+        async def bundle():
+            return await asyncio.gather(
+                *(self.client.list_tasks(ListTaskRequest()) for _ in range(10))
+            )
+
+        self.assertEqual(len(asyncio.run(bundle())), 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
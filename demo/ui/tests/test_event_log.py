@@ -0,0 +1,92 @@
+import unittest
+import uuid
+
+from a2a.types import Message, Part, Role, TextPart
+from service.server.event_log import EventLog
+from service.types import Event
+
+
+def make_event(
+    conversation_id: str,
+    event_id: str | None = None,
+    actor: str = 'user',
+    timestamp: float = 0.0,
+) -> Event:
+    return Event(
+        id=event_id or str(uuid.uuid4()),
+        actor=actor,
+        content=Message(
+            role=Role.user,
+            parts=[Part(root=TextPart(text='hi'))],
+            messageId=str(uuid.uuid4()),
+            contextId=conversation_id,
+        ),
+        timestamp=timestamp,
+    )
+
+
+class EventLogTest(unittest.TestCase):
+    """Tests for the cursor reads of EventLog."""
+
+    def setUp(self) -> None:
+        self.log = EventLog()
+        self.events = [make_event(f'c{i % 2}') for i in range(10)]
+        for event in self.events:
+            self.log.append(event)
+
+    def test_read_after_cursor(self) -> None:
+        events, cursor = self.log.read(after=7)
+        self.assertEqual(events, self.events[7:])
+        self.assertEqual(cursor, 10)
+        events, cursor = self.log.read(after=cursor)
+        self.assertEqual(events, [])
+        self.assertEqual(cursor, 10)
+
+    def test_read_with_limit(self) -> None:
+        events, cursor = self.log.read(after=2, limit=3)
+        self.assertEqual(events, self.events[2:5])
+        self.assertEqual(cursor, 5)
+
+    def test_read_by_conversation(self) -> None:
+        events, cursor = self.log.read(after=4, conversation_id='c1')
+        self.assertEqual(events, self.events[5::2])
+        self.assertEqual(cursor, 10)
+        events, cursor = self.log.read(limit=2, conversation_id='c0')
+        self.assertEqual(events, self.events[0:4:2])
+        self.assertEqual(cursor, 3)
+        self.assertEqual(self.log.read(conversation_id='none'), ([], 0))
+
+    def test_read_by_actor_and_time_window(self) -> None:
+        log = EventLog()
+        events = [
+            make_event(
+                f'c{i % 2}',
+                actor='host_agent' if i % 3 else 'user',
+                timestamp=float(i),
+            )
+            for i in range(12)
+        ]
+        for event in events:
+            log.append(event)
+        by_actor, cursor = log.read(actor='user')
+        self.assertEqual(by_actor, events[::3])
+        self.assertEqual(cursor, 10)
+        both, _ = log.read(conversation_id='c0', actor='user')
+        self.assertEqual(both, events[::6])
+        window, cursor = log.read(start_time=4, end_time=8, limit=2)
+        self.assertEqual(window, events[4:6])
+        # The cursor skips the events outside the window that were looked at.
+        self.assertEqual(cursor, 6)
+        window, cursor = log.read(after=cursor, start_time=4, end_time=8)
+        self.assertEqual(window, events[6:8])
+        self.assertEqual(cursor, 12)
+
+    def test_append_existing_id_replaces_in_place(self) -> None:
+        replacement = make_event('c0', self.events[3].id)
+        self.assertEqual(self.log.append(replacement), 4)
+        self.assertEqual(len(self.log), 10)
+        self.assertIs(self.log.all()[3], replacement)
+
+
+if __name__ == '__main__':
+    unittest.main()
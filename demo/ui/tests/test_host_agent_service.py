@@ -0,0 +1,127 @@
+import unittest
+import uuid
+
+from unittest import mock
+
+from a2a.types import (
+    DataPart,
+    Message,
+    Part,
+    Role,
+    Task,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+from service.types import StateDelta
+from state import host_agent_service
+from state.host_agent_service import (
+    ApplyStateDelta,
+    ResetSyncedState,
+    convert_message_to_state,
+)
+from state.state import AppState
+
+
+def make_message(i: int, context_id: str = 'conversation') -> Message:
+    return Message(
+        messageId=str(uuid.uuid4()),
+        contextId=context_id,
+        role=Role.agent if i % 2 else Role.user,
+        parts=[
+            Part(root=TextPart(text=f'message {i} ' * 20)),
+            Part(root=DataPart(data={'index': i, 'values': list(range(20))})),
+        ],
+    )
+
+
+def make_task(task_id: str, state: TaskState) -> Task:
+    return Task(
+        id=task_id,
+        contextId='conversation',
+        status=TaskStatus(state=state),
+        history=[make_message(0)],
+    )
+
+
+class ApplyStateDeltaTest(unittest.TestCase):
+    """Tests merging deltas into the app state."""
+
+    def setUp(self) -> None:
+        self.state = AppState()
+        ResetSyncedState(self.state, 'conversation')
+
+    def test_server_message_replaces_local_copy(self) -> None:
+        first, local = make_message(0), make_message(1)
+        ApplyStateDelta(self.state, StateDelta(version=1, messages=[first]))
+        self.state.messages.append(convert_message_to_state(local))
+
+        other = make_message(2)
+        ApplyStateDelta(self.state, StateDelta(version=2, messages=[other]))
+        ApplyStateDelta(self.state, StateDelta(version=3, messages=[local]))
+
+        self.assertEqual(
+            [m.message_id for m in self.state.messages],
+            [first.messageId, other.messageId, local.messageId],
+        )
+        self.assertEqual(self.state.streamed_message_count, 3)
+
+    def test_task_conversion_is_reused_per_version(self) -> None:
+        task = make_task('task-1', TaskState.working)
+        delta = StateDelta(version=1, tasks=[task], task_versions={task.id: 1})
+        ApplyStateDelta(self.state, delta)
+        converted = self.state.task_list[0].task
+
+        ResetSyncedState(self.state, 'other')
+        with mock.patch.object(
+            host_agent_service,
+            'convert_task_to_state',
+            side_effect=AssertionError('converted again'),
+        ):
+            ApplyStateDelta(self.state, delta)
+        self.assertEqual(self.state.task_list[0].task, converted)
+
+        done = make_task('task-1', TaskState.completed)
+        ApplyStateDelta(
+            self.state,
+            StateDelta(version=2, tasks=[done], task_versions={done.id: 2}),
+        )
+        self.assertEqual(len(self.state.task_list), 1)
+        self.assertEqual(
+            self.state.task_list[0].task.state, str(TaskState.completed)
+        )
+
+    def test_sessions_do_not_share_converted_state(self) -> None:
+        message = make_message(0)
+        message.parts.append(
+            Part(root=DataPart(data={'type': 'form', 'form': {'a': 1}}))
+        )
+        task = make_task('task-1', TaskState.working)
+        delta = StateDelta(
+            version=1,
+            messages=[message],
+            tasks=[task],
+            task_versions={task.id: 1},
+        )
+        other = AppState()
+        ResetSyncedState(other, 'conversation')
+        ApplyStateDelta(self.state, delta)
+        ApplyStateDelta(other, delta)
+
+        mine = self.state.messages[0]
+        mine.content[0] = ('edited', 'text/plain')
+        mine.content[2][0]['form']['a'] = 2
+        self.state.task_list[0].task.message.content.clear()
+        self.state.task_list[0].task.state = 'edited'
+
+        theirs = other.messages[0]
+        self.assertEqual(theirs.content[0][0], 'message 0 ' * 20)
+        self.assertEqual(
+            theirs.content[2][0], {'type': 'form', 'form': {'a': 1}}
+        )
+        self.assertEqual(other.task_list[0].task.state, str(TaskState.working))
+        self.assertTrue(other.task_list[0].task.message.content)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+import unittest
+import uuid
+
+import httpx
+
+from a2a.types import (
+    FilePart,
+    FileWithBytes,
+    Message,
+    Part,
+    Role,
+    Task,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from service.server.server import ConversationServer
+
+
+def make_task(task_id: str) -> Task:
+    return Task(
+        id=task_id,
+        contextId='context',
+        status=TaskStatus(state=TaskState.working),
+    )
+
+
+class ListEndpointsTest(unittest.TestCase):
+    """Tests cursor pages and since deltas of the list endpoints."""
+
+    def setUp(self) -> None:
+        app = FastAPI()
+        self.server = ConversationServer(app, httpx.AsyncClient())
+        self.manager = self.server.manager
+        self.client = TestClient(app)
+
+    def tearDown(self) -> None:
+        self.server._blobs.close()
+
+    def post(self, method: str, params=None, **query) -> dict:
+        response = self.client.post(
+            '/' + method,
+            json={
+                'jsonrpc': '2.0',
+                'id': '1',
+                'method': method,
+                'params': params,
+            },
+            params=query,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def test_task_pages(self) -> None:
+        for i in range(5):
+            self.manager.add_task(make_task(f'task-{i}'))
+        ids, cursor = [], 0
+        while cursor is not None:
+            page = self.post('task/list', cursor=cursor, limit=2)
+            self.assertLessEqual(len(page['result']), 2)
+            ids += [t['id'] for t in page['result']]
+            cursor = page['next_cursor']
+        self.assertEqual(ids, [f'task-{i}' for i in range(5)])
+
+    def test_task_deltas(self) -> None:
+        for i in range(3):
+            self.manager.add_task(make_task(f'task-{i}'))
+        version = self.post('task/list')['version']
+        self.assertEqual(self.post('task/list', since=version)['result'], [])
+
+        self.manager.update_task(make_task('task-0'))
+        self.manager.add_task(make_task('task-3'))
+        delta = self.post('task/list', since=version)
+        self.assertEqual(
+            [t['id'] for t in delta['result']], ['task-0', 'task-3']
+        )
+
+        # Delta pages are keyed by version, passed back as since.
+        first = self.post('task/list', since=version, limit=1)
+        self.assertEqual([t['id'] for t in first['result']], ['task-0'])
+        second = self.post('task/list', since=first['next_cursor'], limit=1)
+        self.assertEqual([t['id'] for t in second['result']], ['task-3'])
+        self.assertIsNone(second['next_cursor'])
+
+    def test_conversation_and_message_deltas(self) -> None:
+        conversation_id = self.post('conversation/create')['result'][
+            'conversation_id'
+        ]
+        version = self.post('conversation/list')['version']
+        self.assertEqual(
+            self.post('message/list', conversation_id, since=version)[
+                'result'
+            ],
+            [],
+        )
+
+        conversation = self.manager.get_conversation(conversation_id)
+        for i in range(3):
+            conversation.messages.append(
+                Message(
+                    messageId=str(uuid.uuid4()),
+                    contextId=conversation_id,
+                    role=Role.user,
+                    parts=[Part(root=TextPart(text=f'message {i}'))],
+                )
+            )
+        self.manager.changes.touch('conversations', conversation_id)
+
+        changed = self.post('conversation/list', since=version)
+        self.assertEqual(
+            [c['conversation_id'] for c in changed['result']],
+            [conversation_id],
+        )
+        page = self.post(
+            'message/list', conversation_id, since=version, cursor=1, limit=1
+        )
+        self.assertEqual(page['result'][0]['parts'][0]['text'], 'message 1')
+        self.assertEqual(page['next_cursor'], 2)
+
+    def test_file_parts_are_cached_once(self) -> None:
+        conversation_id = self.post('conversation/create')['result'][
+            'conversation_id'
+        ]
+        message_id = str(uuid.uuid4())
+        messages = self.manager.get_conversation(conversation_id).messages
+        messages.append(
+            Message(
+                messageId=message_id,
+                contextId=conversation_id,
+                role=Role.user,
+                parts=[
+                    Part(
+                        root=FilePart(
+                            file=FileWithBytes(
+                                bytes='aGVsbG8=', mimeType='text/plain'
+                            )
+                        )
+                    )
+                ],
+                metadata={'message_id': message_id},
+            )
+        )
+        uris = [
+            self.post('message/list', conversation_id)['result'][0]['parts'][
+                0
+            ]['file']['uri']
+            for _ in range(2)
+        ]
+        self.assertEqual(uris[0], uris[1])
+        self.assertEqual(list(self.server._cached_messages), [message_id])
+        self.assertEqual(self.client.get(uris[0]).content, b'aGVsbG8=')
+        # The stored message keeps its bytes, only the served copy changes.
+        self.assertIsInstance(messages[0].parts[0].root.file, FileWithBytes)
+
+    def test_state_snapshot(self) -> None:
+        self.manager.add_task(make_task('task-0'))
+        snapshot = self.client.get('/state/snapshot').json()
+        self.assertEqual([t['id'] for t in snapshot['tasks']], ['task-0'])
+        self.assertEqual(snapshot['pending'], [])
+
+        again = self.client.get(
+            '/state/snapshot', params={'since': snapshot['version']}
+        ).json()
+        self.assertEqual(again['tasks'], [])
+        # The pending list is always part of a snapshot.
+        self.assertEqual(again['pending'], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
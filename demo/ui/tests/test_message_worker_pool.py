@@ -0,0 +1,86 @@
+import asyncio
+import unittest
+import uuid
+
+from a2a.types import Message, Part, Role, TextPart
+from service.server.message_worker_pool import (
+    MessageQueueFullError,
+    MessageWorkerPool,
+)
+
+
+def make_message(conversation_id: str, text: str) -> Message:
+    return Message(
+        role=Role.user,
+        parts=[Part(root=TextPart(text=text))],
+        messageId=str(uuid.uuid4()),
+        contextId=conversation_id,
+    )
+
+
+class MessageWorkerPoolTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for ordering, concurrency and bounds of MessageWorkerPool."""
+
+    async def asyncSetUp(self) -> None:
+        self.processed: list[tuple[str, str]] = []
+        self.running = 0
+        self.max_running = 0
+        self.running_conversations: set[str] = set()
+
+        async def process(message: Message) -> None:
+            # A conversation never has two messages in flight.
+            self.assertNotIn(message.contextId, self.running_conversations)
+            self.running_conversations.add(message.contextId)
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            await asyncio.sleep(0.01)
+            self.running -= 1
+            self.running_conversations.discard(message.contextId)
+            self.processed.append(
+                (message.contextId, message.parts[0].root.text)
+            )
+
+        self.pool = MessageWorkerPool(process, concurrency=3, max_queued=100)
+
+    async def asyncTearDown(self) -> None:
+        await self.pool.stop()
+
+    async def wait_for_idle(self) -> None:
+        while self.pool.stats()['queue_depth'] or self.pool.stats()['in_flight']:
+            await asyncio.sleep(0.005)
+
+    async def test_conversation_order_and_concurrency(self) -> None:
+        for i in range(5):
+            for conversation in ('a', 'b', 'c', 'd'):
+                self.pool.submit(make_message(conversation, str(i)))
+        self.assertEqual(self.pool.stats()['queue_depth'], 20)
+        await self.wait_for_idle()
+        for conversation in ('a', 'b', 'c', 'd'):
+            self.assertEqual(
+                [t for c, t in self.processed if c == conversation],
+                ['0', '1', '2', '3', '4'],
+            )
+        self.assertEqual(self.max_running, 3)
+        self.assertEqual(self.pool.stats()['processed'], 20)
+
+    async def test_priority_goes_first(self) -> None:
+        self.pool.concurrency = 1
+        for conversation in ('low1', 'low2', 'low3'):
+            self.pool.submit(make_message(conversation, 'x'), priority=1)
+        self.pool.submit(make_message('high', 'x'), priority=0)
+        await self.wait_for_idle()
+        # Workers only pick up messages once the submitting handler yields.
+        self.assertEqual(
+            [c for c, _ in self.processed], ['high', 'low1', 'low2', 'low3']
+        )
+
+    async def test_full_queue_rejects(self) -> None:
+        self.pool.max_queued = 2
+        self.pool.submit(make_message('a', '0'))
+        self.pool.submit(make_message('a', '1'))
+        with self.assertRaises(MessageQueueFullError):
+            self.pool.submit(make_message('a', '2'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+import asyncio
+import unittest
+
+from types import SimpleNamespace
+
+import httpx
+
+from a2a.types import DataPart, Message, Part, Role, TextPart
+from fastapi import FastAPI
+from hosts.multiagent.host_agent import RemoteUpdate
+from service.server.adk_host_manager import ADKHostManager
+from service.server.server import ConversationServer
+from state.host_agent_service import ApplyStateDelta, ResetSyncedState
+from state.state import AppState
+
+
+def tool_context(context_id: str, call_id: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        state={'context_id': context_id, 'task_id': 'task-1'},
+        function_call_id=call_id,
+    )
+
+
+class RelayPartsTest(unittest.TestCase):
+    """Streams remote agent updates into the conversation."""
+
+    def setUp(self) -> None:
+        self.manager = ADKHostManager(httpx.AsyncClient())
+        self.conversation_id = asyncio.run(
+            self.manager.create_conversation()
+        ).conversation_id
+
+    def relay(self, update: RemoteUpdate, call_id: str = 'call-1'):
+        asyncio.run(
+            self.manager.relay_parts(
+                'currency_agent',
+                update,
+                tool_context(self.conversation_id, call_id),
+            )
+        )
+
+    def messages(self):
+        return self.manager.get_conversation(self.conversation_id).messages
+
+    def part_dumps(self) -> list[list]:
+        return [
+            [part.root.model_dump(exclude_none=True) for part in m.parts]
+            for m in self.messages()
+        ]
+
+    def test_chunks_build_one_message(self) -> None:
+        self.relay(RemoteUpdate(['Looking up rates']))
+        self.relay(RemoteUpdate(['The rate '], append=False))
+        before = self.messages()
+        self.relay(RemoteUpdate(['is 1.08'], append=True))
+
+        [message] = self.messages()
+        self.assertEqual(message.messageId, 'call-1')
+        self.assertEqual(message.role, Role.agent)
+        self.assertEqual(message.taskId, 'task-1')
+        self.assertEqual(
+            self.part_dumps(), [[{'kind': 'text', 'text': 'The rate is 1.08'}]]
+        )
+        # Stored conversations are replaced, not written to.
+        self.assertEqual(before[0].parts[0].root.text, 'The rate ')
+
+    def test_each_delegation_gets_its_own_message(self) -> None:
+        self.relay(RemoteUpdate(['1.08']))
+        self.relay(
+            RemoteUpdate([{'rate': 1.08}, DataPart(data={'id': 'f'})]),
+            call_id='call-2',
+        )
+
+        self.assertEqual(
+            self.part_dumps(),
+            [
+                [{'kind': 'text', 'text': '1.08'}],
+                [
+                    {'kind': 'data', 'data': {'rate': 1.08}},
+                    {'kind': 'data', 'data': {'id': 'f'}},
+                ],
+            ],
+        )
+
+    def test_unknown_conversation_is_ignored(self) -> None:
+        asyncio.run(
+            self.manager.relay_parts(
+                'currency_agent',
+                RemoteUpdate(['1.08']),
+                tool_context('missing', 'call-1'),
+            )
+        )
+        self.assertEqual(self.messages(), [])
+
+
+class RelayPartsSyncTest(unittest.TestCase):
+    """Streamed updates reach a UI that synced the message before."""
+
+    def setUp(self) -> None:
+        self.server = ConversationServer(FastAPI(), httpx.AsyncClient())
+        self.manager = self.server.manager
+        self.conversation_id = asyncio.run(
+            self.manager.create_conversation()
+        ).conversation_id
+        self.state = AppState()
+        ResetSyncedState(self.state, self.conversation_id)
+
+    def relay(self, update: RemoteUpdate):
+        asyncio.run(
+            self.manager.relay_parts(
+                'currency_agent',
+                update,
+                tool_context(self.conversation_id, 'call-1'),
+            )
+        )
+
+    def append(self, text: str):
+        self.manager._append_to_conversation(
+            self.conversation_id,
+            Message(
+                messageId=text,
+                contextId=self.conversation_id,
+                role=Role.agent,
+                parts=[Part(root=TextPart(text=text))],
+            ),
+        )
+
+    def sync(self) -> list[list]:
+        delta = self.server.state_delta(
+            self.state.state_version,
+            self.conversation_id,
+            self.state.streamed_message_count,
+        )
+        ApplyStateDelta(self.state, delta)
+        return [m.content for m in self.state.messages]
+
+    def test_ui_gets_the_final_text(self) -> None:
+        self.append('question')
+        self.relay(RemoteUpdate(['The rate ']))
+        self.assertEqual(
+            self.sync(),
+            [[('question', 'text/plain')], [('The rate ', 'text/plain')]],
+        )
+
+        self.relay(RemoteUpdate(['is 1.08'], append=True))
+        self.append('answer')
+        self.assertEqual(
+            self.sync(),
+            [
+                [('question', 'text/plain')],
+                [('The rate is 1.08', 'text/plain')],
+                [('answer', 'text/plain')],
+            ],
+        )
+        self.assertEqual(self.state.streamed_message_count, 3)
+        # Nothing is resent once the UI is up to date.
+        delta = self.server.state_delta(
+            self.state.state_version,
+            self.conversation_id,
+            self.state.streamed_message_count,
+        )
+        self.assertEqual(delta.messages, [])
+
+        # A fresh session gets the final text too, not a cached chunk.
+        fresh = [m.content for m in self.state.messages]
+        self.state = AppState()
+        ResetSyncedState(self.state, self.conversation_id)
+        self.assertEqual(self.sync(), fresh)
+
+
+if __name__ == '__main__':
+    unittest.main()
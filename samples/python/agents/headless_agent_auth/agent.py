@@ -11,12 +11,12 @@ from auth0.management import Auth0
 from auth0_ai_langchain.auth0_ai import Auth0AI
 from auth0_ai_langchain.ciba import get_ciba_credentials
 
+from common.utils.sqlite_checkpointer import SqliteCheckpointSaver
 from langchain_core.messages import AIMessage, ToolMessage
 from langchain_core.runnables.config import RunnableConfig
 from langchain_core.tools import tool
 from langchain_google_genai import ChatGoogleGenerativeAI
 
-from langgraph.checkpoint.memory import MemorySaver
 from langgraph.prebuilt import create_react_agent
 
 
@@ -131,7 +131,7 @@ class HRAgent:
         self.graph = create_react_agent(
             self.model,
             tools=self.tools,
-            checkpointer=MemorySaver(),
+            checkpointer=SqliteCheckpointSaver.from_env('hr'),
             prompt=self.SYSTEM_INSTRUCTION,
             response_format=(self.RESPONSE_FORMAT_INSTRUCTION, ResponseFormat),
         )
@@ -61,7 +61,9 @@ def main(host, port):
 
         httpx_client = httpx.AsyncClient()
         request_handler = DefaultRequestHandler(
-            agent_executor=LangGraphAgentExecutor(CurrencyAgent()),
+            agent_executor=LangGraphAgentExecutor(
+                CurrencyAgent(), stream_tokens=True
+            ),
             task_store=InMemoryTaskStore(),
             push_notifier=InMemoryPushNotifier(httpx_client),
         )
@@ -0,0 +1,240 @@
+"""AWS cost rollups over FitCloud billing records."""
+
+import threading
+
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+
+# Text fields of a billing record, kept as categoricals. FitCloud sends a
+# camelCase copy of each of them, and of the numeric fields, which is
+# only read when the snake_case field is missing.
+TEXT_COLUMNS = (
+    "billing_period",
+    "billing_entity",
+    "service_name",
+    "product_region",
+    "product_region_name",
+    "usage_type",
+    "operation",
+    "operation_desc",
+    "line_item_type_refine",
+    "price_description",
+    "unit",
+    "currency_code",
+)
+NUMERIC_COLUMNS = ("usage_fee", "usage_amount")
+BREAKDOWN_KEYS = ["service_name", "product_region_name", "usage_type"]
+
+
+def camel_case(name: str) -> str:
+    first, *rest = name.split("_")
+    return first + "".join(word.title() for word in rest)
+
+
+def billing_records(raw_data: dict | list) -> list[dict]:
+    """Returns the records of a FitCloud response or a list of records."""
+    if isinstance(raw_data, dict):
+        return raw_data.get("body") or []
+    return raw_data
+
+
+def normalize_records(records: list[dict]) -> pd.DataFrame:
+    """Builds a compact frame with one snake_case column per field.
+
+    Text columns are categorical and fees and usage amounts are floats, with
+    values that are not numbers read as NaN.
+    """
+    columns = {}
+    for name in TEXT_COLUMNS + NUMERIC_COLUMNS:
+        camel = camel_case(name)
+        values = [r[name] if name in r else r.get(camel) for r in records]
+        if name in NUMERIC_COLUMNS:
+            columns[name] = _floats(values)
+        else:
+            codes, categories = pd.factorize(pd.Series(values, dtype=object))
+            # Categories of one dtype, so frames can be concatenated.
+            dtype = pd.CategoricalDtype(pd.Index(categories, dtype=object))
+            columns[name] = pd.Categorical.from_codes(codes, dtype=dtype)
+    return pd.DataFrame(columns)
+
+
+def _floats(values: list) -> np.ndarray:
+    try:
+        return np.array(values, dtype="float64")
+    except (TypeError, ValueError):
+        return pd.to_numeric(
+            pd.Series(values, dtype=object), errors="coerce"
+        ).to_numpy(dtype="float64")
+
+
+@dataclass(frozen=True)
+class CostSummary:
+    """The costs of one billing period, each rollup sorted by fee."""
+
+    billing_period: str
+    currency_code: str | None
+    total_fee: float
+    line_items: int
+    by_service: dict[str, float]
+    by_region: dict[str, float]
+    by_usage_type: dict[str, float]
+    # Fee and usage per service, region and usage type.
+    breakdown: list[dict[str, Any]]
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    def report(self, top: int = 5) -> str:
+        """Describes the period's costs and where most of them came from."""
+        lines = [
+            f"{self.billing_period} AWS 총 요금: "
+            f"${self.total_fee:.4f} {self.currency_code or ''}".rstrip()
+        ]
+        for title, rollup in (
+            ("서비스별", self.by_service),
+            ("리전별", self.by_region),
+            (f"사용 유형별 (상위 {top}개)", self.by_usage_type),
+        ):
+            lines.append(f"\n{title} 요금:")
+            lines.extend(
+                f"- {name}: ${fee:.4f}" for name, fee in list(rollup.items())[:top]
+            )
+        return "\n".join(lines)
+
+
+class CostAnalytics:
+    """Billing records of several periods and their cached summaries.
+
+    Records are normalized once when they are loaded. Loading records for
+    a period replaces the ones held for it, since a monthly FitCloud
+    response holds whole periods, and drops its summary unless the records
+    are the same as before. A daily response may hold part of a period, so
+    it needs an instance of its own. Summaries of every period that is not
+    cached are computed together, in one grouping of the rows.
+    """
+
+    def __init__(self):
+        self.frame = normalize_records([])
+        self._summaries: dict[str, CostSummary] = {}
+        self._digests: dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def load(self, raw_data: dict | list) -> list[str]:
+        """Loads the records of a response, returns their billing periods."""
+        new = normalize_records(billing_records(raw_data))
+        periods = [str(p) for p in new["billing_period"].dropna().unique()]
+        digests = {
+            period: pd.util.hash_pandas_object(
+                new[new["billing_period"] == period], index=False
+            )
+            .to_numpy()
+            .tobytes()
+            for period in periods
+        }
+        with self._lock:
+            changed = [
+                p for p in periods if self._digests.get(p) != digests[p]
+            ]
+            if changed:
+                kept = self.frame[~self.frame["billing_period"].isin(changed)]
+                rows = new[new["billing_period"].isin(changed)]
+                self.frame = _concat(kept, rows)
+            for period in changed:
+                self._digests[period] = digests[period]
+                self._summaries.pop(period, None)
+        return periods
+
+    @property
+    def periods(self) -> list[str]:
+        return sorted(str(p) for p in self.frame["billing_period"].unique())
+
+    def summary(self, period: str) -> CostSummary:
+        """Returns the summary of a loaded period.
+
+        Raises:
+            KeyError: If no records of the period are loaded.
+        """
+        return self.summaries([period])[period]
+
+    def summaries(
+        self, periods: Iterable[str] | None = None
+    ) -> dict[str, CostSummary]:
+        """Returns the summaries of the periods, all loaded ones by default."""
+        with self._lock:
+            periods = self.periods if periods is None else list(periods)
+            missing = [p for p in periods if p not in self._summaries]
+            if missing:
+                self._summaries.update(_summarize(self.frame, missing))
+            return {p: self._summaries[p] for p in periods}
+
+
+def _concat(first: pd.DataFrame, second: pd.DataFrame) -> pd.DataFrame:
+    """Concatenates two normalized frames, keeping columns categorical."""
+    columns = {}
+    for name in TEXT_COLUMNS:
+        categories = pd.Index(
+            dict.fromkeys(
+                [*first[name].cat.categories, *second[name].cat.categories]
+            ),
+            dtype=object,
+        )
+        dtype = pd.CategoricalDtype(categories)
+        columns[name] = pd.concat(
+            [first[name].astype(dtype), second[name].astype(dtype)],
+            ignore_index=True,
+        )
+    for name in NUMERIC_COLUMNS:
+        columns[name] = pd.concat(
+            [first[name], second[name]], ignore_index=True
+        )
+    return pd.DataFrame(columns)
+
+
+def _rollup(fees: pd.Series, level: str) -> dict[str, float]:
+    totals = fees.groupby(level=level, observed=True, sort=False).sum()
+    return totals.sort_values(ascending=False).to_dict()
+
+
+def _summarize(
+    frame: pd.DataFrame, periods: list[str]
+) -> dict[str, CostSummary]:
+    rows = frame[frame["billing_period"].isin(periods)]
+    if len(periods) != rows["billing_period"].nunique():
+        found = set(rows["billing_period"].unique())
+        raise KeyError(f"No records for {sorted(set(periods) - found)}")
+    # The only pass over the rows, every rollup is taken from its result.
+    detail = rows.groupby(
+        ["billing_period", *BREAKDOWN_KEYS], observed=True, sort=False
+    )[["usage_fee", "usage_amount"]].sum()
+    totals = rows.groupby("billing_period", observed=True).agg(
+        total_fee=("usage_fee", "sum"),
+        line_items=("usage_fee", "size"),
+        currency_code=("currency_code", "first"),
+    )
+    by_period = dict(iter(detail.groupby(level=0, observed=True)))
+    summaries = {}
+    for period, total in totals.iterrows():
+        # Empty when every row lacks a service, region or usage type.
+        period_detail = (
+            by_period.get(period, detail.iloc[:0])
+            .droplevel(0)
+            .sort_values("usage_fee", ascending=False)
+        )
+        fees = period_detail["usage_fee"]
+        currency_code = total["currency_code"]
+        summaries[str(period)] = CostSummary(
+            billing_period=str(period),
+            currency_code=None if pd.isna(currency_code) else currency_code,
+            total_fee=float(total["total_fee"]),
+            line_items=int(total["line_items"]),
+            by_service=_rollup(fees, "service_name"),
+            by_region=_rollup(fees, "product_region_name"),
+            by_usage_type=_rollup(fees, "usage_type"),
+            breakdown=period_detail.reset_index().to_dict("records"),
+        )
+    return summaries
@@ -0,0 +1,386 @@
+"""A local SQLite warehouse of FitCloud daily costs and their rollups."""
+
+import calendar
+import datetime
+import sqlite3
+import threading
+import time
+
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Literal
+
+import requests
+
+from .cost_analytics import billing_records, normalize_records
+
+
+FITCLOUD_URL = "https://aws.fitcloud.co.kr/api/v1"
+KEYS = ["service_name", "product_region_name", "usage_type"]
+Period = Literal["day", "week", "month"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fetched_days (
+    day TEXT PRIMARY KEY,
+    fetched_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS daily_costs (
+    day TEXT NOT NULL,
+    service_name TEXT NOT NULL,
+    product_region_name TEXT NOT NULL,
+    usage_type TEXT NOT NULL,
+    usage_fee REAL NOT NULL,
+    usage_amount REAL NOT NULL,
+    PRIMARY KEY (day, service_name, product_region_name, usage_type)
+);
+CREATE TABLE IF NOT EXISTS weekly_costs (
+    week TEXT NOT NULL,
+    service_name TEXT NOT NULL,
+    product_region_name TEXT NOT NULL,
+    usage_type TEXT NOT NULL,
+    usage_fee REAL NOT NULL,
+    usage_amount REAL NOT NULL,
+    PRIMARY KEY (week, service_name, product_region_name, usage_type)
+);
+CREATE TABLE IF NOT EXISTS monthly_costs (
+    month TEXT NOT NULL,
+    service_name TEXT NOT NULL,
+    product_region_name TEXT NOT NULL,
+    usage_type TEXT NOT NULL,
+    usage_fee REAL NOT NULL,
+    usage_amount REAL NOT NULL,
+    PRIMARY KEY (month, service_name, product_region_name, usage_type)
+);
+"""
+
+# The week of a day is named by its Monday, the month by YYYY-MM.
+_WEEK_OF_DAY = "date(day, 'weekday 0', '-6 days')"
+_MONTH_OF_DAY = "substr(day, 1, 7)"
+
+
+def parse_day(text: str, last: bool = False) -> datetime.date:
+    """Parses YYYYMMDD, YYYY-MM-DD, or YYYYMM as its first or last day."""
+    digits = text.replace("-", "")
+    if len(digits) == 6:
+        year, month = int(digits[:4]), int(digits[4:])
+        day = calendar.monthrange(year, month)[1] if last else 1
+        return datetime.date(year, month, day)
+    return datetime.datetime.strptime(digits, "%Y%m%d").date()
+
+
+def week_of(day: datetime.date) -> datetime.date:
+    return day - datetime.timedelta(days=day.weekday())
+
+
+class FitCloudClient:
+    """Fetches the on-demand costs of the corporation from FitCloud."""
+
+    def __init__(
+        self,
+        token: str,
+        base_url: str = FITCLOUD_URL,
+        session: requests.Session | None = None,
+        timeout: float = 30.0,
+    ):
+        self.token = token
+        self.base_url = base_url.rstrip("/")
+        self.session = session or requests.Session()
+        self.timeout = timeout
+
+    def daily(self, day: datetime.date) -> list[dict]:
+        """Returns the billing records of one day.
+
+        Raises:
+            requests.RequestException: If the request fails.
+        """
+        response = self.session.post(
+            f"{self.base_url}/costs/ondemand/corp/daily",
+            headers={"Authorization": f"Bearer {self.token}"},
+            data={"from": f"{day:%Y%m%d}", "to": f"{day:%Y%m%d}"},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return billing_records(response.json())
+
+
+class CostWarehouse:
+    """Daily FitCloud costs kept in SQLite, with weekly and monthly rollups.
+
+    Each day is fetched from FitCloud once and recorded, so a question only
+    sends the days it has not seen before upstream, several at a time.
+    Daily records carry no date, so each day takes a request of its own;
+    when some fail, the days that arrived are still recorded.
+    Days within settle_days of today may still change and are fetched
+    again once they are older than recent_ttl seconds. Costs are stored
+    per day, service, region and usage type, and the weekly and monthly
+    tables are rebuilt for the weeks and months of every day loaded.
+    """
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        client: FitCloudClient | None = None,
+        settle_days: int = 3,
+        recent_ttl: float = 3600.0,
+        max_workers: int = 4,
+    ):
+        self.path = path
+        self.client = client
+        self.settle_days = settle_days
+        self.recent_ttl = recent_ttl
+        self.max_workers = max_workers
+        # Number of days fetched from FitCloud.
+        self.upstream_calls = 0
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.RLock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """The connection, opened and migrated on first use."""
+        with self._lock:
+            if self._conn is None:
+                conn = sqlite3.connect(
+                    self.path, check_same_thread=False, isolation_level=None
+                )
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+                self._conn = conn
+            return self._conn
+
+    def costs(
+        self, from_date: str, to_date: str, period: Period = "day"
+    ) -> dict[str, dict[str, Any]]:
+        """Returns the costs of each day, week or month in the range.
+
+        Weeks and months that the range covers whole come from their
+        rollups, and those it cuts are summed from their days in the range.
+
+        Args:
+            from_date: The first day, as YYYYMMDD, YYYY-MM-DD or YYYYMM.
+            to_date: The last day, in the same formats.
+            period: The period to total the costs by.
+
+        Returns:
+            The total fee and the fees by service, region and usage type of
+            each period, keyed by its day, Monday or YYYY-MM.
+
+        Raises:
+            requests.RequestException: If fetching a missing day fails.
+        """
+        start = parse_day(from_date)
+        end = parse_day(to_date, last=True)
+        self.load(start, end)
+        with self._lock:
+            rows = self._rows(start, end, period)
+        return _summarize(rows)
+
+    def load(self, start: datetime.date, end: datetime.date) -> int:
+        """Fetches the days of the range that are missing, returns how many.
+
+        Raises:
+            requests.RequestException: If fetching a day fails, once the
+                days that were fetched are stored.
+        """
+        days = self._missing_days(start, end)
+        if not days:
+            return 0
+        with ThreadPoolExecutor(min(self.max_workers, len(days))) as pool:
+            futures = {day: pool.submit(self.client.daily, day) for day in days}
+        fetched, error = {}, None
+        for day, future in futures.items():
+            try:
+                fetched[day] = future.result()
+            except requests.RequestException as e:
+                error = error or e
+        with self._lock:
+            self.upstream_calls += len(days)
+            if fetched:
+                self._store(fetched)
+        if error is not None:
+            raise error
+        return len(fetched)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def __enter__(self) -> "CostWarehouse":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _missing_days(
+        self, start: datetime.date, end: datetime.date
+    ) -> list[datetime.date]:
+        today = datetime.date.today()
+        settled = today - datetime.timedelta(self.settle_days)
+        stale = time.time() - self.recent_ttl
+        # Days to come have no costs yet.
+        end = min(end, today)
+        with self._lock:
+            fetched = dict(
+                self.conn.execute(
+                    "SELECT day, fetched_at FROM fetched_days "
+                    "WHERE day BETWEEN ? AND ?",
+                    (start.isoformat(), end.isoformat()),
+                )
+            )
+        days = []
+        for offset in range((end - start).days + 1):
+            day = start + datetime.timedelta(offset)
+            fetched_at = fetched.get(day.isoformat())
+            if fetched_at is None or (day > settled and fetched_at < stale):
+                days.append(day)
+        return days
+
+    def _store(self, records_by_day: dict[datetime.date, list[dict]]):
+        now = time.time()
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for day, records in records_by_day.items():
+                conn.execute(
+                    "DELETE FROM daily_costs WHERE day = ?", (day.isoformat(),)
+                )
+                conn.executemany(
+                    "INSERT INTO daily_costs VALUES (?, ?, ?, ?, ?, ?)",
+                    _daily_rows(day, records),
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO fetched_days VALUES (?, ?)",
+                    (day.isoformat(), now),
+                )
+            weeks = {week_of(day).isoformat() for day in records_by_day}
+            months = {f"{day:%Y-%m}" for day in records_by_day}
+            self._roll_up(conn, "weekly_costs", "week", _WEEK_OF_DAY, weeks)
+            self._roll_up(conn, "monthly_costs", "month", _MONTH_OF_DAY, months)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    @staticmethod
+    def _roll_up(
+        conn: sqlite3.Connection,
+        table: str,
+        column: str,
+        period_of_day: str,
+        periods: set[str],
+    ):
+        marks = ", ".join("?" * len(periods))
+        conn.execute(
+            f"DELETE FROM {table} WHERE {column} IN ({marks})", list(periods)
+        )
+        conn.execute(
+            f"INSERT INTO {table} SELECT {period_of_day}, service_name, "
+            "product_region_name, usage_type, sum(usage_fee), "
+            f"sum(usage_amount) FROM daily_costs WHERE {period_of_day} IN "
+            f"({marks}) GROUP BY 1, 2, 3, 4",
+            list(periods),
+        )
+
+    def _rows(
+        self, start: datetime.date, end: datetime.date, period: Period
+    ) -> list[tuple]:
+        """Returns (period, service, region, usage type, fee) rows."""
+        select = "service_name, product_region_name, usage_type, usage_fee"
+        if period == "day":
+            return self.conn.execute(
+                f"SELECT day, {select} FROM daily_costs "
+                "WHERE day BETWEEN ? AND ?",
+                (start.isoformat(), end.isoformat()),
+            ).fetchall()
+        if period == "week":
+            table, column, period_of_day = "weekly_costs", "week", _WEEK_OF_DAY
+            whole = _whole_weeks(start, end)
+        else:
+            table, column, period_of_day = (
+                "monthly_costs",
+                "month",
+                _MONTH_OF_DAY,
+            )
+            whole = _whole_months(start, end)
+        marks = ", ".join("?" * len(whole))
+        rows = self.conn.execute(
+            f"SELECT {column}, {select} FROM {table} "
+            f"WHERE {column} IN ({marks})",
+            whole,
+        ).fetchall()
+        # The parts of the weeks or months the range cuts.
+        rows += self.conn.execute(
+            f"SELECT {period_of_day}, service_name, product_region_name, "
+            "usage_type, sum(usage_fee) FROM daily_costs "
+            f"WHERE day BETWEEN ? AND ? AND {period_of_day} NOT IN ({marks}) "
+            "GROUP BY 1, 2, 3, 4",
+            (start.isoformat(), end.isoformat(), *whole),
+        ).fetchall()
+        return rows
+
+
+def _daily_rows(day: datetime.date, records: list[dict]) -> list[tuple]:
+    frame = normalize_records(records)
+    if frame.empty:
+        return []
+    keys = frame[KEYS].astype(object).fillna("")
+    totals = (
+        frame[["usage_fee", "usage_amount"]]
+        .fillna(0.0)
+        .groupby([keys[key] for key in KEYS])
+        .sum()
+    )
+    return [
+        (day.isoformat(), *key, fee, amount)
+        for key, fee, amount in zip(
+            totals.index, totals["usage_fee"], totals["usage_amount"]
+        )
+    ]
+
+
+def _whole_weeks(start: datetime.date, end: datetime.date) -> list[str]:
+    monday = week_of(start)
+    if monday < start:
+        monday += datetime.timedelta(weeks=1)
+    weeks = []
+    while monday + datetime.timedelta(days=6) <= end:
+        weeks.append(monday.isoformat())
+        monday += datetime.timedelta(weeks=1)
+    return weeks
+
+
+def _whole_months(start: datetime.date, end: datetime.date) -> list[str]:
+    months = []
+    year, month = start.year, start.month
+    if start.day != 1:
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    while True:
+        last = calendar.monthrange(year, month)[1]
+        if datetime.date(year, month, last) > end:
+            return months
+        months.append(f"{year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def _summarize(rows: list[tuple]) -> dict[str, dict[str, Any]]:
+    totals: dict[str, dict[str, Any]] = {}
+    for period, service, region, usage_type, fee in rows:
+        summary = totals.get(period)
+        if summary is None:
+            summary = totals[period] = {
+                "total_fee": 0.0,
+                "by_service": defaultdict(float),
+                "by_region": defaultdict(float),
+                "by_usage_type": defaultdict(float),
+            }
+        summary["total_fee"] += fee
+        summary["by_service"][service] += fee
+        summary["by_region"][region] += fee
+        summary["by_usage_type"][usage_type] += fee
+    for summary in totals.values():
+        for rollup in ("by_service", "by_region", "by_usage_type"):
+            summary[rollup] = dict(
+                sorted(summary[rollup].items(), key=lambda x: x[1], reverse=True)
+            )
+    return dict(sorted(totals.items()))
@@ -3,20 +3,27 @@ from typing import Any, Literal, Dict
 
 import httpx
 
-from langchain_core.messages import AIMessage, ToolMessage
+from common.utils.exchange_rates import ExchangeRateService
+from common.utils.sqlite_checkpointer import SqliteCheckpointSaver
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, ToolMessage
 from langchain_core.tools import tool
 from langchain_google_genai import ChatGoogleGenerativeAI
 from pydantic import BaseModel
 
-from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.prebuilt import create_react_agent
 
 
-memory = MemorySaver()
+memory = SqliteCheckpointSaver.from_env("currency")
+
+# Shared by every conversation, so rate tables are cached and requests
+# reuse pooled connections instead of blocking the event loop.
+rates = ExchangeRateService()
 
 
 @tool
-def get_exchange_rate(
+async def get_exchange_rate(
     currency_from: str = "USD",
     currency_to: str = "EUR",
     currency_date: str = "latest",
@@ -32,20 +39,22 @@ def get_exchange_rate(
         A dictionary containing the exchange rate data, or an error message if the request fails.
     """
     try:
-        response = httpx.get(
-            f"https://api.frankfurter.app/{currency_date}",
-            params={"from": currency_from, "to": currency_to},
-        )
-        response.raise_for_status()
-
-        data = response.json()
-        if "rates" not in data:
-            return {"error": "Invalid API response format."}
-        return data
+        return await rates.get_rate(currency_from, currency_to, currency_date)
     except httpx.HTTPError as e:
         return {"error": f"API request failed: {e}"}
-    except ValueError:
-        return {"error": "Invalid JSON response from API."}
+    except ValueError as e:
+        return {"error": str(e)}
+
+
+def message_text(message: AIMessageChunk) -> str:
+    """Returns the text of a message whose content may be a list of blocks."""
+    if isinstance(message.content, str):
+        return message.content
+    return "".join(
+        block if isinstance(block, str) else block.get("text", "")
+        for block in message.content
+        if isinstance(block, str) or block.get("type") == "text"
+    )
 
 
 class ResponseFormat(BaseModel):
@@ -66,29 +75,59 @@ class CurrencyAgent:
         "Set response status to completed if the request is complete."
     )
 
-    def __init__(self):
-        self.model = ChatGoogleGenerativeAI(model="gemini-2.0-flash")
+    def __init__(
+        self,
+        model: BaseChatModel | None = None,
+        checkpointer: BaseCheckpointSaver | None = None,
+    ):
+        self.model = model or ChatGoogleGenerativeAI(model="gemini-2.0-flash")
         self.tools = [get_exchange_rate]
 
         ## REACT Agent 구현
         self.graph = create_react_agent(
             self.model,
             tools=self.tools,
-            checkpointer=memory,
+            checkpointer=checkpointer or memory,
             prompt=self.SYSTEM_INSTRUCTION,
             response_format=ResponseFormat,
         )
 
-    def invoke(self, query, sessionId) -> str:
+    async def invoke(self, query, sessionId) -> Dict[str, Any]:
         config = {"configurable": {"thread_id": sessionId}}
-        self.graph.invoke({"messages": [("user", query)]}, config)
-        return self.get_agent_response(config)
+        await self.graph.ainvoke({"messages": [("user", query)]}, config)
+        return await self.get_agent_response(config)
+
+    async def stream(
+        self, query, sessionId, stream_tokens: bool = False
+    ) -> AsyncIterable[Dict[str, Any]]:
+        """Streams progress updates, then the agent's response.
 
-    async def stream(self, query, sessionId) -> AsyncIterable[Dict[str, Any]]:
+        With stream_tokens, the text tokens of the model's answer are also
+        yielded as they are generated, marked with is_token.
+        """
         inputs = {"messages": [("user", query)]}
         config = {"configurable": {"thread_id": sessionId}}
-
-        for item in self.graph.stream(inputs, config, stream_mode="values"):
+        stream_mode = ["values", "messages"] if stream_tokens else ["values"]
+
+        async for mode, item in self.graph.astream(
+            inputs, config, stream_mode=stream_mode
+        ):
+            if mode == "messages":
+                chunk, metadata = item
+                # Only the answer, not the structured response's tool call.
+                if (
+                    isinstance(chunk, AIMessageChunk)
+                    and metadata.get("langgraph_node") == "agent"
+                ):
+                    text = message_text(chunk)
+                    if text:
+                        yield {
+                            "is_task_complete": False,
+                            "require_user_input": False,
+                            "content": text,
+                            "is_token": True,
+                        }
+                continue
             message = item["messages"][-1]
             if (
                 isinstance(message, AIMessage)
@@ -107,10 +146,10 @@ class CurrencyAgent:
                     "content": "Processing the exchange rates..",
                 }
 
-        yield self.get_agent_response(config)
+        yield await self.get_agent_response(config)
 
-    def get_agent_response(self, config):
-        current_state = self.graph.get_state(config)
+    async def get_agent_response(self, config):
+        current_state = await self.graph.aget_state(config)
         structured_response = current_state.values.get("structured_response")
         if structured_response and isinstance(structured_response, ResponseFormat):
             if structured_response.status == "input_required":
@@ -1,5 +1,6 @@
 from typing import Any, AsyncIterable, Dict, Optional
-from langgraph.checkpoint.memory import MemorySaver
+from common.utils.document_store import DocumentStore
+from common.utils.sqlite_checkpointer import SqliteCheckpointSaver
 from langgraph.prebuilt import create_react_agent
 from langchain_core.messages import AIMessage, ToolMessage
 from langchain_core.tools import tool
@@ -19,6 +20,9 @@ WORKING_DIRECTORY = Path("./tmp")
 # tmp 폴더가 없으면 생성
 WORKING_DIRECTORY.mkdir(exist_ok=True)
 
+# 도구 호출 사이에 열린 문서와 줄 인덱스를 재사용
+documents = DocumentStore(WORKING_DIRECTORY)
+
 
 # 문서 읽기
 @tool
@@ -28,13 +32,8 @@ def read_document(
     end: Annotated[Optional[int], "The end line. Default is None"] = None,
 ) -> str:
     """Read the specified document."""
-    # 주어진 파일 이름으로 문서 읽기
-    with (WORKING_DIRECTORY / file_name).open("r") as file:
-        lines = file.readlines()
-    # 시작 줄이 지정되지 않은 경우 기본값 설정
-    if start is not None:
-        start = 0
-    return "\n".join(lines[start:end])
+    # 줄 인덱스로 필요한 범위만 읽기
+    return documents.read(file_name, start, end)
 
 
 # 문서 쓰기 및 저장
@@ -45,8 +44,7 @@ def write_document(
 ) -> Annotated[str, "Path of the saved document file."]:
     """Create and save a text document."""
     # 주어진 파일 이름으로 문서 저장
-    with (WORKING_DIRECTORY / file_name).open("w") as file:
-        file.write(content)
+    documents.write(file_name, content)
     return f"Document saved to {file_name}"
 
 
@@ -60,24 +58,11 @@ def edit_document(
     ],
 ) -> Annotated[str, "File path of the edited document."]:
     """Edit a document by inserting text at specific line numbers."""
-
-    # 주어진 파일 이름으로 문서 읽기
-    with (WORKING_DIRECTORY / file_name).open("r") as file:
-        lines = file.readlines()
-
-    # 삽입할 텍스트를 정렬하여 처리
-    sorted_inserts = sorted(inserts.items())
-
-    # 지정된 줄 번호에 텍스트 삽입
-    for line_number, text in sorted_inserts:
-        if 1 <= line_number <= len(lines) + 1:
-            lines.insert(line_number - 1, text + "\n")
-        else:
-            return f"Error: Line number {line_number} is out of range."
-
-    # 편집된 문서를 파일에 저장
-    with (WORKING_DIRECTORY / file_name).open("w") as file:
-        file.writelines(lines)
+    # 모든 삽입을 한 번에 적용하여 저장
+    try:
+        documents.insert(file_name, inserts)
+    except ValueError as e:
+        return f"Error: {e}"
 
     return f"Document edited and saved to {file_name}"
 
@@ -100,7 +85,7 @@ class ResponseFormat(BaseModel):
 
 class DocumentWriterAgent:
     def __init__(self):
-        self.memory = MemorySaver()
+        self.memory = SqliteCheckpointSaver.from_env("doc_writer")
         self.model = ChatGoogleGenerativeAI(model="gemini-2.0-flash")
         self.tools = [write_document, edit_document, read_document]
 
@@ -2,81 +2,77 @@ from langchain.tools import tool
 import requests
 import os
 
+from .cost_warehouse import CostWarehouse, FitCloudClient
+
+# 환경변수에서 토큰 읽기
+token = os.getenv("FITCLOUD_TOKEN","D5G&4TTXUPK!WOQ4SKBSRNXNT&F&!SA60RBDP5BZM%R6567IB6#SGU2PG!@DEV&~")
+if not token:
+    raise ValueError("환경 변수 'FITCLOUD_TOKEN'을 찾을 수 없습니다. .env 파일 또는 환경 설정에서 값을 등록해주세요.")
+
+# 이미 가져온 날짜의 비용은 로컬에 저장하고, 없는 날짜만 FitCloud API에 요청
+warehouse = CostWarehouse(
+    os.getenv("FITCLOUD_COST_DB", "fitcloud_costs.db"),
+    client=FitCloudClient(token),
+)
+
+
+def request_error(e: requests.RequestException) -> dict:
+    return {
+        "error": str(e),
+        "status_code": getattr(e.response, 'status_code', None),
+        "response_text": getattr(e.response, 'text', None)
+    }
+
+
 @tool
 def aws_costs_daily(from_date: str, to_date: str) -> dict:
     """
-    지정된 날짜 범위 내의 AWS 온디맨드 비용 데이터를 가져옵니다.
-    
+    지정된 날짜 범위 내의 AWS 온디맨드 비용 데이터를 일별로 가져옵니다.
+
     Parameters:
     - from_date: 조회 시작일 (형식: YYYYMMDD)
     - to_date: 조회 종료일 (형식: YYYYMMDD)
-    
+
     Returns:
-    - JSON 형태의 비용 분석 데이터
+    - 일별 총 비용과 서비스, 리전, 사용 유형별 비용
     """
-    # 환경변수에서 토큰 읽기
-    token = os.getenv("FITCLOUD_TOKEN","D5G&4TTXUPK!WOQ4SKBSRNXNT&F&!SA60RBDP5BZM%R6567IB6#SGU2PG!@DEV&~")
-    if not token:
-        raise ValueError("환경 변수 'FITCLOUD_TOKEN'을 찾을 수 없습니다. .env 파일 또는 환경 설정에서 값을 등록해주세요.")
-    
-    url = "https://aws.fitcloud.co.kr/api/v1/costs/ondemand/corp/daily"
-    
-    headers = {
-        "Authorization": f"Bearer {token}"
-    }
-    
-    form_data = {
-        "from": from_date,
-        "to": to_date
-    }
-
     try:
-        response = requests.post(url, headers=headers, data=form_data)
-        response.raise_for_status()
-        return response.json()
+        return warehouse.costs(from_date, to_date, "day")
     except requests.RequestException as e:
-        return {
-            "error": str(e),
-            "status_code": getattr(e.response, 'status_code', None),
-            "response_text": getattr(e.response, 'text', None)
-        }
+        return request_error(e)
 
 
 @tool
-def aws_costs_monthly(from_date: str, to_date: str) -> dict:
+def aws_costs_weekly(from_date: str, to_date: str) -> dict:
     """
-    지정된 날짜 범위 내의 AWS 온디맨드 비용 데이터를 가져옵니다.
-    
+    지정된 날짜 범위 내의 AWS 온디맨드 비용 데이터를 주별(월요일 기준)로 가져옵니다.
+
     Parameters:
     - from_date: 조회 시작일 (형식: YYYYMMDD)
     - to_date: 조회 종료일 (형식: YYYYMMDD)
-    
+
     Returns:
-    - JSON 형태의 비용 분석 데이터
+    - 주별 총 비용과 서비스, 리전, 사용 유형별 비용
     """
-    # 환경변수에서 토큰 읽기
-    token = os.getenv("FITCLOUD_TOKEN","D5G&4TTXUPK!WOQ4SKBSRNXNT&F&!SA60RBDP5BZM%R6567IB6#SGU2PG!@DEV&~")
-    if not token:
-        raise ValueError("환경 변수 'FITCLOUD_TOKEN'을 찾을 수 없습니다. .env 파일 또는 환경 설정에서 값을 등록해주세요.")
-    
-    url = "https://aws.fitcloud.co.kr/api/v1/costs/ondemand/corp/daily"
-    
-    headers = {
-        "Authorization": f"Bearer {token}"
-    }
-    
-    form_data = {
-        "from": from_date,
-        "to": to_date
-    }
+    try:
+        return warehouse.costs(from_date, to_date, "week")
+    except requests.RequestException as e:
+        return request_error(e)
+
+
+@tool
+def aws_costs_monthly(from_date: str, to_date: str) -> dict:
+    """
+    지정된 날짜 범위 내의 AWS 온디맨드 비용 데이터를 월별로 가져옵니다.
 
+    Parameters:
+    - from_date: 조회 시작일 (형식: YYYYMMDD 또는 YYYYMM)
+    - to_date: 조회 종료일 (형식: YYYYMMDD 또는 YYYYMM)
+
+    Returns:
+    - 월별 총 비용과 서비스, 리전, 사용 유형별 비용
+    """
     try:
-        response = requests.post(url, headers=headers, data=form_data)
-        response.raise_for_status()
-        return response.json()
+        return warehouse.costs(from_date, to_date, "month")
     except requests.RequestException as e:
-        return {
-            "error": str(e),
-            "status_code": getattr(e.response, 'status_code', None),
-            "response_text": getattr(e.response, 'text', None)
-        }
+        return request_error(e)
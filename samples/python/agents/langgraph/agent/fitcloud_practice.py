@@ -1,4 +1,4 @@
-import pandas as pd
+from .cost_analytics import CostAnalytics, CostSummary
 from langgraph.graph import StateGraph
 from langgraph.prebuilt import ToolNode
 from typing import TypedDict, Annotated
@@ -12,87 +12,29 @@ import requests
 # --------------------
 # 2. 전처리 함수
 # --------------------
-def preprocess_aws_cost_data(raw_data) -> pd.DataFrame:
-# --- 데이터 전처리 ---
-# 1. 중복 컬럼 정리 (snake_case로 통일)
-# camelCase 컬럼들을 제거하고 snake_case 컬럼들을 유지합니다.
-    # duplicate_camel_columns = [
-    #     'productRegionName', 'billingEntity', 'lineItemTypeRefine', 'usageFee',
-    #     'usageType', 'productRegion', 'billingPeriod', 'serviceName',
-    #     'operationDesc', 'priceDescription', 'usageAmount', 'currencyCode'
-    # ]
-    print(raw_data['body'])
-    print("======================")
-    df = pd.DataFrame(raw_data['body'])
-
-    # df = df.drop(columns=duplicate_camel_columns)
-    # 2. 숫자형 데이터 타입 변환 (문자열 -> 숫자)
-    numeric_cols = ['usage_fee', 'usage_amount']
-    for col in numeric_cols:
-        df[col] = pd.to_numeric(df[col], errors='coerce') # 오류 발생 시 NaN으로 처리
-
-    # 3. 필요한 컬럼만 선택하여 간결하게 보기
-    # 모든 컬럼을 활용하되, 분석에 더 초점을 맞추어 순서를 조정하거나 일부를 제거할 수 있습니다.
-    # 여기서는 모든 컬럼을 사용하되, 가독성을 위해 상위 몇 개만 출력합니다.
-
-    print("--- 원본 데이터 (전처리 후 상위 5행) ---")
-    print(df.head())
-    print("\n데이터프레임 정보:")
-    df.info()
-
-    # --- 데이터 분석 및 요약 ---
-
-    print("\n\n--- 2025년 6월 AWS 월 요금 요약 ---")
-
-    # 1. 전체 총 요금
-    total_cost_usd = df['usage_fee'].sum()
-    print(f"\n1. 2025년 6월 전체 총 요금: ${total_cost_usd:.4f} USD")
-
-    # 2. 서비스별 요금
-    cost_by_service = df.groupby('service_name')['usage_fee'].sum().sort_values(ascending=False)
-    print("\n2. 서비스별 총 요금 (USD):")
-    print(cost_by_service.apply(lambda x: f"${x:.4f}"))
-
-    # 3. 리전(Region)별 요금
-    cost_by_region = df.groupby('product_region_name')['usage_fee'].sum().sort_values(ascending=False)
-    print("\n3. 리전(Region)별 총 요금 (USD):")
-    print(cost_by_region.apply(lambda x: f"${x:.4f}"))
-
-    # 4. 사용 유형(Usage Type)별 요금 (상위 5개)
-    cost_by_usage_type = df.groupby('usage_type')['usage_fee'].sum().sort_values(ascending=False).head(5)
-    print("\n4. 사용 유형(Usage Type)별 총 요금 (상위 5개, USD):")
-    print(cost_by_usage_type.apply(lambda x: f"${x:.4f}"))
-
-    # 5. 상세 요금 내역 (서비스, 리전, 사용 유형별)
-    # 총 요금과 총 사용량을 함께 보여줍니다.
-    detailed_cost_breakdown = df.groupby(['service_name', 'product_region_name', 'usage_type']).agg(
-        Total_Fee=('usage_fee', 'sum'),
-        Total_Usage=('usage_amount', 'sum')
-    ).sort_values(by='Total_Fee', ascending=False)
-
-    print("\n5. 서비스, 리전, 사용 유형별 상세 요금 내역:")
-    # 가독성을 위해 float 형식 지정
-    detailed_cost_breakdown['Total_Fee'] = detailed_cost_breakdown['Total_Fee'].apply(lambda x: f"${x:.8f}")
-    detailed_cost_breakdown['Total_Usage'] = detailed_cost_breakdown['Total_Usage'].apply(lambda x: f"{x:.8f}")
-    print(detailed_cost_breakdown)
-
-    print("\n\n--- 분석 요약 ---")
-    print("이 데이터는 2025년 6월 한 달간의 AWS 서비스 사용 요금 내역입니다.")
-    print(f"총 청구된 금액은 {total_cost_usd:.4f} USD 입니다.")
-    print("\n주요 비용 발생 서비스 및 사용 유형:")
-    if not cost_by_service.empty:
-        top_service = cost_by_service.index[0]
-        top_service_cost = cost_by_service.iloc[0]
-        print(f"- 가장 많은 비용이 발생한 서비스는 '{top_service}'로, ${top_service_cost:.4f}를 차지했습니다.")
-    if not cost_by_region.empty:
-        top_region = cost_by_region.index[0]
-        top_region_cost = cost_by_region.iloc[0]
-        print(f"- 가장 많은 비용이 발생한 리전은 '{top_region}'로, ${top_region_cost:.4f}를 차지했습니다.")
-    if not cost_by_usage_type.empty:
-        top_usage_type = cost_by_usage_type.index[0]
-        top_usage_type_cost = cost_by_usage_type.iloc[0]
-        print(f"- 특정 사용 유형 중에서는 '{top_usage_type}'가 가장 많은 요금을 발생시켰습니다.")
-    return df
+# 월별 응답은 청구 기간 전체를 담으므로, 같은 달을 다시 물으면 요약을 재사용
+monthly_costs = CostAnalytics()
+
+
+def preprocess_aws_cost_data(
+    raw_data, from_date: str, to_date: str, costs: CostAnalytics | None = None
+) -> dict:
+    """응답의 청구 기간별 서비스, 리전, 사용 유형 요금 요약을 반환합니다.
+
+    일별 응답은 청구 기간의 일부만 담을 수 있으므로, costs 없이 호출하면
+    호출마다 새 인스턴스에 적재하고 요약은 요청한 범위와 함께 반환합니다.
+    """
+    if costs is None:
+        costs = CostAnalytics()
+    periods = costs.load(raw_data)
+    return {
+        "from": from_date,
+        "to": to_date,
+        "billing_periods": {
+            period: summary.to_dict()
+            for period, summary in costs.summaries(periods).items()
+        },
+    }
 
 # --------------------
 # 1. Tool: AWS 비용 API 호출 (daily & monthly)
@@ -111,7 +53,7 @@ def aws_costs_daily(from_date: str, to_date: str) -> dict:
         response.raise_for_status()
         result = response.json()
         
-        return preprocess_aws_cost_data()
+        return preprocess_aws_cost_data(result, from_date, to_date)
         # return response.json()
     except requests.RequestException as e:
         return {"error": str(e), "status_code": getattr(e.response, 'status_code', None)}
@@ -125,11 +67,12 @@ def aws_costs_monthly(from_date: str, to_date: str):
     url = "https://aws.fitcloud.co.kr/api/v1/costs/ondemand/corp/monthly"
     headers = {"Authorization": f"Bearer {token}"}
     form_data = {"from": from_date, "to": to_date}
-    print(form_data)
     try:
         response = requests.post(url, headers=headers, data=form_data)
         response.raise_for_status()
-        return preprocess_aws_cost_data(response.json())
+        return preprocess_aws_cost_data(
+            response.json(), from_date, to_date, monthly_costs
+        )
     except requests.RequestException as e:
         return {"error": str(e), "status_code": getattr(e.response, 'status_code', None)}
 
@@ -208,7 +151,8 @@ def aws_costs_monthly(from_date: str, to_date: str):
 # --------------------
 if __name__ == "__main__":
     result = aws_costs_monthly.invoke({"from_date": "202505","to_date": "202505"})
-    # print(result)
+    for summary in result.get("billing_periods", {}).values():
+        print(CostSummary(**summary).report())
     # state = {
     #     "messages": [HumanMessage(content="2025년 5월 AWS 비용 알려줘")]
     # }
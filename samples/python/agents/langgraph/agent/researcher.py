@@ -1,15 +1,16 @@
 from typing import Any, AsyncIterable, Dict, Optional
-from langgraph.checkpoint.memory import MemorySaver
+from common.utils.sqlite_checkpointer import SqliteCheckpointSaver
 from langgraph.prebuilt import create_react_agent
 from langchain_core.messages import AIMessage, ToolMessage
 from langchain_core.tools import tool
 from pydantic import BaseModel
 from typing import Literal
 from langchain_google_genai import ChatGoogleGenerativeAI
+import asyncio
+import heapq
 import os
 import json
-from tavily import TavilyClient
-from langchain_community.tools.tavily_search import TavilySearchResults
+from common.utils.web_search import TavilySearchService
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -39,96 +40,92 @@ def format_search_result(result: dict, include_raw_content: bool = False) -> str
     return f"<document><title>{title}</title><url>{result['url']}</url><content>{content}</content>{raw_content}</document>"
 
 
+# Shared by every conversation, so the HTTP client is pooled and repeated
+# queries are answered from the cache.
+search_service = TavilySearchService(
+    max_results=10,
+    include_answer=True,
+    include_raw_content=True,
+    include_images=False,
+    search_depth="advanced",
+    include_domains=["www.fitcloud.co.kr/marketplace"],
+    topic="general",
+)
+
+
+def format_recommendations(query: str, results: list[dict]) -> str:
+    """Formats the best scoring results of one search as recommendations."""
+    if not results:
+        return f"죄송합니다. '{query}'에 관련된 FitCloud 마켓플레이스 서비스를 찾을 수 없습니다. 다른 키워드로 검색해보시거나 더 구체적인 요구사항을 알려주세요."
+
+    # 점수 기준으로 필터링 (0.3 이상), 상위 5개만 표시
+    top_results = heapq.nlargest(
+        5,
+        (item for item in results if item.get("score", 0) >= 0.3),
+        key=lambda x: x.get("score", 0),
+    )
+    if not top_results:
+        return f"'{query}'와 정확히 일치하는 서비스는 없지만, FitCloud 마켓플레이스에서 비슷한 서비스를 찾아드릴 수 있습니다. 좀 더 구체적인 요구사항을 알려주시면 더 정확한 추천을 드릴 수 있습니다."
+
+    lines = [f"🎯 **'{query}'에 대한 FitCloud 마켓플레이스 추천 서비스**\n"]
+    for i, item in enumerate(top_results, 1):
+        title = item.get("title", "서비스명 없음")
+        url = item.get("url", "")
+        content = item.get("content", "")
+        score = item.get("score", 0)
+
+        lines.append(f"**{i}. {title}**")
+        lines.append(f"📊 적합도: {score:.1f}/1.0")
+        if url:
+            lines.append(f"🔗 링크: {url}")
+        if content:
+            # 내용을 400자로 제한하고 정리
+            clean_content = content.replace("\n", " ").strip()
+            if len(clean_content) > 400:
+                clean_content = clean_content[:400] + "..."
+            lines.append(f"📝 설명: {clean_content}")
+        lines.append("\n" + "─" * 50 + "\n")
+    return "\n".join(lines)
+
+
 @tool
-def search_fitcloud_marketplace(query: str) -> str:
+async def search_fitcloud_marketplace(
+    query: str, compare_with: Optional[list[str]] = None
+) -> str:
     """
     FitCloud 마켓플레이스에서 고객의 요구사항에 맞는 서비스를 검색하고 추천합니다.
 
     Args:
         query (str): 고객의 요구사항이나 찾고자 하는 서비스 설명
+        compare_with (list[str], optional): 비교를 요청받은 경우 함께 검색할 다른 서비스나 요구사항 목록. 모두 동시에 검색됩니다.
 
     Returns:
         str: 추천 서비스 목록과 설명
     """
     if not os.getenv("TAVILY_API_KEY"):
-            raise ValueError("TAVILY_API_KEY가 설정되지 않았습니다. .env 파일을 확인하거나 관리자에게 문의하세요.")
+        raise ValueError("TAVILY_API_KEY가 설정되지 않았습니다. .env 파일을 확인하거나 관리자에게 문의하세요.")
+    queries = list(dict.fromkeys([query, *(compare_with or [])]))
     try:
-
-        
-        tool = TavilySearchResults(
-            max_results=10,
-            include_answer=True,
-            include_raw_content=True,
-            include_images=False,
-            search_depth="advanced",
-            include_domains=["www.fitcloud.co.kr/marketplace"],
-        )
-
         # 검색 쿼리에 FitCloud 마켓플레이스 키워드 추가
-        enhanced_query = f"FitCloud 마켓플레이스 서비스 {query}"
-        results = tool.invoke({"query": enhanced_query, "topic": "general"})
-        print("--------------------------------")
-        print(f"results: {results}")
-        if not results:
-            return f"죄송합니다. '{query}'에 관련된 FitCloud 마켓플레이스 서비스를 찾을 수 없습니다. 다른 키워드로 검색해보시거나 더 구체적인 요구사항을 알려주세요."
-
-        # 점수 기준으로 필터링 (0.3 이상)
-        filtered_results = [item for item in results if item.get("score", 0) >= 0.3]
-
-        if not filtered_results:
-            return f"'{query}'와 정확히 일치하는 서비스는 없지만, FitCloud 마켓플레이스에서 비슷한 서비스를 찾아드릴 수 있습니다. 좀 더 구체적인 요구사항을 알려주시면 더 정확한 추천을 드릴 수 있습니다."
-
-        # 결과를 점수 순으로 정렬
-        filtered_results.sort(key=lambda x: x.get("score", 0), reverse=True)
-
-        output = f"🎯 **'{query}'에 대한 FitCloud 마켓플레이스 추천 서비스**\n\n"
-
-        for i, item in enumerate(filtered_results[:5], 1):  # 상위 5개만 표시
-            title = item.get("title", "서비스명 없음")
-            url = item.get("url", "")
-            content = item.get("content", "")
-            score = item.get("score", 0)
-
-            output += f"**{i}. {title}**\n"
-            output += f"📊 적합도: {score:.1f}/1.0\n"
-            if url:
-                output += f"🔗 링크: {url}\n"
-            if content:
-                # 내용을 400자로 제한하고 정리
-                clean_content = content.replace("\n", " ").strip()
-                if len(clean_content) > 400:
-                    clean_content = clean_content[:400] + "..."
-                output += f"📝 설명: {clean_content}\n"
-            output += "\n" + "─" * 50 + "\n\n"
-
-        output += "💡 **추천 이유**: 위 서비스들은 고객님의 요구사항과 높은 관련성을 보입니다.\n"
-        output += "🤝 **다음 단계**: 관심 있는 서비스가 있으시면 해당 링크를 통해 자세한 정보를 확인하거나, 추가 질문을 해주세요!"
-
-        return output
-
+        results = await search_service.search_many(
+            f"FitCloud 마켓플레이스 서비스 {q}" for q in queries
+        )
     except Exception as e:
         # logger.error(f"Marketplace search error: {e}")
         return f"죄송합니다. 검색 중 오류가 발생했습니다: {str(e)}\n다시 시도해주시거나 다른 방식으로 질문해주세요."
-    # print(f"response: {response}")
-    # client = TavilyClient(api_key=api_key)
-    # response = client.search(
-    #     query=query,
-    #     max_results=12,
-    #     include_answer=True,
-    #     include_raw_content=True,
-    #     search_depth="advanced",
-    #     include_domains=["www.fitcloud.co.kr/marketplace"],
-    # )
-    print(f"response: {response}")
-
-    results = response.get("results", [])
-    if not results:
-        return "No results found."
 
-    summary = [format_search_result(r, include_raw_content=True) for r in results]
-    # print(f"Search results for query '{query}':\n{summary}")
+    def format_all() -> str:
+        output = "\n".join(
+            format_recommendations(q, r) for q, r in zip(queries, results)
+        )
+        if not any(results):
+            return output
+        output += "\n💡 **추천 이유**: 위 서비스들은 고객님의 요구사항과 높은 관련성을 보입니다.\n"
+        output += "🤝 **다음 단계**: 관심 있는 서비스가 있으시면 해당 링크를 통해 자세한 정보를 확인하거나, 추가 질문을 해주세요!"
+        return output
 
-    return summary
+    # Formatting large raw results would stall other conversations.
+    return await asyncio.to_thread(format_all)
 
 
 def make_system_prompt(description: str) -> str:
@@ -169,7 +166,7 @@ class ResearchAgent:
 항상 고객 만족을 최우선으로 하여 최고의 서비스 추천을 제공하세요!"""
 
     def __init__(self):
-        self.memory = MemorySaver()
+        self.memory = SqliteCheckpointSaver.from_env("researcher")
         self.model = ChatGoogleGenerativeAI(model="gemini-2.0-flash")
         self.tools = [search_fitcloud_marketplace]
 
@@ -183,19 +180,16 @@ class ResearchAgent:
             response_format=ResponseFormat,
         )
 
-    def invoke(self, query: str, sessionId: str) -> str:
+    async def invoke(self, query: str, sessionId: str) -> Dict[str, Any]:
         config = {"configurable": {"thread_id": sessionId}}
-        result = self.graph.invoke({"messages": [("user", query)]}, config)
-        print("========")
-        print(result)
-        print("========")
-        return self.get_agent_response(config)
+        await self.graph.ainvoke({"messages": [("user", query)]}, config)
+        return await self.get_agent_response(config)
 
     async def stream(self, query: str, sessionId: str) -> AsyncIterable[Dict[str, Any]]:
         inputs = {"messages": [("user", query)]}
         config = {"configurable": {"thread_id": sessionId}}
 
-        for item in self.graph.stream(inputs, config, stream_mode="values"):
+        async for item in self.graph.astream(inputs, config, stream_mode="values"):
             message = item["messages"][-1]
             if (
                 isinstance(message, AIMessage)
@@ -214,13 +208,11 @@ class ResearchAgent:
                     "content": "Processing search results...",
                 }
 
-        yield self.get_agent_response(config)
+        yield await self.get_agent_response(config)
+
+    async def get_agent_response(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        current_state = await self.graph.aget_state(config)
 
-    def get_agent_response(self, config: Dict[str, Any]) -> Dict[str, Any]:
-        current_state = self.graph.get_state(config)
-        
-        print(f"current_state: {current_state}")
-        # print(f"current_state: {current_state}")
         structured_response = current_state.values.get("structured_response")
         ai_message = current_state.values.get("messages", [])[-1]
         print(f"=====structured_response=======: {structured_response}")
@@ -258,7 +250,7 @@ class ResearchAgent:
 
 if __name__ == "__main__":
     agent = ResearchAgent()
-    result = agent.invoke("FitCloud 마켓플레이스에서 웹 서비스를 찾아주세요.", "test1234")
+    result = asyncio.run(agent.invoke("FitCloud 마켓플레이스에서 웹 서비스를 찾아주세요.", "test1234"))
     print(result)
 
     # result = tavily_web_search.invoke("FitCloud 마켓플레이스에서 웹 서비스를 찾아주세요.")
@@ -1,13 +1,18 @@
+import asyncio
 import logging
+import time
+import uuid
 
 from a2a.server.agent_execution import AgentExecutor, RequestContext
 from a2a.server.events import Event, EventQueue
 from a2a.server.tasks import TaskUpdater
 from a2a.types import (
+    Artifact,
     InternalError,
     InvalidParamsError,
     Part,
     Task,
+    TaskArtifactUpdateEvent,
     TaskState,
     TextPart,
     UnsupportedOperationError,
@@ -25,10 +30,94 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+class TokenArtifactStream:
+    """Publishes streamed tokens as appended chunks of one artifact.
+
+    The first token is sent at once, later ones are coalesced and sent at
+    most every flush_interval seconds.
+    """
+
+    def __init__(
+        self,
+        event_queue: EventQueue,
+        task: Task,
+        name: str,
+        flush_interval: float,
+    ):
+        self.event_queue = event_queue
+        self.task = task
+        self.name = name
+        self.flush_interval = flush_interval
+        self.artifact_id = str(uuid.uuid4())
+        self.started = False
+        self._buffer: list[str] = []
+        self._flushed = 0.0
+
+    def add(self, token: str):
+        self._buffer.append(token)
+        if not self.started or self.flush_delay() == 0:
+            self.flush()
+
+    def flush_delay(self) -> float | None:
+        """Seconds until buffered tokens are due, None if there are none."""
+        if not self._buffer:
+            return None
+        return max(0.0, self._flushed + self.flush_interval - time.monotonic())
+
+    def flush(self, last_chunk: bool = False):
+        if not self._buffer and not last_chunk:
+            return
+        self._publish("".join(self._buffer), self.started, last_chunk)
+        self._buffer.clear()
+
+    def close(self):
+        """Sends the buffered tokens as the last chunk, if any were sent."""
+        if self.started:
+            self.flush(last_chunk=True)
+
+    def replace(self, content: str):
+        """Replaces the streamed tokens with the final content."""
+        self._buffer.clear()
+        self._publish(content, append=False, last_chunk=True)
+
+    def _publish(self, text: str, append: bool, last_chunk: bool):
+        self.event_queue.enqueue_event(
+            TaskArtifactUpdateEvent(
+                taskId=self.task.id,
+                contextId=self.task.contextId,
+                append=append,
+                lastChunk=last_chunk,
+                artifact=Artifact(
+                    artifactId=self.artifact_id,
+                    name=self.name,
+                    parts=[Part(root=TextPart(text=text))],
+                ),
+            )
+        )
+        self.started = True
+        self._flushed = time.monotonic()
+
+
 class LangGraphAgentExecutor(AgentExecutor):
-    def __init__(self, agent: Any, artifact_name: str = "result"):
+    """Runs a LangGraph agent for A2A requests.
+
+    With stream_tokens, the agent's stream must accept stream_tokens and
+    yield items marked is_token, which are forwarded as artifact chunks
+    coalesced every flush_interval seconds. The final response then
+    replaces the streamed artifact.
+    """
+
+    def __init__(
+        self,
+        agent: Any,
+        artifact_name: str = "result",
+        stream_tokens: bool = False,
+        flush_interval: float = 0.1,
+    ):
         self.agent = agent
         self.artifact_name = artifact_name
+        self.stream_tokens = stream_tokens
+        self.flush_interval = flush_interval
 
     async def execute(
         self,
@@ -45,25 +134,41 @@ class LangGraphAgentExecutor(AgentExecutor):
         print(f"task: {task}")
         event_queue.enqueue_event(task)
         updater = TaskUpdater(event_queue, task.id, task.contextId)
+        tokens = TokenArtifactStream(
+            event_queue, task, self.artifact_name, self.flush_interval
+        )
+        if self.stream_tokens:
+            stream = self.agent.stream(query, task.contextId, stream_tokens=True)
+        else:
+            stream = self.agent.stream(query, task.contextId)
 
         try:
-            async for item in self.agent.stream(query, task.contextId):
+            async for item in self._flushing(stream, tokens):
                 is_task_complete = item.get("is_task_complete", False)
                 require_user_input = item.get("require_user_input", False)
                 content = item.get("content", "")
 
+                if item.get("is_token"):
+                    tokens.add(content)
+                    continue
+                tokens.flush()
                 if not is_task_complete and not require_user_input:
                     updater.update_status(
                         TaskState.working,
                         new_agent_text_message(content, task.contextId, task.id),
                     )
                 elif require_user_input:
+                    tokens.close()
                     updater.update_status(
                         TaskState.input_required,
                         new_agent_text_message(content, task.contextId, task.id),
                         final=True,
                     )
                     break
+                elif tokens.started:
+                    tokens.replace(content)
+                    updater.complete()
+                    break
                 else:
                     updater.add_artifact(
                         [Part(root=TextPart(text=content))],
@@ -75,6 +180,26 @@ class LangGraphAgentExecutor(AgentExecutor):
             logger.exception("Agent execution failed")
             raise ServerError(error=InternalError()) from e
 
+    async def _flushing(
+        self, stream: AsyncIterable[Dict[str, Any]], tokens: TokenArtifactStream
+    ) -> AsyncIterable[Dict[str, Any]]:
+        """Yields the stream's items, flushing tokens that fall due between."""
+        iterator = aiter(stream)
+        pending = None
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(anext(iterator))
+            done, _ = await asyncio.wait({pending}, timeout=tokens.flush_delay())
+            if not done:
+                tokens.flush()
+                continue
+            try:
+                item = pending.result()
+            except StopAsyncIteration:
+                return
+            pending = None
+            yield item
+
     async def cancel(
         self, request: RequestContext, event_queue: EventQueue
     ) -> Task | None:
@@ -1,5 +1,7 @@
 import base64
+import hashlib
 import os
+from collections import OrderedDict
 from typing import Any, Optional
 from llama_index.core.llms import ChatMessage
 from llama_index.core.workflow import (
@@ -12,7 +14,11 @@ from llama_index.core.workflow import (
 )
 from llama_index.llms.google_genai import GoogleGenAI
 from llama_cloud_services.parse import LlamaParse
-from llama_index.llms.google_genai import GoogleGenAI
+from agents.llama_index_file_chat.document_index import (
+    DocumentIndex,
+    cited_lines,
+    line_tag,
+)
 from pydantic import BaseModel, Field
 
 
@@ -75,9 +81,16 @@ class ParseAndChat(Workflow):
         self,
         timeout: Optional[float] = None,
         verbose: bool = False,
+        max_chunks: int = 6,
+        max_indexes: int = 16,
         **workflow_kwargs: Any,
     ):
         super().__init__(timeout=timeout, verbose=verbose, **workflow_kwargs)
+        self._max_chunks = max_chunks
+        self._max_indexes = max_indexes
+        # Indexes of recently parsed documents, by document_id. Contexts
+        # only hold the lines, so that they can still be serialized.
+        self._indexes: OrderedDict[str, DocumentIndex] = OrderedDict()
         self._sllm = GoogleGenAI(
             model='gemini-2.0-flash', api_key=os.getenv('GOOGLE_API_KEY')
         ).as_structured_llm(ChatResponse)
@@ -85,7 +98,7 @@ class ParseAndChat(Workflow):
         self._system_prompt_template = """\
 You are a helpful assistant that can answer questions about a document, provide citations, and engage in a conversation.
 
-Here is the document with line numbers:
+Here are the parts of the document most relevant to the conversation, with their line numbers. Other lines are marked as omitted:
 <document_text>
 {document_text}
 </document_text>
@@ -124,13 +137,29 @@ When citing content from the document:
 
         # split the document into lines and add line numbers
         # this will be used for citations
-        document_text = ''
-        for idx, line in enumerate(document.text.split('\n')):
-            document_text += f"<line idx='{idx}'>{line}</line>\n"
+        lines = document.text.split('\n')
+        document_text = ''.join(
+            line_tag(idx, line) for idx, line in enumerate(lines)
+        )
+        document_id = hashlib.sha256(document.text.encode()).hexdigest()
+        self._index(document_id, lines)
 
         await ctx.set('document_text', document_text)
+        await ctx.set('document_lines', lines)
+        await ctx.set('document_id', document_id)
         return ChatEvent(msg=ev.msg)
 
+    def _index(self, document_id: str, lines: list[str]) -> DocumentIndex:
+        """Returns the index of a document, building it if needed."""
+        index = self._indexes.get(document_id)
+        if index is None:
+            index = DocumentIndex(lines)
+            self._indexes[document_id] = index
+            while len(self._indexes) > self._max_indexes:
+                self._indexes.popitem(last=False)
+        self._indexes.move_to_end(document_id)
+        return index
+
     @step
     async def chat(self, ctx: Context, event: ChatEvent) -> ChatResponseEvent:
         current_messages = await ctx.get('messages', default=[])
@@ -146,11 +175,22 @@ When citing content from the document:
             ctx.write_event_to_stream(
                 LogEvent(msg='Inserting system prompt...')
             )
+            index = self._index(
+                await ctx.get('document_id'),
+                await ctx.get('document_lines'),
+            )
+            # Follow-up questions often lean on the one before.
+            query = '\n'.join(
+                str(m.content)
+                for m in current_messages[-3:]
+                if m.role == 'user'
+            )
+            chunks = index.search(query, self._max_chunks)
             input_messages = [
                 ChatMessage(
                     role='system',
                     content=self._system_prompt_template.format(
-                        document_text=document_text
+                        document_text=index.render(chunks)
                     ),
                 ),
                 *current_messages,
@@ -169,30 +209,16 @@ When citing content from the document:
         )
         await ctx.set('messages', current_messages)
 
-        # parse out the citations from the document text
+        # look up the cited lines by their line numbers
         citations = {}
         if document_text:
+            lines = await ctx.get('document_lines')
             for citation in response_obj.citations:
-                line_numbers = citation.line_numbers
-                for line_number in line_numbers:
-                    start_idx = document_text.find(
-                        f"<line idx='{line_number}'>"
-                    )
-                    end_idx = document_text.find(
-                        f"<line idx='{line_number + 1}'>"
+                texts = cited_lines(lines, citation.line_numbers)
+                if texts:
+                    citations.setdefault(citation.citation_number, []).extend(
+                        texts
                     )
-                    citation_text = (
-                        document_text[
-                            start_idx
-                            + len(f"<line idx='{line_number}'>") : end_idx
-                        ]
-                        .replace('</line>', '')
-                        .strip()
-                    )
-
-                    if citation.citation_number not in citations:
-                        citations[citation.citation_number] = []
-                    citations[citation.citation_number].append(citation_text)
 
         return ChatResponseEvent(
             response=response_obj.response, citations=citations
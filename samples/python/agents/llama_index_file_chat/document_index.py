@@ -0,0 +1,135 @@
+"""BM25 retrieval over line-numbered chunks of a parsed document."""
+
+import re
+
+from collections import Counter
+
+import numpy as np
+
+
+_TOKEN = re.compile(r'\w+')
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def line_tag(idx: int, line: str) -> str:
+    return f"<line idx='{idx}'>{line}</line>\n"
+
+
+def cited_lines(lines: list[str], line_numbers: list[int]) -> list[str]:
+    """Returns the text of the cited lines, skipping numbers not in lines."""
+    return [
+        lines[n].replace('</line>', '').strip()
+        for n in line_numbers
+        if 0 <= n < len(lines)
+    ]
+
+
+class DocumentIndex:
+    """Splits a document into chunks of whole lines and ranks them by BM25.
+
+    Chunk i holds lines starts[i] up to starts[i + 1], so line numbers are
+    kept for citations. The postings of every term are stored together in
+    arrays with their BM25 term weights precomputed, so scoring a query
+    only adds up a slice of an array per query term.
+    """
+
+    def __init__(
+        self,
+        lines: list[str],
+        chunk_chars: int = 2000,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ):
+        self.lines = lines
+        starts = [0]
+        size = 0
+        for idx, line in enumerate(lines):
+            if size and size + len(line) > chunk_chars:
+                starts.append(idx)
+                size = 0
+            size += len(line) + 1
+        starts.append(len(lines))
+        self.starts = np.array(starts, dtype=np.int64)
+
+        self._vocabulary: dict[str, int] = {}
+        terms, chunks, counts = [], [], []
+        lengths = np.zeros(self.chunk_count, dtype=np.float32)
+        for chunk in range(self.chunk_count):
+            first, last = starts[chunk], starts[chunk + 1]
+            tokens = tokenize('\n'.join(lines[first:last]))
+            lengths[chunk] = len(tokens)
+            for term, count in Counter(tokens).items():
+                terms.append(
+                    self._vocabulary.setdefault(term, len(self._vocabulary))
+                )
+                chunks.append(chunk)
+                counts.append(count)
+
+        terms = np.array(terms, dtype=np.int64)
+        order = np.argsort(terms, kind='stable')
+        self._chunks = np.array(chunks, dtype=np.int64)[order]
+        tf = np.array(counts, dtype=np.float32)[order]
+        self._indptr = np.zeros(len(self._vocabulary) + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(terms, minlength=len(self._vocabulary)),
+            out=self._indptr[1:],
+        )
+        df = np.diff(self._indptr)
+        self._idf = np.log1p(
+            (self.chunk_count - df + 0.5) / (df + 0.5)
+        ).astype(np.float32)
+        norm = k1 * (1 - b + b * lengths / max(float(lengths.mean()), 1.0))
+        self._weights = tf * (k1 + 1) / (tf + norm[self._chunks])
+
+    @property
+    def chunk_count(self) -> int:
+        return len(self.starts) - 1
+
+    def scores(self, query: str) -> np.ndarray:
+        """Returns the BM25 score of every chunk for the query."""
+        scores = np.zeros(self.chunk_count, dtype=np.float32)
+        for term in set(tokenize(query)):
+            t = self._vocabulary.get(term)
+            if t is None:
+                continue
+            first, last = self._indptr[t], self._indptr[t + 1]
+            # A term occurs once in the postings of each of its chunks.
+            scores[self._chunks[first:last]] += (
+                self._idf[t] * self._weights[first:last]
+            )
+        return scores
+
+    def search(self, query: str, max_chunks: int = 6) -> list[int]:
+        """Returns the best matching chunks in document order.
+
+        When nothing in the document matches the query, its first chunks
+        are returned, since they usually say what the document is about.
+        """
+        scores = self.scores(query)
+        if max_chunks < self.chunk_count:
+            best = np.argpartition(-scores, max_chunks - 1)[:max_chunks]
+        else:
+            best = np.arange(self.chunk_count)
+        best = best[scores[best] > 0]
+        if not len(best):
+            return list(range(min(max_chunks, self.chunk_count)))
+        return sorted(best.tolist())
+
+    def render(self, chunks: list[int]) -> str:
+        """Returns the lines of the chunks tagged with their line numbers."""
+        parts = []
+        shown = 0
+        for chunk in chunks:
+            first, last = int(self.starts[chunk]), int(self.starts[chunk + 1])
+            if first > shown:
+                parts.append(f"<omitted lines='{shown}-{first - 1}'/>\n")
+            parts.extend(
+                line_tag(idx, self.lines[idx]) for idx in range(first, last)
+            )
+            shown = last
+        if shown < len(self.lines):
+            parts.append(f"<omitted lines='{shown}-{len(self.lines) - 1}'/>\n")
+        return ''.join(parts)
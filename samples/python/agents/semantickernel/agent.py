@@ -5,8 +5,7 @@ import os
 from collections.abc import AsyncIterable
 from typing import TYPE_CHECKING, Annotated, Any, Literal
 
-import httpx
-
+from common.utils.exchange_rates import ExchangeRateService
 from dotenv import load_dotenv
 from pydantic import BaseModel
 from semantic_kernel.agents import ChatCompletionAgent, ChatHistoryAgentThread
@@ -30,19 +29,26 @@ logger = logging.getLogger(__name__)
 
 load_dotenv()
 
+# Shared by every agent in the process, so rate tables are fetched once.
+exchange_rates = ExchangeRateService()
+
 # region Plugin
 
 
 class CurrencyPlugin:
     """A simple currency plugin that leverages Frankfurter for exchange rates.
 
-    The Plugin is used by the `currency_exchange_agent`.
+    The Plugin is used by the `currency_exchange_agent`. Rates come from an
+    ExchangeRateService, which caches whole rate tables.
     """
 
+    def __init__(self, rates: ExchangeRateService | None = None):
+        self.rates = rates or exchange_rates
+
     @kernel_function(
         description='Retrieves exchange rate between currency_from and currency_to using Frankfurter API'
     )
-    def get_exchange_rate(
+    async def get_exchange_rate(
         self,
         currency_from: Annotated[
             str, 'Currency code to convert from, e.g. USD'
@@ -53,19 +59,13 @@ class CurrencyPlugin:
         date: Annotated[str, "Date or 'latest'"] = 'latest',
     ) -> str:
         try:
-            response = httpx.get(
-                f'https://api.frankfurter.app/{date}',
-                params={'from': currency_from, 'to': currency_to},
-                timeout=10.0,
-            )
-            response.raise_for_status()
-            data = response.json()
-            if 'rates' not in data or currency_to not in data['rates']:
-                return f'Could not retrieve rate for {currency_from} to {currency_to}'
-            rate = data['rates'][currency_to]
-            return f'1 {currency_from} = {rate} {currency_to}'
+            data = await self.rates.get_rate(currency_from, currency_to, date)
+        except ValueError:
+            return f'Could not retrieve rate for {currency_from} to {currency_to}'
         except Exception as e:
             return f'Currency API call failed: {str(e)}'
+        rate = data['rates'][currency_to.upper()]
+        return f'1 {currency_from} = {rate} {currency_to}'
 
 
 # endregion
@@ -0,0 +1,246 @@
+"""Text documents with a persistent line index for ranged reads and edits."""
+
+import mmap
+import os
+import secrets
+import struct
+import threading
+
+from array import array
+from collections import OrderedDict
+from collections.abc import Mapping
+from itertools import accumulate, count, islice
+from operator import add
+from pathlib import Path
+
+
+# Size and modification time of the file an index was built from.
+_INDEX_HEADER = struct.Struct('<qq')
+_SCAN_CHUNK = 16 * 2**20
+
+
+class _Document:
+    """An open document: its memory map and the offset of every line."""
+
+    def __init__(self, path: Path, offsets: array, stat: os.stat_result):
+        self.path = path
+        self.offsets = offsets
+        self.size = stat.st_size
+        self.mtime_ns = stat.st_mtime_ns
+        self.file = path.open('rb')
+        # Empty files cannot be mapped.
+        self.data = (
+            mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            if self.size
+            else b''
+        )
+
+    @property
+    def line_count(self) -> int:
+        return len(self.offsets) - 1
+
+    def is_current(self, stat: os.stat_result) -> bool:
+        return (stat.st_size, stat.st_mtime_ns) == (self.size, self.mtime_ns)
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.file.close()
+
+
+def scan_lines(data, size: int) -> array:
+    """Returns the offset where each line starts, followed by the size."""
+    offsets = array('q', [0])
+    for base in range(0, size, _SCAN_CHUNK):
+        pieces = data[base : base + _SCAN_CHUNK].split(b'\n')
+        # The line after each newline starts one past the text before it.
+        starts = map(add, accumulate(map(len, pieces)), count(base + 1))
+        offsets.extend(islice(starts, len(pieces) - 1))
+    if offsets[-1] != size:
+        offsets.append(size)
+    return offsets
+
+
+class DocumentStore:
+    """Reads and edits line-oriented UTF-8 documents under a directory.
+
+    The offset of every line of a document is kept in a hidden .lines file
+    next to it, so a line range is read by slicing a memory map of the
+    document instead of splitting all of it. Open documents are cached
+    between calls, at most max_open at a time, and are reopened when the
+    file changes behind the store's back. Writes and edits go to a
+    temporary file that replaces the document, so readers never see a
+    half-written document.
+    """
+
+    def __init__(self, root: Path | str, max_open: int = 32):
+        self.root = Path(root)
+        self.max_open = max_open
+        self._open: OrderedDict[Path, _Document] = OrderedDict()
+        self._lock = threading.RLock()
+
+    def read(
+        self, name: str, start: int | None = None, end: int | None = None
+    ) -> str:
+        """Returns lines start to end, end excluded, like a list slice."""
+        with self._lock:
+            doc = self._document(name)
+            first, last, _ = slice(start, end).indices(doc.line_count)
+            if first >= last:
+                return ''
+            return doc.data[doc.offsets[first] : doc.offsets[last]].decode()
+
+    def line_count(self, name: str) -> int:
+        with self._lock:
+            return self._document(name).line_count
+
+    def write(self, name: str, content: str):
+        """Creates or replaces a document."""
+        path = self.root / name
+        data = content.encode()
+        with self._lock:
+            self._close(path)
+            with _AtomicFile(path) as out:
+                out.write(data)
+            self._save_index(path, scan_lines(data, len(data)))
+
+    def insert(self, name: str, inserts: Mapping[int, str]):
+        """Inserts lines in one pass over the document.
+
+        Inserts are applied in order of line number, each at its 1-indexed
+        line of the document as edited so far, which is the line it ends
+        up on.
+
+        Raises:
+            ValueError: If a line number is out of range, before any
+                change is made.
+        """
+        with self._lock:
+            doc = self._document(name)
+            # Where each insert goes among the original lines.
+            plan = []
+            for i, (line_number, text) in enumerate(sorted(inserts.items())):
+                before = line_number - 1 - i
+                if not 0 <= before <= doc.line_count:
+                    raise ValueError(
+                        f'Line number {line_number} is out of range.'
+                    )
+                plan.append((before, (text + '\n').encode()))
+            offsets = doc.offsets
+            # A last line without a newline needs one before lines follow.
+            missing_newline = doc.size > 0 and doc.data[-1:] != b'\n'
+            new_offsets = array('q')
+            shift = 0
+            line = 0
+            with _AtomicFile(doc.path) as out, memoryview(doc.data) as view:
+                for before, data in plan:
+                    out.write(view[offsets[line] : offsets[before]])
+                    _extend_shifted(new_offsets, offsets[line:before], shift)
+                    line = before
+                    if missing_newline and before == doc.line_count:
+                        out.write(b'\n')
+                        shift += 1
+                        missing_newline = False
+                    new_offsets.append(offsets[before] + shift)
+                    out.write(data)
+                    shift += len(data)
+                out.write(view[offsets[line] :])
+                _extend_shifted(new_offsets, offsets[line:-1], shift)
+                new_offsets.append(doc.size + shift)
+                # The document must be closed before it is replaced.
+                view.release()
+                self._close(doc.path)
+            self._save_index(doc.path, new_offsets)
+
+    def close(self):
+        with self._lock:
+            for doc in self._open.values():
+                doc.close()
+            self._open.clear()
+
+    def __enter__(self) -> 'DocumentStore':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _document(self, name: str) -> _Document:
+        path = self.root / name
+        stat = path.stat()
+        doc = self._open.get(path)
+        if doc is not None:
+            if doc.is_current(stat):
+                self._open.move_to_end(path)
+                return doc
+            self._close(path)
+        doc = _Document(path, self._load_index(path, stat), stat)
+        if doc.offsets is None:
+            doc.offsets = scan_lines(doc.data, doc.size)
+            self._save_index(path, doc.offsets)
+        self._open[path] = doc
+        while len(self._open) > self.max_open:
+            self._open.popitem(last=False)[1].close()
+        return doc
+
+    def _close(self, path: Path):
+        doc = self._open.pop(path, None)
+        if doc is not None:
+            doc.close()
+
+    @staticmethod
+    def _index_path(path: Path) -> Path:
+        return path.with_name(f'.{path.name}.lines')
+
+    def _load_index(self, path: Path, stat: os.stat_result) -> array | None:
+        try:
+            raw = self._index_path(path).read_bytes()
+        except FileNotFoundError:
+            return None
+        if len(raw) < _INDEX_HEADER.size or _INDEX_HEADER.unpack_from(
+            raw
+        ) != (stat.st_size, stat.st_mtime_ns):
+            return None
+        offsets = array('q')
+        offsets.frombytes(raw[_INDEX_HEADER.size :])
+        return offsets
+
+    def _save_index(self, path: Path, offsets: array):
+        stat = path.stat()
+        with _AtomicFile(self._index_path(path)) as out:
+            out.write(_INDEX_HEADER.pack(stat.st_size, stat.st_mtime_ns))
+            out.write(offsets.tobytes())
+
+
+class _AtomicFile:
+    """A temporary file that replaces path when its block succeeds."""
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def __enter__(self):
+        self.temp = self.path.with_name(
+            f'.{self.path.name}.{secrets.token_hex(4)}.tmp'
+        )
+        # Unlike mkstemp, this leaves the mode to the umask like open().
+        fd = os.open(self.temp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        self.file = os.fdopen(fd, 'wb')
+        return self.file
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.file.flush()
+                os.fsync(self.file.fileno())
+        finally:
+            self.file.close()
+            if exc_type is None:
+                os.replace(self.temp, self.path)
+            else:
+                os.unlink(self.temp)
+
+
+def _extend_shifted(offsets: array, source: array, shift: int):
+    if shift:
+        offsets.extend(offset + shift for offset in source)
+    else:
+        offsets.extend(source)
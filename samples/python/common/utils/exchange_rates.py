@@ -0,0 +1,188 @@
+"""Cached exchange rates from the Frankfurter API."""
+
+import asyncio
+import datetime
+import time
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+from common.utils.loop_local import LoopLocal
+
+
+FRANKFURTER_URL = 'https://api.frankfurter.app'
+LATEST = 'latest'
+
+
+@dataclass(frozen=True)
+class RateTable:
+    """Rates of every currency against one base currency on one date."""
+
+    base: str
+    date: str
+    rates: dict[str, float]
+
+    def rate(self, currency_from: str, currency_to: str) -> float:
+        """Returns the rate between any two currencies in the table.
+
+        Raises:
+            ValueError: If either currency is not in the table.
+        """
+        for currency in (currency_from, currency_to):
+            if currency not in self.rates:
+                raise ValueError(f'No rate for {currency} on {self.date}')
+        return self.rates[currency_to] / self.rates[currency_from]
+
+
+class ExchangeRateService:
+    """Fetches and caches Frankfurter rate tables.
+
+    A whole table is fetched per base currency and date, so any pair whose
+    currencies appear in a cached table for that date is answered without
+    calling the API. Tables for past dates do not change and are kept for
+    historical_ttl seconds, while 'latest' and today's are kept for
+    latest_ttl seconds. Concurrent requests for a table that is being
+    fetched wait for that one call.
+
+    Without an http_client, each event loop the service runs on gets a
+    client of its own, so a module-level service is safe to share.
+    """
+
+    def __init__(
+        self,
+        base_url: str = FRANKFURTER_URL,
+        http_client: httpx.AsyncClient | None = None,
+        latest_ttl: float = 600.0,
+        historical_ttl: float = 30 * 24 * 3600.0,
+        max_tables: int = 1024,
+    ):
+        self.base_url = base_url.rstrip('/')
+        self._http_client = http_client
+        self._clients = LoopLocal(lambda: httpx.AsyncClient(timeout=10.0))
+        self.latest_ttl = latest_ttl
+        self.historical_ttl = historical_ttl
+        self.max_tables = max_tables
+        # Number of calls made to the API.
+        self.upstream_calls = 0
+        # (base, date) to (expiry, table), least recently used first.
+        self._tables: OrderedDict[
+            tuple[str, str], tuple[float, RateTable]
+        ] = OrderedDict()
+        self._inflight: LoopLocal[dict[tuple[str, str], asyncio.Task]] = (
+            LoopLocal(dict)
+        )
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """The client given, or the running loop's own."""
+        return self._http_client or self._clients.get()
+
+    async def get_rate(
+        self, currency_from: str, currency_to: str, date: str = LATEST
+    ) -> dict[str, Any]:
+        """Returns the rate in the shape of a Frankfurter response.
+
+        Args:
+            currency_from: The currency to convert from (e.g., "USD").
+            currency_to: The currency to convert to (e.g., "EUR").
+            date: The date as YYYY-MM-DD, or "latest".
+
+        Returns:
+            A dictionary with the amount, base, date and rates keys.
+
+        Raises:
+            httpx.HTTPError: If the API request fails.
+            ValueError: If the response is invalid or a currency is unknown.
+        """
+        currency_from = currency_from.upper()
+        currency_to = currency_to.upper()
+        table = self._find(currency_from, currency_to, date)
+        if table is None:
+            table = await self.get_table(currency_from, date)
+        return {
+            'amount': 1.0,
+            'base': currency_from,
+            'date': table.date,
+            'rates': {currency_to: table.rate(currency_from, currency_to)},
+        }
+
+    async def get_table(self, base: str, date: str = LATEST) -> RateTable:
+        """Returns the rate table of a base currency, fetching it if needed."""
+        key = (base.upper(), date)
+        table = self._cached(key)
+        if table is not None:
+            return table
+        inflight = self._inflight.get()
+        task = inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(*key))
+            inflight[key] = task
+            task.add_done_callback(lambda _: inflight.pop(key, None))
+        # One caller giving up must not cancel the fetch for the others.
+        return await asyncio.shield(task)
+
+    def clear(self):
+        self._tables.clear()
+
+    async def close(self):
+        """Closes the client given, or the running loop's own."""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+        elif (client := self._clients.pop()) is not None:
+            await client.aclose()
+
+    def _cached(self, key: tuple[str, str]) -> RateTable | None:
+        entry = self._tables.get(key)
+        if entry is None:
+            return None
+        expiry, table = entry
+        if expiry < time.monotonic():
+            del self._tables[key]
+            return None
+        self._tables.move_to_end(key)
+        return table
+
+    def _find(
+        self, currency_from: str, currency_to: str, date: str
+    ) -> RateTable | None:
+        """Finds a cached table for the date holding both currencies."""
+        table = self._cached((currency_from, date))
+        if table is not None:
+            return table
+        for key, (_, table) in list(self._tables.items()):
+            if (
+                key[1] == date
+                and currency_from in table.rates
+                and currency_to in table.rates
+                and self._cached(key) is not None
+            ):
+                return table
+        return None
+
+    async def _fetch(self, base: str, date: str) -> RateTable:
+        self.upstream_calls += 1
+        response = await self.http_client.get(
+            f'{self.base_url}/{date}', params={'from': base}
+        )
+        response.raise_for_status()
+        data = response.json()
+        if 'rates' not in data:
+            raise ValueError('Invalid API response format.')
+        table = RateTable(
+            base=base,
+            date=data.get('date', date),
+            rates={**data['rates'], base: 1.0},
+        )
+        self._tables[(base, date)] = (time.monotonic() + self._ttl(date), table)
+        while len(self._tables) > self.max_tables:
+            self._tables.popitem(last=False)
+        return table
+
+    def _ttl(self, date: str) -> float:
+        today = datetime.datetime.now(datetime.UTC).date().isoformat()
+        if date != LATEST and date < today:
+            return self.historical_ttl
+        return self.latest_ttl
@@ -0,0 +1,42 @@
+"""Values kept per running asyncio event loop."""
+
+import asyncio
+import weakref
+
+from collections.abc import Callable
+from typing import Generic, TypeVar
+
+
+T = TypeVar('T')
+
+
+class LoopLocal(Generic[T]):
+    """Holds one value per event loop, made on first use in that loop.
+
+    Clients, semaphores and tasks are bound to the loop they are first used
+    on. A service created at import time may later run on several loops,
+    such as a server's and then a test's, so it keeps them here instead of
+    making them in its constructor. A value is dropped with its loop.
+    """
+
+    def __init__(self, factory: Callable[[], T]):
+        self._factory = factory
+        self._values: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, T
+        ] = weakref.WeakKeyDictionary()
+
+    def get(self) -> T:
+        """The running loop's value.
+
+        Raises:
+            RuntimeError: If no event loop is running.
+        """
+        loop = asyncio.get_running_loop()
+        value = self._values.get(loop)
+        if value is None:
+            value = self._values[loop] = self._factory()
+        return value
+
+    def pop(self) -> T | None:
+        """Forgets the running loop's value and returns it, if it had one."""
+        return self._values.pop(asyncio.get_running_loop(), None)
@@ -0,0 +1,691 @@
+"""Persistent, bounded LangGraph checkpointer on SQLite."""
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+
+from collections.abc import AsyncIterator, Iterator, Sequence
+from typing import Any
+
+import ormsgpack
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    SerializerProtocol,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS threads (
+    thread_id TEXT NOT NULL,
+    updated REAL NOT NULL,
+    namespace TEXT NOT NULL,
+    PRIMARY KEY (namespace, thread_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS threads_updated ON threads (namespace, updated);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL,
+    checkpoint_id TEXT NOT NULL,
+    parent_id TEXT,
+    type TEXT NOT NULL,
+    checkpoint BLOB NOT NULL,
+    metadata_type TEXT NOT NULL,
+    metadata BLOB NOT NULL,
+    channel_versions TEXT NOT NULL,
+    namespace TEXT NOT NULL,
+    PRIMARY KEY (namespace, thread_id, checkpoint_ns, checkpoint_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS blobs (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    version TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    type TEXT,
+    data BLOB,
+    base_version TEXT,
+    depth INTEGER NOT NULL DEFAULT 0,
+    length INTEGER,
+    digest BLOB,
+    namespace TEXT NOT NULL,
+    PRIMARY KEY (namespace, thread_id, checkpoint_ns, channel, version)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS blobs_base
+    ON blobs (namespace, thread_id, checkpoint_ns, channel, base_version);
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL,
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT NOT NULL,
+    data BLOB NOT NULL,
+    task_path TEXT NOT NULL,
+    namespace TEXT NOT NULL,
+    PRIMARY KEY (
+        namespace, thread_id, checkpoint_ns, checkpoint_id, task_id, idx
+    )
+) WITHOUT ROWID;
+"""
+
+# Kinds of stored channel values.
+EMPTY = 'empty'
+VALUE = 'value'
+LIST = 'list'
+DELTA = 'delta'
+
+# A channel without a value in the checkpoint.
+_MISSING = object()
+
+
+class SqliteCheckpointSaver(BaseCheckpointSaver[str]):
+    """Stores LangGraph checkpoints in a local SQLite file.
+
+    As in MemorySaver, a channel value is stored once per version, so a
+    checkpoint only adds the channels that changed. A list channel, such
+    as messages, that only grew since its last stored version is
+    delta-encoded: just the new items are stored, on top of that version.
+    Every keyframe_interval versions the whole list is stored again, so
+    resuming reads at most that many rows per channel.
+
+    Each thread keeps its max_checkpoints latest checkpoints per namespace.
+    Older ones, their writes and the values no longer needed are compacted
+    away as new checkpoints are put. When thread_ttl is set, threads idle
+    for longer are deleted by prune_idle(), which also runs every
+    prune_every puts.
+
+    Savers sharing a file are kept apart by namespace. Every agent of a
+    host sees the same contextId, used as the thread id, so agents storing
+    their checkpoints in one file each need their own namespace.
+
+    The database is opened on first use. Async methods run the blocking
+    calls in a worker thread.
+    """
+
+    def __init__(
+        self,
+        path: str = ':memory:',
+        *,
+        namespace: str = '',
+        serde: SerializerProtocol | None = None,
+        max_checkpoints: int = 10,
+        keyframe_interval: int = 32,
+        thread_ttl: float | None = None,
+        prune_every: int = 1000,
+        cache_size_kib: int = 8192,
+    ):
+        super().__init__(serde=serde)
+        self.path = path
+        self.namespace = namespace
+        self.max_checkpoints = max_checkpoints
+        self.keyframe_interval = keyframe_interval
+        self.thread_ttl = thread_ttl
+        self.prune_every = prune_every
+        self.cache_size_kib = cache_size_kib
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+        self._puts = 0
+
+    @classmethod
+    def from_env(cls, namespace: str, **kwargs) -> 'SqliteCheckpointSaver':
+        """A saver on the CHECKPOINT_DB file, checkpoints.db by default.
+
+        namespace names the agent, since agents may share the file. Threads
+        idle for a week are deleted unless thread_ttl is given.
+        """
+        kwargs.setdefault('thread_ttl', 7 * 24 * 3600.0)
+        return cls(
+            os.getenv('CHECKPOINT_DB', 'checkpoints.db'),
+            namespace=namespace,
+            **kwargs,
+        )
+
+    def __enter__(self) -> 'SqliteCheckpointSaver':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._connection is None:
+            with self._lock:
+                if self._connection is None:
+                    self._connection = self._connect()
+        return self._connection
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        if self.path != ':memory:':
+            conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA cache_size=-{int(self.cache_size_kib)}')
+        conn.executescript(SCHEMA)
+        return conn
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    # Reads
+
+    def get_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        thread_id = config['configurable']['thread_id']
+        checkpoint_ns = config['configurable'].get('checkpoint_ns', '')
+        checkpoint_id = get_checkpoint_id(config)
+        conn = self.conn
+        with self._lock:
+            if checkpoint_id:
+                row = conn.execute(
+                    'SELECT * FROM checkpoints WHERE namespace = ? AND '
+                    'thread_id = ? AND checkpoint_ns = ? AND '
+                    'checkpoint_id = ?',
+                    (self.namespace, thread_id, checkpoint_ns, checkpoint_id),
+                ).fetchone()
+            else:
+                row = conn.execute(
+                    'SELECT * FROM checkpoints WHERE namespace = ? AND '
+                    'thread_id = ? AND checkpoint_ns = ? '
+                    'ORDER BY checkpoint_id DESC LIMIT 1',
+                    (self.namespace, thread_id, checkpoint_ns),
+                ).fetchone()
+            if row is None:
+                return None
+            return self._tuple(conn, row)
+
+    def list(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> Iterator[CheckpointTuple]:
+        query = 'SELECT * FROM checkpoints'
+        clauses, params = ['namespace = ?'], [self.namespace]
+        if config:
+            clauses.append('thread_id = ?')
+            params.append(config['configurable']['thread_id'])
+            checkpoint_ns = config['configurable'].get('checkpoint_ns')
+            if checkpoint_ns is not None:
+                clauses.append('checkpoint_ns = ?')
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                clauses.append('checkpoint_id = ?')
+                params.append(checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            clauses.append('checkpoint_id < ?')
+            params.append(before_id)
+        query += ' WHERE ' + ' AND '.join(clauses)
+        query += ' ORDER BY thread_id, checkpoint_ns, checkpoint_id DESC'
+        conn = self.conn
+        with self._lock:
+            rows = conn.execute(query, params).fetchall()
+        for row in rows:
+            if limit is not None and limit <= 0:
+                return
+            if filter:
+                metadata = self.serde.loads_typed((row[6], row[7]))
+                if not all(metadata.get(k) == v for k, v in filter.items()):
+                    continue
+            with self._lock:
+                item = self._tuple(conn, row)
+            if limit is not None:
+                limit -= 1
+            yield item
+
+    def _tuple(self, conn: sqlite3.Connection, row: tuple) -> CheckpointTuple:
+        thread_id, checkpoint_ns, checkpoint_id, parent_id = row[:4]
+        checkpoint = self.serde.loads_typed((row[4], row[5]))
+        writes = conn.execute(
+            'SELECT task_id, channel, type, data FROM writes WHERE '
+            'namespace = ? AND thread_id = ? AND checkpoint_ns = ? AND '
+            'checkpoint_id = ? ORDER BY task_path, task_id, idx',
+            (self.namespace, thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+        return CheckpointTuple(
+            config={
+                'configurable': {
+                    'thread_id': thread_id,
+                    'checkpoint_ns': checkpoint_ns,
+                    'checkpoint_id': checkpoint_id,
+                }
+            },
+            checkpoint={
+                **checkpoint,
+                'channel_values': self._load_values(
+                    conn,
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint['channel_versions'],
+                ),
+            },
+            metadata=self.serde.loads_typed((row[6], row[7])),
+            parent_config=(
+                {
+                    'configurable': {
+                        'thread_id': thread_id,
+                        'checkpoint_ns': checkpoint_ns,
+                        'checkpoint_id': parent_id,
+                    }
+                }
+                if parent_id
+                else None
+            ),
+            pending_writes=[
+                (task_id, channel, self.serde.loads_typed((type_, data)))
+                for task_id, channel, type_, data in writes
+            ],
+        )
+
+    def _load_values(
+        self,
+        conn: sqlite3.Connection,
+        thread_id: str,
+        checkpoint_ns: str,
+        versions: ChannelVersions,
+    ) -> dict[str, Any]:
+        values = {}
+        thread = (self.namespace, thread_id, checkpoint_ns)
+        for channel, version in versions.items():
+            # Follow deltas back to the full list, at most a keyframe away.
+            chain = []
+            version = str(version)
+            while version is not None:
+                row = conn.execute(
+                    'SELECT kind, type, data, base_version FROM blobs WHERE '
+                    'namespace = ? AND thread_id = ? AND checkpoint_ns = ? '
+                    'AND channel = ? AND version = ?',
+                    (*thread, channel, version),
+                ).fetchone()
+                if row is None:
+                    break
+                chain.append(row)
+                version = row[3]
+            if not chain or chain[0][0] == EMPTY:
+                continue
+            if chain[0][0] == VALUE:
+                values[channel] = self.serde.loads_typed(chain[0][1:3])
+                continue
+            items = []
+            for _, _, data, _ in reversed(chain):
+                items.extend(
+                    self.serde.loads_typed(tuple(item))
+                    for item in ormsgpack.unpackb(data)
+                )
+            values[channel] = items
+        return values
+
+    # Writes
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = config['configurable']['thread_id']
+        checkpoint_ns = config['configurable'].get('checkpoint_ns', '')
+        c = checkpoint.copy()
+        values = c.pop('channel_values')
+        type_, data = self.serde.dumps_typed(c)
+        metadata_type, metadata_data = self.serde.dumps_typed(
+            get_checkpoint_metadata(config, metadata)
+        )
+        conn = self.conn
+        with self._lock, conn:
+            for channel, version in new_versions.items():
+                self._put_value(
+                    conn,
+                    thread_id,
+                    checkpoint_ns,
+                    channel,
+                    str(version),
+                    values.get(channel, _MISSING),
+                )
+            conn.execute(
+                'INSERT OR REPLACE INTO checkpoints VALUES '
+                '(?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint['id'],
+                    config['configurable'].get('checkpoint_id'),
+                    type_,
+                    data,
+                    metadata_type,
+                    metadata_data,
+                    json.dumps(
+                        {k: str(v) for k, v in c['channel_versions'].items()}
+                    ),
+                    self.namespace,
+                ),
+            )
+            conn.execute(
+                'INSERT INTO threads VALUES (?, ?, ?) '
+                'ON CONFLICT (namespace, thread_id) '
+                'DO UPDATE SET updated = excluded.updated',
+                (thread_id, time.time(), self.namespace),
+            )
+            self._compact(conn, thread_id, checkpoint_ns, self.max_checkpoints)
+        self._puts += 1
+        if self.thread_ttl is not None and self._puts % self.prune_every == 0:
+            self.prune_idle()
+        return {
+            'configurable': {
+                'thread_id': thread_id,
+                'checkpoint_ns': checkpoint_ns,
+                'checkpoint_id': checkpoint['id'],
+            }
+        }
+
+    def _put_value(
+        self,
+        conn: sqlite3.Connection,
+        thread_id: str,
+        checkpoint_ns: str,
+        channel: str,
+        version: str,
+        value: Any,
+    ):
+        key = (thread_id, checkpoint_ns, channel, version)
+        if value is _MISSING:
+            conn.execute(
+                'INSERT OR REPLACE INTO blobs (thread_id, checkpoint_ns, '
+                'channel, version, kind, namespace) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (*key, EMPTY, self.namespace),
+            )
+            return
+        if not isinstance(value, list):
+            type_, data = self.serde.dumps_typed(value)
+            conn.execute(
+                'INSERT OR REPLACE INTO blobs (thread_id, checkpoint_ns, '
+                'channel, version, kind, type, data, namespace) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (*key, VALUE, type_, data, self.namespace),
+            )
+            return
+        previous = conn.execute(
+            'SELECT version, depth, length, digest FROM blobs WHERE '
+            'namespace = ? AND thread_id = ? AND checkpoint_ns = ? AND '
+            "channel = ? AND kind IN ('list', 'delta') AND version < ? "
+            'ORDER BY version DESC LIMIT 1',
+            (self.namespace, *key),
+        ).fetchone()
+        items = [self.serde.dumps_typed(item) for item in value]
+        # Digests of the whole list and of the previous version's length,
+        # which matches when the previous list is a prefix of this one.
+        digest = hashlib.sha256()
+        prefix_digest = None
+        for i, (type_, data) in enumerate(items):
+            if previous and i == previous[2]:
+                prefix_digest = digest.digest()
+            digest.update(type_.encode())
+            digest.update(len(data).to_bytes(8, 'big'))
+            digest.update(data)
+        if previous and previous[2] == len(items):
+            prefix_digest = digest.digest()
+        if (
+            previous
+            and prefix_digest == previous[3]
+            and previous[1] + 1 < self.keyframe_interval
+        ):
+            kind, base, depth = DELTA, previous[0], previous[1] + 1
+            items = items[previous[2] :]
+        else:
+            kind, base, depth = LIST, None, 0
+        conn.execute(
+            'INSERT OR REPLACE INTO blobs VALUES '
+            '(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (
+                *key,
+                kind,
+                None,
+                ormsgpack.packb([list(item) for item in items]),
+                base,
+                depth,
+                len(value),
+                digest.digest(),
+                self.namespace,
+            ),
+        )
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = '',
+    ) -> None:
+        thread_id = config['configurable']['thread_id']
+        checkpoint_ns = config['configurable'].get('checkpoint_ns', '')
+        checkpoint_id = config['configurable']['checkpoint_id']
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            type_, data = self.serde.dumps_typed(value)
+            rows.append(
+                (
+                    WRITES_IDX_MAP.get(channel, idx),
+                    (
+                        thread_id,
+                        checkpoint_ns,
+                        checkpoint_id,
+                        task_id,
+                        WRITES_IDX_MAP.get(channel, idx),
+                        channel,
+                        type_,
+                        data,
+                        task_path,
+                        self.namespace,
+                    ),
+                )
+            )
+        conn = self.conn
+        with self._lock, conn:
+            for idx, row in rows:
+                # Regular writes are kept once, special ones are replaced.
+                verb = 'INSERT OR IGNORE' if idx >= 0 else 'INSERT OR REPLACE'
+                conn.execute(
+                    f'{verb} INTO writes VALUES '
+                    '(?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    row,
+                )
+
+    # Retention
+
+    def _compact(
+        self,
+        conn: sqlite3.Connection,
+        thread_id: str,
+        checkpoint_ns: str,
+        keep: int,
+    ):
+        """Drops all but the latest checkpoints and the values they need.
+
+        Only the values of the dropped checkpoints are looked at, so a put
+        costs the same however long the thread's history is.
+        """
+        thread = (self.namespace, thread_id, checkpoint_ns)
+        rows = conn.execute(
+            'SELECT checkpoint_id, channel_versions FROM checkpoints WHERE '
+            'namespace = ? AND thread_id = ? AND checkpoint_ns = ? '
+            'ORDER BY checkpoint_id DESC',
+            thread,
+        ).fetchall()
+        if len(rows) <= keep:
+            return
+        kept, dropped = rows[:keep], rows[keep:]
+        conn.executemany(
+            'DELETE FROM checkpoints WHERE namespace = ? AND thread_id = ? '
+            'AND checkpoint_ns = ? AND checkpoint_id = ?',
+            [(*thread, row[0]) for row in dropped],
+        )
+        conn.executemany(
+            'DELETE FROM writes WHERE namespace = ? AND thread_id = ? AND '
+            'checkpoint_ns = ? AND checkpoint_id = ?',
+            [(*thread, row[0]) for row in dropped],
+        )
+        needed = {
+            (channel, version)
+            for _, versions in kept
+            for channel, version in json.loads(versions).items()
+        }
+        unused = {
+            (channel, version)
+            for _, versions in dropped
+            for channel, version in json.loads(versions).items()
+        } - needed
+        # Newest first, so a delta is gone before its base is looked at. A
+        # value still used as a base belongs to a kept delta chain, one no
+        # longer used is dropped in turn.
+        for channel, version in sorted(unused, reverse=True):
+            while version is not None and (channel, version) not in needed:
+                if conn.execute(
+                    'SELECT 1 FROM blobs WHERE namespace = ? AND '
+                    'thread_id = ? AND checkpoint_ns = ? AND channel = ? '
+                    'AND base_version = ? LIMIT 1',
+                    (*thread, channel, version),
+                ).fetchone():
+                    break
+                key = (*thread, channel, version)
+                row = conn.execute(
+                    'SELECT base_version FROM blobs WHERE namespace = ? AND '
+                    'thread_id = ? AND checkpoint_ns = ? AND channel = ? '
+                    'AND version = ?',
+                    key,
+                ).fetchone()
+                if row is None:
+                    break
+                conn.execute(
+                    'DELETE FROM blobs WHERE namespace = ? AND thread_id = ? '
+                    'AND checkpoint_ns = ? AND channel = ? AND version = ?',
+                    key,
+                )
+                version = row[0]
+
+    def prune(
+        self, thread_ids: Sequence[str], *, strategy: str = 'keep_latest'
+    ) -> None:
+        """Keeps only each thread's latest checkpoint, or deletes it."""
+        if strategy == 'delete':
+            for thread_id in thread_ids:
+                self.delete_thread(thread_id)
+            return
+        conn = self.conn
+        with self._lock, conn:
+            for thread_id in thread_ids:
+                for (checkpoint_ns,) in conn.execute(
+                    'SELECT DISTINCT checkpoint_ns FROM checkpoints '
+                    'WHERE namespace = ? AND thread_id = ?',
+                    (self.namespace, thread_id),
+                ).fetchall():
+                    self._compact(conn, thread_id, checkpoint_ns, 1)
+
+    def prune_idle(self) -> int:
+        """Deletes threads idle for longer than thread_ttl, returns how many."""
+        if self.thread_ttl is None:
+            return 0
+        conn = self.conn
+        with self._lock:
+            idle = [
+                thread_id
+                for (thread_id,) in conn.execute(
+                    'SELECT thread_id FROM threads WHERE namespace = ? '
+                    'AND updated < ?',
+                    (self.namespace, time.time() - self.thread_ttl),
+                )
+            ]
+        for thread_id in idle:
+            self.delete_thread(thread_id)
+        return len(idle)
+
+    def delete_thread(self, thread_id: str) -> None:
+        conn = self.conn
+        with self._lock, conn:
+            for table in ('checkpoints', 'blobs', 'writes', 'threads'):
+                conn.execute(
+                    f'DELETE FROM {table} WHERE namespace = ? AND '
+                    'thread_id = ?',
+                    (self.namespace, thread_id),
+                )
+
+    def get_next_version(self, current: str | None, channel: None) -> str:
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split('.')[0])
+        return f'{current_v + 1:032}.{random.random():016}'
+
+    # Async
+
+    async def aget_tuple(
+        self, config: RunnableConfig
+    ) -> CheckpointTuple | None:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        items = await asyncio.to_thread(
+            lambda: list(
+                self.list(config, filter=filter, before=before, limit=limit)
+            )
+        )
+        for item in items:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(
+            self.put, config, checkpoint, metadata, new_versions
+        )
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = '',
+    ) -> None:
+        await asyncio.to_thread(
+            self.put_writes, config, writes, task_id, task_path
+        )
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    async def aprune(
+        self, thread_ids: Sequence[str], *, strategy: str = 'keep_latest'
+    ) -> None:
+        await asyncio.to_thread(self.prune, thread_ids, strategy=strategy)
@@ -0,0 +1,148 @@
+"""Cached, concurrent web search through the Tavily API."""
+
+import asyncio
+import os
+import re
+import time
+import unicodedata
+
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import Any
+
+import httpx
+
+from common.utils.loop_local import LoopLocal
+
+
+TAVILY_URL = 'https://api.tavily.com'
+
+
+def normalize_query(query: str) -> str:
+    """Folds case, width and whitespace so equivalent queries share a key."""
+    query = unicodedata.normalize('NFKC', query).casefold()
+    return re.sub(r'\s+', ' ', query).strip()
+
+
+class TavilySearchService:
+    """Searches Tavily with one pooled client and caches the results.
+
+    Queries are normalized before they are sent, so results for queries
+    that differ only in case or spacing are shared, and kept for ttl
+    seconds. Concurrent searches for a query that is being fetched wait
+    for that one call, and search_many runs several queries at once, at
+    most max_concurrency at a time. The search options given here apply
+    to every query and are part of the cache key.
+
+    Without an http_client, each event loop the service runs on gets a
+    client of its own, so a module-level service is safe to share.
+    """
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        base_url: str = TAVILY_URL,
+        http_client: httpx.AsyncClient | None = None,
+        ttl: float = 3600.0,
+        max_entries: int = 512,
+        max_concurrency: int = 4,
+        **options: Any,
+    ):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip('/')
+        self._http_client = http_client
+        self._clients = LoopLocal(lambda: httpx.AsyncClient(timeout=30.0))
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.options = options
+        # Number of calls made to the API.
+        self.upstream_calls = 0
+        # Query to (expiry, results), least recently used first.
+        self._results: OrderedDict[
+            str, tuple[float, list[dict[str, Any]]]
+        ] = OrderedDict()
+        self._inflight: LoopLocal[dict[str, asyncio.Task]] = LoopLocal(dict)
+        self._semaphores = LoopLocal(
+            lambda: asyncio.Semaphore(max_concurrency)
+        )
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """The client given, or the running loop's own."""
+        return self._http_client or self._clients.get()
+
+    async def search(self, query: str) -> list[dict[str, Any]]:
+        """Returns the results of a query, fetching them if needed.
+
+        Args:
+            query: The search query.
+
+        Returns:
+            The Tavily results, each with title, url, content and score.
+
+        Raises:
+            httpx.HTTPError: If the API request fails.
+            ValueError: If no API key is set or the response is invalid.
+        """
+        key = normalize_query(query)
+        results = self._cached(key)
+        if results is not None:
+            return results
+        inflight = self._inflight.get()
+        task = inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(key))
+            inflight[key] = task
+            task.add_done_callback(lambda _: inflight.pop(key, None))
+        # One caller giving up must not cancel the search for the others.
+        return await asyncio.shield(task)
+
+    async def search_many(
+        self, queries: Iterable[str]
+    ) -> list[list[dict[str, Any]]]:
+        """Runs several queries concurrently, results in the same order."""
+        return list(
+            await asyncio.gather(*(self.search(query) for query in queries))
+        )
+
+    def clear(self):
+        self._results.clear()
+
+    async def close(self):
+        """Closes the client given, or the running loop's own."""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+        elif (client := self._clients.pop()) is not None:
+            await client.aclose()
+
+    def _cached(self, key: str) -> list[dict[str, Any]] | None:
+        entry = self._results.get(key)
+        if entry is None:
+            return None
+        expiry, results = entry
+        if expiry < time.monotonic():
+            del self._results[key]
+            return None
+        self._results.move_to_end(key)
+        return results
+
+    async def _fetch(self, query: str) -> list[dict[str, Any]]:
+        api_key = self.api_key or os.getenv('TAVILY_API_KEY')
+        if not api_key:
+            raise ValueError('TAVILY_API_KEY is not set.')
+        async with self._semaphores.get():
+            self.upstream_calls += 1
+            response = await self.http_client.post(
+                f'{self.base_url}/search',
+                json={'query': query, **self.options},
+                headers={'Authorization': f'Bearer {api_key}'},
+            )
+        response.raise_for_status()
+        data = response.json()
+        if 'results' not in data:
+            raise ValueError('Invalid API response format.')
+        results = data['results']
+        self._results[query] = (time.monotonic() + self.ttl, results)
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+        return results
@@ -1,3 +1,7 @@
+import httpx
+
 from .host_agent import HostAgent
 
-root_agent = HostAgent(['http://localhost:10000']).create_agent()
+root_agent = HostAgent(
+    ['http://localhost:10000'], httpx.AsyncClient(timeout=30)
+).create_agent()
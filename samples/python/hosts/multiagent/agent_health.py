@@ -0,0 +1,102 @@
+import enum
+import time
+
+from collections import deque
+
+
+class CircuitState(enum.Enum):
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+
+class AgentHealth:
+    """Latency and error tracking for one remote agent, with a circuit breaker.
+
+    Latency and error rate are exponentially weighted moving averages. The
+    circuit opens once the error rate crosses failure_threshold after at
+    least min_calls calls, rejects requests for open_seconds, then lets a
+    single probe through (half open) whose outcome closes or re-opens it.
+    """
+
+    def __init__(
+        self,
+        alpha: float = 0.2,
+        failure_threshold: float = 0.5,
+        min_calls: int = 5,
+        open_seconds: float = 30.0,
+        latency_window: int = 100,
+    ):
+        self.alpha = alpha
+        self.failure_threshold = failure_threshold
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.latency_ewma: float | None = None
+        self.error_rate = 0.0
+        self.calls = 0
+        self.state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self._latencies: deque[float] = deque(maxlen=latency_window)
+
+    def allow_request(self) -> bool:
+        if self.state == CircuitState.CLOSED:
+            return True
+        if self.state == CircuitState.OPEN:
+            if time.monotonic() - self._opened_at < self.open_seconds:
+                return False
+            self.state = CircuitState.HALF_OPEN
+            self._probing = False
+        # Half open, only a single probe at a time.
+        if self._probing:
+            return False
+        self._probing = True
+        return True
+
+    def _update_error_rate(self, error: float):
+        # The first call seeds the average instead of decaying from zero.
+        self.calls += 1
+        self.error_rate = (
+            error
+            if self.calls == 1
+            else self.alpha * error + (1 - self.alpha) * self.error_rate
+        )
+
+    def record_success(self, latency: float):
+        self._update_error_rate(0.0)
+        self._latencies.append(latency)
+        self.latency_ewma = (
+            latency
+            if self.latency_ewma is None
+            else self.alpha * latency + (1 - self.alpha) * self.latency_ewma
+        )
+        if self.state == CircuitState.HALF_OPEN:
+            self.state = CircuitState.CLOSED
+            self._probing = False
+
+    def record_failure(self):
+        self._update_error_rate(1.0)
+        if self.state == CircuitState.HALF_OPEN or (
+            self.calls >= self.min_calls
+            and self.error_rate >= self.failure_threshold
+        ):
+            self.state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
+            self._probing = False
+
+    def p95_latency(self) -> float | None:
+        if not self._latencies:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    @property
+    def healthy(self) -> bool:
+        return self.state == CircuitState.CLOSED
+
+    def snapshot(self) -> dict:
+        return {
+            'state': self.state.value,
+            'latency_ewma': self.latency_ewma,
+            'error_rate': round(self.error_rate, 3),
+        }
@@ -0,0 +1,124 @@
+import math
+import re
+
+import numpy as np
+
+from a2a.types import AgentCard
+
+
+_TOKEN_RE = re.compile(r'\w+')
+
+# Function words that most cards and prompts share. They carry no routing
+# signal, yet outweigh a real match in short queries.
+STOP_WORDS = frozenset(
+    'a about an and are as at be by can do does for from get how i in is it'
+    ' me my of on or our please so some that the this to up was we what'
+    ' when which will with you your'.split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    return [
+        token
+        for token in _TOKEN_RE.findall(text.lower())
+        if token not in STOP_WORDS
+    ]
+
+
+def card_terms(card: AgentCard) -> list[str]:
+    """Collects the searchable terms of an agent card.
+
+    Name, description, and for each skill its name, description, tags,
+    examples and input/output modes.
+    """
+    fields = [card.name, card.description or '']
+    for skill in card.skills or []:
+        fields.append(skill.name)
+        fields.append(skill.description or '')
+        fields.extend(skill.tags or [])
+        fields.extend(skill.examples or [])
+        fields.extend(skill.inputModes or card.defaultInputModes or [])
+        fields.extend(skill.outputModes or card.defaultOutputModes or [])
+    return tokenize(' '.join(fields))
+
+
+class AgentRouter:
+    """BM25 index over the skills of the registered remote agents.
+
+    Cards are added incrementally. The NumPy postings are rebuilt lazily on
+    the first search after a change, so a query only touches the postings
+    of its own terms.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._names: list[str] = []
+        self._positions: dict[str, int] = {}
+        self._term_counts: list[dict[str, int]] = []
+        self._dirty = False
+        self._doc_len = np.zeros(0, dtype=np.float32)
+        self._postings: dict[str, tuple[np.ndarray, np.ndarray, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, card: AgentCard):
+        counts: dict[str, int] = {}
+        for term in card_terms(card):
+            counts[term] = counts.get(term, 0) + 1
+        if card.name in self._positions:
+            self._term_counts[self._positions[card.name]] = counts
+        else:
+            self._positions[card.name] = len(self._names)
+            self._names.append(card.name)
+            self._term_counts.append(counts)
+        self._dirty = True
+
+    def _build(self):
+        doc_ids: dict[str, list[int]] = {}
+        freqs: dict[str, list[int]] = {}
+        doc_len = np.zeros(len(self._names), dtype=np.float32)
+        for doc, counts in enumerate(self._term_counts):
+            doc_len[doc] = sum(counts.values())
+            for term, tf in counts.items():
+                doc_ids.setdefault(term, []).append(doc)
+                freqs.setdefault(term, []).append(tf)
+        n = len(self._names)
+        self._postings = {}
+        for term, docs in doc_ids.items():
+            df = len(docs)
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            self._postings[term] = (
+                np.asarray(docs, dtype=np.int32),
+                np.asarray(freqs[term], dtype=np.float32),
+                idf,
+            )
+        self._doc_len = doc_len
+        self._dirty = False
+
+    def search(self, query: str, top_k: int = 5) -> list[tuple[str, float]]:
+        """Returns up to top_k (agent name, score) pairs, best first.
+
+        Agents that share no term with the query are not returned.
+        """
+        if not self._names or top_k <= 0:
+            return []
+        if self._dirty:
+            self._build()
+        avg_len = float(self._doc_len.mean()) or 1.0
+        norm = self.k1 * (1 - self.b + self.b * self._doc_len / avg_len)
+        scores = np.zeros(len(self._names), dtype=np.float32)
+        for term in set(tokenize(query)):
+            posting = self._postings.get(term)
+            if posting is None:
+                continue
+            docs, tf, idf = posting
+            scores[docs] += idf * tf * (self.k1 + 1) / (tf + norm[docs])
+        matched = np.flatnonzero(scores > 0)
+        if matched.size > top_k:
+            matched = matched[
+                np.argpartition(scores[matched], -top_k)[-top_k:]
+            ]
+        ranked = matched[np.argsort(-scores[matched], kind='stable')]
+        return [(self._names[i], float(scores[i])) for i in ranked]
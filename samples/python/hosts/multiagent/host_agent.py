@@ -1,8 +1,11 @@
+import asyncio
 import base64
 import json
+import time
 import uuid
 
-from typing import List
+from collections.abc import AsyncIterator, Awaitable
+from typing import Any, Callable, List, NamedTuple
 
 import httpx
 
@@ -10,12 +13,15 @@ from a2a.client import A2ACardResolver
 from a2a.types import (
     AgentCard,
     DataPart,
+    JSONRPCError,
     Message,
     MessageSendConfiguration,
     MessageSendParams,
     Part,
     Task,
+    TaskArtifactUpdateEvent,
     TaskState,
+    TaskStatusUpdateEvent,
     TextPart,
 )
 from google.adk import Agent
@@ -24,7 +30,30 @@ from google.adk.agents.readonly_context import ReadonlyContext
 from google.adk.tools.tool_context import ToolContext
 from google.genai import types
 
-from .remote_agent_connection import RemoteAgentConnections, TaskUpdateCallback
+from .agent_router import AgentRouter
+from .remote_agent_connection import (
+    RemoteAgentConnections,
+    StreamEvent,
+    TaskUpdateCallback,
+)
+
+
+# States of a task the remote agent is still working on by itself.
+_RUNNING_STATES = (TaskState.submitted, TaskState.working)
+
+
+class RemoteUpdate(NamedTuple):
+    """The converted parts of one update from a remote agent."""
+
+    parts: list
+    # Continues the previous update, as artifact chunks sent with append do.
+    # Otherwise the update supersedes what the agent said before.
+    append: bool = False
+
+
+# Receives the agent name, each update and the tool context, as soon as the
+# remote agent sends the update.
+PartCallback = Callable[[str, RemoteUpdate, ToolContext], Awaitable[None]]
 
 
 class HostAgent:
@@ -39,31 +68,131 @@ class HostAgent:
         remote_agent_addresses: list[str],
         http_client: httpx.AsyncClient,
         task_callback: TaskUpdateCallback | None = None,
+        card_timeout: float = 5.0,
+        card_retry_delay: float = 2.0,
+        card_max_retries: int = 5,
+        routing_top_k: int = 5,
+        hide_unhealthy_agents: bool = False,
+        part_callback: PartCallback | None = None,
+        task_poll_interval: float = 1.0,
+        task_poll_timeout: float = 300.0,
     ):
         self.task_callback = task_callback
+        # Relays delegated output to the caller before the tool returns.
+        self.part_callback = part_callback
         self.httpx_client = http_client
+        self.card_timeout = card_timeout
+        self.card_retry_delay = card_retry_delay
+        self.card_max_retries = card_max_retries
+        # Only the top k agents for the current user turn go into the prompt.
+        self.routing_top_k = routing_top_k
+        self.router = AgentRouter()
+        # Agents with an open circuit are dropped from listings when set,
+        # otherwise they are listed last.
+        self.hide_unhealthy_agents = hide_unhealthy_agents
+        # Tasks an agent returns unfinished are polled with tasks/get, at an
+        # interval that doubles up to ten times task_poll_interval.
+        self.task_poll_interval = task_poll_interval
+        self.task_poll_timeout = task_poll_timeout
         self.remote_agent_connections: dict[str, RemoteAgentConnections] = {}
         self.cards: dict[str, AgentCard] = {}
-        for address in remote_agent_addresses:
-            card_resolver = A2ACardResolver(http_client, address)
-            card = card_resolver.get_agent_card()
-            remote_connection = RemoteAgentConnections(http_client, card)
-            self.remote_agent_connections[card.name] = remote_connection
-            self.cards[card.name] = card
-        agent_info = []
-        for ra in self.list_remote_agents():
-            agent_info.append(json.dumps(ra))
-        self.agents = '\n'.join(agent_info)
+        # Agent name -> JSON line used in the prompt, kept up to date on each
+        # registration so the directory is never rebuilt from scratch.
+        self._agent_directory: dict[str, str] = {}
+        self._agents_text: str | None = ''
+        # Strong references to the background retry tasks.
+        self._background_tasks: set[asyncio.Task] = set()
+        # Resolved by connect, on the loop that will use http_client.
+        self._pending_addresses = list(remote_agent_addresses)
+
+    @classmethod
+    async def create(
+        cls,
+        remote_agent_addresses: list[str],
+        http_client: httpx.AsyncClient,
+        task_callback: TaskUpdateCallback | None = None,
+        **kwargs: Any,
+    ) -> 'HostAgent':
+        """Creates a host agent with the cards at remote_agent_addresses.
+
+        Addresses that cannot be resolved are retried in the background.
+        """
+        host = cls(remote_agent_addresses, http_client, task_callback, **kwargs)
+        await host.connect()
+        return host
+
+    async def connect(self):
+        """Resolves the addresses given to the constructor, once."""
+        addresses, self._pending_addresses = self._pending_addresses, []
+        if addresses:
+            await self.init_remote_agent_addresses(addresses)
+
+    async def init_remote_agent_addresses(
+        self,
+        remote_agent_addresses: list[str],
+        retry_unreachable: bool = True,
+    ) -> list[str]:
+        """Resolves the agent cards of all addresses concurrently.
+
+        Returns the addresses that could not be resolved. When
+        retry_unreachable is set those are retried in the background.
+        """
+        results = await asyncio.gather(
+            *(self.retrieve_card(address) for address in remote_agent_addresses)
+        )
+        unreachable = [
+            address
+            for address, card in zip(remote_agent_addresses, results)
+            if card is None
+        ]
+        if retry_unreachable:
+            for address in unreachable:
+                self._track(asyncio.create_task(self._retry_card(address)))
+        return unreachable
+
+    async def retrieve_card(self, address: str) -> AgentCard | None:
+        """Fetches and registers the card at address, None on failure."""
+        card_resolver = A2ACardResolver(self.httpx_client, address)
+        try:
+            card = await asyncio.wait_for(
+                card_resolver.get_agent_card(), timeout=self.card_timeout
+            )
+        except Exception as e:
+            print(f'Failed to resolve agent card at {address}: {e!r}')
+            return None
+        self.register_agent_card(card)
+        return card
+
+    async def _retry_card(self, address: str):
+        delay = self.card_retry_delay
+        for _ in range(self.card_max_retries):
+            await asyncio.sleep(delay)
+            if await self.retrieve_card(address):
+                return
+            delay *= 2
+        print(f'Giving up on agent at {address}')
+
+    def _track(self, task: asyncio.Task):
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    @property
+    def agents(self) -> str:
+        """The agent directory as newline separated JSON, one per agent."""
+        if self._agents_text is None:
+            self._agents_text = '\n'.join(self._agent_directory.values())
+        return self._agents_text
 
     def register_agent_card(self, card: AgentCard):
         remote_connection = RemoteAgentConnections(self.httpx_client, card)
-        print(card)
         self.remote_agent_connections[card.name] = remote_connection
         self.cards[card.name] = card
-        agent_info = []
-        for ra in self.list_remote_agents():
-            agent_info.append(json.dumps(ra))
-        self.agents = '\n'.join(agent_info)
+        self._agent_directory[card.name] = json.dumps(
+            {'name': card.name, 'description': card.description}
+        )
+        # The joined text is rebuilt lazily on next read.
+        self._agents_text = None
+        self.router.add(card)
 
     def create_agent(self) -> Agent:
         print('Creating host agent with remote agents:')
@@ -78,17 +207,41 @@ class HostAgent:
             ),
             tools=[
                 self.list_remote_agents,
+                self.find_remote_agents,
                 self.send_message,
             ],
         )
 
-    def root_instruction(self, context: ReadonlyContext) -> str:
+    def candidate_agents(self, query: str) -> str:
+        """The directory entries of the agents best matching query.
+
+        Falls back to the whole directory when there are no more agents than
+        routing_top_k or nothing in the index matches.
+        """
+        if len(self._agent_directory) <= self.routing_top_k or not query:
+            return self.agents
+        ranked = self.router.search(query, self.routing_top_k)
+        if not ranked:
+            return self.agents
+        return '\n'.join(self._agent_directory[name] for name, _ in ranked)
+
+    async def root_instruction(self, context: ReadonlyContext) -> str:
+        # Hosts built with the constructor rather than create, such as the
+        # adk web entry point, resolve their cards on the first turn.
+        await self.connect()
         current_agent = self.check_state(context)
+        user_content = context.user_content
+        query = ' '.join(
+            part.text
+            for part in (user_content.parts or [] if user_content else [])
+            if part.text
+        )
         return f"""당신은 사용자의 요청을 적절한 원격 에이전트(remote agent)에게 위임할 수 있는 전문가입니다.
 
 🔍 원격 에이전트 탐색:
 - 필요한 경우 `list_remote_agents` 도구를 사용하여 사용 가능한 원격 에이전트 목록을 확인할 수 있습니다.
 - 각 에이전트의 설명을 참고하여 어떤 작업을 위임할 수 있을지 판단하세요.
+- 아래 목록은 현재 요청과 관련성이 높은 후보 에이전트만 보여줍니다. 적합한 에이전트가 없으면 `find_remote_agents` 도구로 다른 키워드를 검색하세요.
 
 🛠️ 작업 실행:
 - 요청을 직접 처리하기 어려운 경우, `send_message` 도구를 사용하여 적절한 원격 에이전트에 작업을 위임하세요.
@@ -100,7 +253,7 @@ class HostAgent:
 - 대화의 가장 최근 내용을 중심으로 판단하여 응답하세요.
 
 📋 사용 가능한 에이전트 목록:
-{self.agents}
+{self.candidate_agents(query)}
 
 📌 현재 활성 에이전트: {current_agent['active_agent']}
 """
@@ -129,41 +282,54 @@ class HostAgent:
             return []
 
         remote_agent_info = []
-        for card in self.cards.values():
+        for connection in self._ranked_connections(
+            self.remote_agent_connections.values()
+        ):
+            card = connection.card
             remote_agent_info.append(
                 {'name': card.name, 'description': card.description}
             )
         return remote_agent_info
 
-    async def send_message(
-        self, agent_name: str, message: str, tool_context: ToolContext
-    ):
-        """Sends a task either streaming (if supported) or non-streaming.
-
-        This will send a message to the remote agent named agent_name.
+    def _ranked_connections(
+        self, connections
+    ) -> list[RemoteAgentConnections]:
+        """Orders healthy agents first, fastest first."""
+        if self.hide_unhealthy_agents:
+            connections = [c for c in connections if c.health.healthy]
+        return sorted(
+            connections,
+            key=lambda c: (
+                not c.health.healthy,
+                c.health.latency_ewma or 0.0,
+            ),
+        )
 
-        Args:
-          agent_name: The name of the agent to send the task to.
-          message: The message to send to the agent for the task.
-          tool_context: The tool context this method runs in.
+    def find_remote_agents(self, query: str):
+        """Find the remote agents whose skills best match the query."""
+        return [
+            {'name': c.card.name, 'description': c.card.description}
+            for c in self._ranked_connections(
+                self.remote_agent_connections[name]
+                for name, _ in self.router.search(query, self.routing_top_k)
+            )
+        ]
 
-        Yields:
-          A dictionary of JSON data.
-        """
+    def _connection(self, agent_name: str) -> RemoteAgentConnections:
         if agent_name not in self.remote_agent_connections:
             raise ValueError(f'Agent {agent_name} not found')
-        state = tool_context.state
-        state['agent'] = agent_name
         client = self.remote_agent_connections[agent_name]
         if not client:
             raise ValueError(f'Client not available for {agent_name}')
+        return client
+
+    def _build_request(self, message: str, state) -> MessageSendParams:
         taskId = state.get('task_id', None)
         contextId = state.get('context_id', None)
         messageId = state.get('message_id', None)
-        task: Task
         if not messageId:
             messageId = str(uuid.uuid4())
-        request: MessageSendParams = MessageSendParams(
+        return MessageSendParams(
             id=str(uuid.uuid4()),
             message=Message(
                 role='user',
@@ -176,10 +342,11 @@ class HostAgent:
                 acceptedOutputModes=['text', 'text/plain', 'image/png'],
             ),
         )
-        response = await client.send_message(request, self.task_callback)
-        if isinstance(response, Message):
-            return await convert_parts(task.parts, tool_context)
-        task: Task = response
+
+    def _update_task_state(
+        self, agent_name: str, task: Task, tool_context: ToolContext
+    ):
+        state = tool_context.state
         # Assume completion unless a state returns that isn't complete
         state['session_active'] = task.status.state not in [
             TaskState.completed,
@@ -200,6 +367,123 @@ class HostAgent:
         elif task.status.state == TaskState.failed:
             # Raise error for failure
             raise ValueError(f'Agent {agent_name} task {task.id} failed')
+
+    async def _events(
+        self, agent_name: str, message: str, tool_context: ToolContext
+    ) -> AsyncIterator[tuple[StreamEvent, Task | None]]:
+        """Sends a message and yields each event with the task it updates."""
+        client = self._connection(agent_name)
+        tool_context.state['agent'] = agent_name
+        request = self._build_request(message, tool_context.state)
+        task: Task | None = None
+        async for event in client.stream_message(request):
+            if isinstance(event, JSONRPCError):
+                raise ValueError(f'Agent {agent_name} error: {event.message}')
+            if isinstance(event, Message):
+                yield event, None
+                return
+            if self.task_callback:
+                task = self.task_callback(event, client.card)
+            elif isinstance(event, Task):
+                task = event
+            elif task and isinstance(event, TaskStatusUpdateEvent):
+                task.status = event.status
+            yield event, task
+        if task and task.status.state in _RUNNING_STATES:
+            # Agents without streaming may answer before the task is done.
+            async for polled in self._poll_task(client, task.id):
+                task = (
+                    self.task_callback(polled, client.card)
+                    if self.task_callback
+                    else polled
+                )
+                yield polled, task
+
+    async def _poll_task(
+        self, client: RemoteAgentConnections, task_id: str
+    ) -> AsyncIterator[Task]:
+        """Yields a running task each time it changes, until it stops.
+
+        Reads use the connection's hedged get_task, so one slow answer does
+        not hold up the poll.
+        """
+        deadline = time.monotonic() + self.task_poll_timeout
+        interval = self.task_poll_interval
+        last: Task | None = None
+        while True:
+            if time.monotonic() + interval > deadline:
+                raise TimeoutError(
+                    f'Agent {client.card.name} task {task_id} still running'
+                    f' after {self.task_poll_timeout}s'
+                )
+            await asyncio.sleep(interval)
+            task = await client.get_task(task_id)
+            if isinstance(task, JSONRPCError):
+                raise ValueError(
+                    f'Agent {client.card.name} error: {task.message}'
+                )
+            if task != last:
+                yield task
+                last = task
+            if task.status.state not in _RUNNING_STATES:
+                return
+            interval = min(interval * 2, self.task_poll_interval * 10)
+
+    async def stream_message(
+        self, agent_name: str, message: str, tool_context: ToolContext
+    ) -> AsyncIterator[RemoteUpdate]:
+        """Sends a message and relays the remote agent's output incrementally.
+
+        Each status message and artifact chunk is converted and yielded as
+        soon as the remote agent sends it, rather than once the task is done.
+
+        Args:
+          agent_name: The name of the agent to send the task to.
+          message: The message to send to the agent for the task.
+          tool_context: The tool context this method runs in.
+
+        Yields:
+          The converted parts of each update, in arrival order.
+        """
+        task: Task | None = None
+        async for event, task in self._events(
+            agent_name, message, tool_context
+        ):
+            update = await convert_update(event, tool_context)
+            if update:
+                yield update
+        if task:
+            self._update_task_state(agent_name, task, tool_context)
+
+    async def send_message(
+        self, agent_name: str, message: str, tool_context: ToolContext
+    ):
+        """Sends a task either streaming (if supported) or non-streaming.
+
+        This will send a message to the remote agent named agent_name. Each
+        update is passed to part_callback as it arrives.
+
+        Args:
+          agent_name: The name of the agent to send the task to.
+          message: The message to send to the agent for the task.
+          tool_context: The tool context this method runs in.
+
+        Yields:
+          A dictionary of JSON data.
+        """
+        task: Task | None = None
+        async for event, task in self._events(
+            agent_name, message, tool_context
+        ):
+            if self.part_callback:
+                update = await convert_update(event, tool_context)
+                if update:
+                    await self.part_callback(agent_name, update, tool_context)
+            if isinstance(event, Message):
+                return await convert_parts(event.parts, tool_context)
+        if not task:
+            return []
+        self._update_task_state(agent_name, task, tool_context)
         response = []
         if task.status.message:
             # Assume the information is in the task message.
@@ -214,6 +498,28 @@ class HostAgent:
         return response
 
 
+async def convert_update(
+    event: StreamEvent, tool_context: ToolContext
+) -> RemoteUpdate | None:
+    """Converts the parts a remote agent sent in event, None if it has none."""
+    if isinstance(event, Message):
+        return RemoteUpdate(await convert_parts(event.parts, tool_context))
+    if isinstance(event, TaskArtifactUpdateEvent):
+        return RemoteUpdate(
+            await convert_parts(event.artifact.parts, tool_context),
+            append=bool(event.append),
+        )
+    parts = []
+    status = event.status
+    if status.message:
+        parts.extend(await convert_parts(status.message.parts, tool_context))
+    # A whole task, the single response of an agent without streaming.
+    if isinstance(event, Task):
+        for artifact in event.artifacts or []:
+            parts.extend(await convert_parts(artifact.parts, tool_context))
+    return RemoteUpdate(parts) if parts else None
+
+
 async def convert_parts(parts: list[Part], tool_context: ToolContext):
     rval = []
     for p in parts:
@@ -1,8 +1,14 @@
+import asyncio
+import time
+import uuid
+
+from collections.abc import AsyncIterator, Awaitable
 from typing import Callable
 import httpx
 from a2a.client import A2AClient
 from a2a.types import (
     AgentCard,
+    GetTaskRequest,
     Task,
     Message,
     MessageSendParams,
@@ -10,25 +16,206 @@ from a2a.types import (
     TaskArtifactUpdateEvent,
     SendMessageRequest,
     SendStreamingMessageRequest,
+    JSONRPCError,
     JSONRPCErrorResponse,
+    TaskQueryParams,
 )
 
+from .agent_health import AgentHealth, CircuitState
+
 
 TaskCallbackArg = Task | TaskStatusUpdateEvent | TaskArtifactUpdateEvent
 TaskUpdateCallback = Callable[[TaskCallbackArg, AgentCard], Task]
+StreamEvent = TaskCallbackArg | Message | JSONRPCError
+
+# Marks the end of the relayed stream in the buffer.
+_END_OF_STREAM = object()
+
+
+class RemoteAgentUnavailableError(Exception):
+    """Raised when a remote agent's circuit breaker is open."""
+
+    def __init__(self, agent_name: str):
+        self.agent_name = agent_name
+        super().__init__(f'Agent {agent_name} is unavailable, circuit open')
 
 
 class RemoteAgentConnections:
     """A class to hold the connections to the remote agents."""
 
-    def __init__(self, client: httpx.AsyncClient, agent_card: AgentCard):
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        agent_card: AgentCard,
+        max_buffered_events: int = 64,
+        request_timeout: float | None = 60.0,
+        hedge_delay: float = 1.0,
+        hedged_attempts: int = 2,
+        health: AgentHealth | None = None,
+    ):
+        if hedged_attempts < 1:
+            raise ValueError('hedged_attempts must be at least 1')
         self.agent_client = A2AClient(client, agent_card)
         self.card = agent_card
         self.pending_tasks = set()
+        self.max_buffered_events = max_buffered_events
+        # Timeout for a whole request, or between two streamed events.
+        self.request_timeout = request_timeout
+        # Used for hedging until there are latency samples for a p95.
+        self.hedge_delay = hedge_delay
+        self.hedged_attempts = hedged_attempts
+        self.health = health or AgentHealth()
 
     def get_agent(self) -> AgentCard:
         return self.card
 
+    def _check_available(self):
+        if not self.health.allow_request():
+            raise RemoteAgentUnavailableError(self.card.name)
+
+    async def _call(self, request: Callable[[], Awaitable]):
+        """Runs one request under the timeout and records its outcome."""
+        self._check_available()
+        start = time.monotonic()
+        try:
+            result = await asyncio.wait_for(request(), self.request_timeout)
+        except Exception:
+            self.health.record_failure()
+            raise
+        self.health.record_success(time.monotonic() - start)
+        return result
+
+    async def get_task(
+        self, task_id: str, history_length: int | None = None
+    ) -> Task | JSONRPCError:
+        """Fetches a task, hedging slow or failed attempts.
+
+        tasks/get is idempotent, so when an attempt has not answered within
+        the agent's p95 latency, or has failed, another one is sent. The
+        first successful answer wins and the others are cancelled. While the
+        circuit is not closed only a single attempt is made, the probe.
+        """
+        request = GetTaskRequest(
+            id=str(uuid.uuid4()),
+            params=TaskQueryParams(id=task_id, historyLength=history_length),
+        )
+        hedge_delay = self.health.p95_latency() or self.hedge_delay
+        attempts = (
+            self.hedged_attempts
+            if self.health.state == CircuitState.CLOSED
+            else 1
+        )
+        pending: set[asyncio.Task] = set()
+        error: BaseException | None = None
+        try:
+            for attempt in range(attempts):
+                pending.add(
+                    asyncio.create_task(
+                        self._call(lambda: self.agent_client.get_task(request))
+                    )
+                )
+                last = attempt == attempts - 1
+                while pending:
+                    done, pending = await asyncio.wait(
+                        pending,
+                        timeout=None if last else hedge_delay,
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+                    for attempt_task in done:
+                        if attempt_task.exception() is None:
+                            response = attempt_task.result()
+                            if isinstance(response.root, JSONRPCErrorResponse):
+                                return response.root.error
+                            return response.root.result
+                        error = attempt_task.exception()
+                    if not last:
+                        # Timed out or failed, send the next attempt now.
+                        break
+            raise error
+        finally:
+            for attempt_task in pending:
+                attempt_task.cancel()
+
+    async def stream_message(
+        self, request: MessageSendParams
+    ) -> AsyncIterator[StreamEvent]:
+        """Relays the remote agent's events to the caller as they arrive.
+
+        The remote stream is read ahead into a buffer of at most
+        max_buffered_events, so a slow consumer applies backpressure to the
+        remote agent instead of growing memory. The iteration ends after a
+        Message, an error, or the final status update. Agents without
+        streaming support yield their single response.
+        """
+        if not self.card.capabilities.streaming:
+            response = await self._call(
+                lambda: self.agent_client.send_message(
+                    SendMessageRequest(params=request)
+                )
+            )
+            if isinstance(response.root, JSONRPCErrorResponse):
+                yield response.root.error
+            else:
+                yield response.root.result
+            return
+
+        self._check_available()
+        buffer: asyncio.Queue = asyncio.Queue(maxsize=self.max_buffered_events)
+
+        async def pump():
+            try:
+                async for response in self.agent_client.send_message_streaming(
+                    SendStreamingMessageRequest(params=request)
+                ):
+                    if isinstance(response.root, JSONRPCErrorResponse):
+                        await buffer.put(response.root.error)
+                        break
+                    event = response.root.result
+                    await buffer.put(event)
+                    # In the case a message is returned, that is the end of the interaction.
+                    if isinstance(event, Message) or getattr(
+                        event, 'final', False
+                    ):
+                        break
+            except Exception as e:
+                await buffer.put(e)
+            await buffer.put(_END_OF_STREAM)
+
+        producer = asyncio.create_task(pump())
+        start = time.monotonic()
+        latency = None
+        failed = False
+        try:
+            while True:
+                try:
+                    item = await asyncio.wait_for(
+                        buffer.get(), self.request_timeout
+                    )
+                except TimeoutError as e:
+                    raise TimeoutError(
+                        f'Agent {self.card.name} sent nothing for'
+                        f' {self.request_timeout}s'
+                    ) from e
+                if item is _END_OF_STREAM:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                if latency is None:
+                    latency = time.monotonic() - start
+                yield item
+        except Exception:
+            failed = True
+            raise
+        finally:
+            producer.cancel()
+            # Latency of a stream is its time to first event.
+            if failed:
+                self.health.record_failure()
+            else:
+                self.health.record_success(
+                    latency if latency is not None else time.monotonic() - start
+                )
+
     async def send_message(
         self,
         request: MessageSendParams,
@@ -36,25 +223,18 @@ class RemoteAgentConnections:
     ) -> Task | Message | None:
         if self.card.capabilities.streaming:
             task = None
-            async for response in self.agent_client.send_message_streaming(
-                SendStreamingMessageRequest(params=request)
-            ):
-                if not response.root.result:
-                    return response.root.error
-                # In the case a message is returned, that is the end of the interaction.
-                event = response.root.result
-                if isinstance(event, Message):
+            async for event in self.stream_message(request):
+                if isinstance(event, Message | JSONRPCError):
                     return event
-
                 # Otherwise we are in the Task + TaskUpdate cycle.
                 if task_callback and event:
                     task = task_callback(event, self.card)
-                if hasattr(event, 'final') and event.final:
-                    break
             return task
         else:  # Non-streaming
-            response = await self.agent_client.send_message(
-                SendMessageRequest(params=request)
+            response = await self._call(
+                lambda: self.agent_client.send_message(
+                    SendMessageRequest(params=request)
+                )
             )
             if isinstance(response.root, JSONRPCErrorResponse):
                 return response.root.error
@@ -0,0 +1,97 @@
+"""Prompt size and routing accuracy of the host agent's AgentRouter"""
+
+import json
+import random
+import time
+
+import pytest
+
+from a2a.types import AgentCapabilities, AgentCard, AgentSkill
+from hosts.multiagent.agent_router import AgentRouter
+
+
+pytestmark = pytest.mark.benchmark
+
+DOMAINS = {
+    'currency': ['exchange', 'rate', 'usd', 'eur', 'convert', 'forex'],
+    'weather': ['forecast', 'rain', 'temperature', 'wind', 'humidity'],
+    'travel': ['flight', 'hotel', 'booking', 'itinerary', 'airport'],
+    'finance': ['invoice', 'billing', 'cost', 'budget', 'expense'],
+    'cloud': ['aws', 'ec2', 's3', 'region', 'cost', 'usage'],
+    'docs': ['document', 'write', 'edit', 'markdown', 'report'],
+    'search': ['web', 'research', 'sources', 'summary', 'report'],
+    'image': ['picture', 'generate', 'png', 'draw', 'render'],
+    'calendar': ['meeting', 'schedule', 'event', 'invite', 'reminder'],
+    'reimburse': ['receipt', 'claim', 'expense', 'hotel', 'refund'],
+}
+
+
+def make_card(index: int, rng: random.Random) -> AgentCard:
+    domain = list(DOMAINS)[index % len(DOMAINS)]
+    words = rng.sample(DOMAINS[domain], 3)
+    return AgentCard(
+        name=f'{domain}_agent_{index}',
+        description=f'Handles {domain} requests about {" ".join(words)}',
+        url=f'http://localhost:{10000 + index}',
+        version='1.0.0',
+        capabilities=AgentCapabilities(streaming=True),
+        defaultInputModes=['text'],
+        defaultOutputModes=['text'],
+        skills=[
+            AgentSkill(
+                id=f'{domain}{index}',
+                name=f'{domain} {index}',
+                description=f'{domain} skill number {index}',
+                tags=[domain, *words],
+                examples=[f'Please {words[0]} the {words[1]}'],
+            )
+        ],
+    )
+
+
+def paraphrase(domain: str, rng: random.Random) -> str:
+    """A request using two of the domain's words, never its name."""
+    first, second = rng.sample(DOMAINS[domain], 2)
+    return f'Could you help me with the {first}, and the {second} too?'
+
+
+def prompt_tokens(lines: list[str]) -> int:
+    # Roughly four characters per token for English JSON.
+    return sum(len(line) for line in lines) // 4
+
+
+@pytest.mark.parametrize('num_agents', [10, 100, 1000])
+def test_routing(num_agents):
+    top_k = 5
+    rng = random.Random(num_agents)
+    router = AgentRouter()
+    cards = [make_card(i, rng) for i in range(num_agents)]
+    for card in cards:
+        router.add(card)
+    directory = {
+        c.name: json.dumps({'name': c.name, 'description': c.description})
+        for c in cards
+    }
+    full_tokens = prompt_tokens(list(directory.values()))
+
+    trials = 200
+    hits = 0
+    routed_tokens = 0
+    start = time.perf_counter()
+    for _ in range(trials):
+        domain = rng.choice(list(DOMAINS))
+        query = paraphrase(domain, rng)
+        ranked = [name for name, _ in router.search(query, top_k)]
+        hits += bool(ranked) and ranked[0].startswith(f'{domain}_agent_')
+        routed_tokens = max(
+            routed_tokens,
+            prompt_tokens([directory[name] for name in ranked]),
+        )
+    elapsed = time.perf_counter() - start
+
+    print(
+        f'\nagents={num_agents} full_prompt_tokens={full_tokens}'
+        f' routed_prompt_tokens<={routed_tokens}'
+        f' domain_accuracy@1={hits / trials:.2f}'
+        f' per_query_ms={elapsed / trials * 1000:.3f}'
+    )
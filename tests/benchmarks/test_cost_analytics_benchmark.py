@@ -0,0 +1,72 @@
+"""FitCloud cost rollups at scale, against the pandas preprocessing"""
+
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from test_cost_analytics import records  # noqa: F401
+
+from agents.langgraph.agent.cost_analytics import CostAnalytics
+
+
+pytestmark = pytest.mark.benchmark
+
+# The row count, set COST_BENCHMARK_ROWS=10000000 for the full comparison.
+BENCHMARK_ROWS = int(os.environ.get('COST_BENCHMARK_ROWS', 1_000_000))
+
+
+def old_preprocess(records: list[dict]) -> dict:
+    """The rollups the FitCloud tool used to compute, without printing."""
+    df = pd.DataFrame(records)
+    for col in ['usage_fee', 'usage_amount']:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    keys = ['service_name', 'product_region_name', 'usage_type']
+    detail = (
+        df.groupby(keys)
+        .agg(Total_Fee=('usage_fee', 'sum'), Total_Usage=('usage_amount', 'sum'))
+        .sort_values(by='Total_Fee', ascending=False)
+    )
+    detail['Total_Fee'] = detail['Total_Fee'].apply(lambda x: f'${x:.8f}')
+    return {
+        'total': df['usage_fee'].sum(),
+        **{
+            key: df.groupby(key)['usage_fee']
+            .sum()
+            .sort_values(ascending=False)
+            .apply(lambda x: f'${x:.4f}')
+            for key in keys
+        },
+        'detail': detail,
+    }
+
+
+def test_rollups_against_pandas(records):
+    rows = BENCHMARK_ROWS
+    scaled = records * (rows // len(records))
+
+    began = time.perf_counter()
+    old_preprocess(scaled)
+    old_time = time.perf_counter() - began
+    old_memory = pd.DataFrame(scaled[:100_000]).memory_usage(deep=True).sum()
+
+    costs = CostAnalytics()
+    began = time.perf_counter()
+    costs.load(scaled)
+    load_time = time.perf_counter() - began
+    began = time.perf_counter()
+    summary = costs.summary('202505')
+    rollup_time = time.perf_counter() - began
+    began = time.perf_counter()
+    costs.summary('202505')
+    cached_time = time.perf_counter() - began
+    memory = costs.frame.memory_usage(deep=True).sum() / len(costs.frame)
+
+    print(
+        f'\n{len(scaled)} rows: pandas {old_time:.2f}s, '
+        f'{old_memory / 100_000:.0f}B per row; normalized in {load_time:.2f}s, '
+        f'{memory:.0f}B per row, rollups {rollup_time * 1e3:.0f}ms, '
+        f'cached {cached_time * 1e6:.0f}us'
+    )
+    assert summary.line_items == len(scaled)
@@ -0,0 +1,31 @@
+"""FitCloud cost questions answered from the API and from the warehouse"""
+
+import time
+
+import pytest
+
+from test_cost_warehouse import api, make_warehouse  # noqa: F401
+
+
+pytestmark = pytest.mark.benchmark
+
+
+@pytest.mark.parametrize('max_workers', [1, 4, 8])
+def test_cold_and_warm_month(api, max_workers):  # noqa: F811
+    stub, url = api
+    stub.latency = 0.02
+    warehouse = make_warehouse(url, max_workers=max_workers)
+
+    began = time.perf_counter()
+    warehouse.costs('20250501', '20250531', 'month')
+    cold = time.perf_counter() - began
+    began = time.perf_counter()
+    warehouse.costs('202505', '202505', 'month')
+    warm = time.perf_counter() - began
+
+    print(
+        f'\nMay by service with {max_workers} workers: {cold * 1e3:.0f}ms '
+        f'from the API ({len(stub.requests)} days, '
+        f'{len(stub.requests) * stub.latency * 1e3:.0f}ms one at a time), '
+        f'{warm * 1e3:.1f}ms locally'
+    )
@@ -0,0 +1,77 @@
+"""Prompt size and citation lookup on a long parsed document"""
+
+import os
+import random
+import time
+
+import pytest
+
+from test_document_index import (
+    find_cited_lines,
+    full_prompt,
+    synthetic_document,
+)
+
+from agents.llama_index_file_chat.document_index import (
+    DocumentIndex,
+    cited_lines,
+)
+
+
+pytestmark = pytest.mark.benchmark
+
+# The document's line count, about 40 PDF pages per 1000 lines. Set
+# DOCUMENT_INDEX_BENCHMARK_LINES lower for a quick run.
+BENCHMARK_LINES = int(os.environ.get('DOCUMENT_INDEX_BENCHMARK_LINES', 50000))
+
+
+def test_prompt_size():
+    lines = synthetic_document(BENCHMARK_LINES)
+    question = 'What label smoothing was used when training the model?'
+
+    began = time.perf_counter()
+    text = full_prompt(lines)
+    tag_time = time.perf_counter() - began
+    began = time.perf_counter()
+    index = DocumentIndex(lines)
+    build_time = time.perf_counter() - began
+    began = time.perf_counter()
+    chunks = index.search(question)
+    search_time = time.perf_counter() - began
+    prompt = index.render(chunks)
+
+    # About four characters per token.
+    full_tokens, prompt_tokens = len(text) // 4, len(prompt) // 4
+    print(
+        f'\n{len(lines)} lines: {full_tokens} prompt tokens with the whole '
+        f'document, {prompt_tokens} with {len(chunks)} of '
+        f'{index.chunk_count} chunks ({full_tokens / prompt_tokens:.0f}x); '
+        f'tagging {tag_time * 1e3:.0f}ms, index {build_time * 1e3:.0f}ms, '
+        f'search {search_time * 1e3:.2f}ms'
+    )
+
+
+def test_citation_lookup():
+    lines = synthetic_document(BENCHMARK_LINES)
+    text = full_prompt(lines)
+    rng = random.Random(2)
+    # 200 citations of one to three lines, spread over the document.
+    citations = [
+        [start + i for i in range(rng.randint(1, 3))]
+        for start in (rng.randrange(len(lines) - 3) for _ in range(200))
+    ]
+
+    began = time.perf_counter()
+    expected = [find_cited_lines(text, numbers) for numbers in citations]
+    find_time = time.perf_counter() - began
+    began = time.perf_counter()
+    cited = [cited_lines(lines, numbers) for numbers in citations]
+    index_time = time.perf_counter() - began
+
+    print(
+        f'\n{len(citations)} citations in {len(lines)} lines: '
+        f'{find_time * 1e3:.0f}ms searching the tagged text, '
+        f'{index_time * 1e3:.2f}ms indexing the lines '
+        f'({find_time / index_time:.0f}x)'
+    )
+    assert cited == expected
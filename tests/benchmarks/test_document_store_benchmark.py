@@ -0,0 +1,86 @@
+"""Range reads and bulk edits of the document store on a large file"""
+
+import os
+import random
+import time
+
+import pytest
+
+from test_document_store import reference_insert
+
+from common.utils.document_store import DocumentStore
+
+
+pytestmark = pytest.mark.benchmark
+
+# The document size, set DOCUMENT_BENCHMARK_MB lower for a quick run.
+BENCHMARK_MB = int(os.environ.get('DOCUMENT_BENCHMARK_MB', 100))
+
+
+def write_benchmark_document(path, megabytes: int) -> int:
+    line = 'FitCloud 문서의 한 줄, 줄 길이를 현실적으로 맞춘 본문입니다.\n'
+    count = megabytes * 2**20 // len(line.encode())
+    with path.open('w') as file:
+        for _ in range(count // 10000):
+            file.write(line * 10000)
+    return count // 10000 * 10000
+
+
+def old_read(path, start, end):
+    with path.open('r') as file:
+        lines = file.readlines()
+    return ''.join(lines[start:end])
+
+
+def old_edit(path, inserts):
+    with path.open('r') as file:
+        lines = file.readlines()
+    lines = reference_insert(lines, inserts)
+    with path.open('w') as file:
+        file.writelines(lines)
+
+
+def test_range_reads_and_bulk_edits(tmp_path):
+    path = tmp_path / 'doc.txt'
+    lines = write_benchmark_document(path, BENCHMARK_MB)
+    rng = random.Random(0)
+    ranges = [
+        (start, start + 50)
+        for start in (rng.randrange(lines - 50) for _ in range(20))
+    ]
+    edits = [
+        {rng.randrange(1, lines): f'edit {i}-{j}' for j in range(10)}
+        for i in range(5)
+    ]
+
+    began = time.perf_counter()
+    expected = [old_read(path, start, end) for start, end in ranges[:3]]
+    old_read_time = (time.perf_counter() - began) / 3
+    began = time.perf_counter()
+    old_edit(path, edits[0])
+    old_edit_time = time.perf_counter() - began
+
+    with DocumentStore(tmp_path) as store:
+        began = time.perf_counter()
+        store.line_count('doc.txt')
+        index_time = time.perf_counter() - began
+        began = time.perf_counter()
+        read = [store.read('doc.txt', start, end) for start, end in ranges]
+        read_time = (time.perf_counter() - began) / len(ranges)
+        began = time.perf_counter()
+        for inserts in edits[1:]:
+            store.insert('doc.txt', inserts)
+        edit_time = (time.perf_counter() - began) / len(edits[1:])
+        assert store.line_count('doc.txt') == lines + 10 * len(edits)
+
+    print(
+        f'\n{BENCHMARK_MB}MB, {lines} lines: index built in '
+        f'{index_time * 1e3:.0f}ms; 50 line read {read_time * 1e6:.0f}us '
+        f'(readlines {old_read_time * 1e3:.0f}ms); 10 inserts '
+        f'{edit_time * 1e3:.0f}ms (readlines and rewrite '
+        f'{old_edit_time * 1e3:.0f}ms)'
+    )
+    # The old edit shifted the earlier reads by at most ten lines.
+    assert [r.count('\n') for r in read[:3]] == [
+        e.count('\n') for e in expected
+    ]
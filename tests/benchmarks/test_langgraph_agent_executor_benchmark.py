@@ -0,0 +1,39 @@
+"""Time to first byte of the LangGraph agent executor's token stream"""
+
+import time
+
+import pytest
+
+from a2a.types import TaskArtifactUpdateEvent
+from test_langgraph_agent_executor import COMPLETED, ScriptedAgent, run
+
+
+pytestmark = pytest.mark.benchmark
+
+TOKEN_DELAY = 0.01
+NUM_TOKENS = 30
+
+
+class TimedLog(list):
+    """Logs when each entry is added."""
+
+    def append(self, entry):
+        super().append((time.monotonic(), entry))
+
+
+def test_token_stream():
+    agent = ScriptedAgent([TOKEN_DELAY] * NUM_TOKENS, COMPLETED)
+    agent.log = TimedLog()
+    began = time.monotonic()
+    queue = run(agent, stream_tokens=True, flush_interval=0.05)
+
+    chunks = queue.artifact_chunks()[:-1]
+    first_byte = next(
+        t for t, e in agent.log if isinstance(e, TaskArtifactUpdateEvent)
+    )
+    completed = agent.log[-1][0]
+    print(
+        f'\n{len(chunks)} chunks for {NUM_TOKENS} tokens, first byte after '
+        f'{(first_byte - began) * 1e3:.0f}ms, completed after '
+        f'{(completed - began) * 1e3:.0f}ms'
+    )
@@ -0,0 +1,46 @@
+"""Concurrent sessions of the LangGraph currency agent"""
+
+import asyncio
+import time
+
+import pytest
+
+from test_langgraph_currency_agent import LATENCY, agent, converse  # noqa: F401
+
+
+pytestmark = pytest.mark.benchmark
+
+NUM_SESSIONS = 50
+
+
+def test_concurrent_sessions(agent):
+    async def run():
+        # Ticks stop whenever a session blocks the event loop.
+        gaps = []
+
+        async def heartbeat():
+            last = time.perf_counter()
+            while True:
+                await asyncio.sleep(0.01)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+        ticker = asyncio.create_task(heartbeat())
+        began = time.perf_counter()
+        await asyncio.gather(
+            *(converse(agent, f'session-{i}') for i in range(NUM_SESSIONS))
+        )
+        elapsed = time.perf_counter() - began
+        ticker.cancel()
+        return elapsed, max(gaps)
+
+    elapsed, max_gap = asyncio.run(run())
+    # Each session waits on two model calls and the structured response,
+    # the rate table is fetched once for all of them.
+    serial = NUM_SESSIONS * 3 * LATENCY
+    print(
+        f'\n{NUM_SESSIONS} sessions in {elapsed:.2f}s '
+        f'({serial:.1f}s if served one at a time), '
+        f'longest event loop stall {max_gap * 1e3:.0f}ms'
+    )
@@ -0,0 +1,88 @@
+"""Memory and resume latency of the SQLite LangGraph checkpointer"""
+
+import os
+import random
+import time
+import tracemalloc
+
+import pytest
+
+from langgraph.checkpoint.memory import MemorySaver
+from test_sqlite_checkpointer import converse, make_graph
+
+from common.utils.sqlite_checkpointer import SqliteCheckpointSaver
+
+
+pytestmark = pytest.mark.benchmark
+
+# The thread count, set CHECKPOINT_BENCHMARK_THREADS=100000 for the full
+# comparison.
+BENCHMARK_THREADS = int(os.environ.get('CHECKPOINT_BENCHMARK_THREADS', 2000))
+
+
+class RecordingSaver(MemorySaver):
+    """Records the calls a real conversation makes to its checkpointer."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        self.calls.append(('put', config, checkpoint, metadata, new_versions))
+        return super().put(config, checkpoint, metadata, new_versions)
+
+    def put_writes(self, config, writes, task_id, task_path=''):
+        self.calls.append(('put_writes', config, writes, task_id, task_path))
+        return super().put_writes(config, writes, task_id, task_path)
+
+
+def record_conversation(turns: int = 3) -> list[tuple]:
+    recorder = RecordingSaver()
+    converse(make_graph(recorder), 'recorded', turns)
+    return recorder.calls
+
+
+def fill(saver, threads: int, calls: list[tuple]) -> float:
+    """Replays a conversation on many threads, returns Python heap use."""
+    tracemalloc.start()
+    for i in range(threads):
+        thread_id = f'thread-{i}'
+        for method, config, *args in calls:
+            configurable = {**config['configurable'], 'thread_id': thread_id}
+            getattr(saver, method)({'configurable': configurable}, *args)
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return used
+
+
+def resume_latency(saver, threads: int, samples: int = 500) -> float:
+    """Mean time to load the latest checkpoint of a random thread."""
+    ids = random.sample(range(threads), min(samples, threads))
+    began = time.perf_counter()
+    for i in ids:
+        saver.get_tuple({'configurable': {'thread_id': f'thread-{i}'}})
+    return (time.perf_counter() - began) / len(ids)
+
+
+def test_memory_and_resume_latency_against_memory_saver(tmp_path):
+    threads = BENCHMARK_THREADS
+    calls = record_conversation()
+    memory = MemorySaver()
+    memory_used = fill(memory, threads, calls)
+    memory_resume = resume_latency(memory, threads)
+    del memory
+
+    sqlite = SqliteCheckpointSaver(
+        str(tmp_path / 'benchmark.db'), max_checkpoints=2
+    )
+    sqlite_used = fill(sqlite, threads, calls)
+    sqlite_resume = resume_latency(sqlite, threads)
+    size = os.path.getsize(tmp_path / 'benchmark.db')
+    sqlite.close()
+
+    print(
+        f'\n{threads} threads: MemorySaver {memory_used / 2**20:.1f}MiB heap, '
+        f'resume {memory_resume * 1e6:.0f}us; SqliteCheckpointSaver '
+        f'{sqlite_used / 2**20:.1f}MiB heap, {size / 2**20:.1f}MiB on disk, '
+        f'resume {sqlite_resume * 1e6:.0f}us'
+    )
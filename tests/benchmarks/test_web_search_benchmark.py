@@ -0,0 +1,33 @@
+"""Concurrent searches through the cached Tavily search service"""
+
+import asyncio
+import time
+
+import pytest
+
+from test_web_search import LATENCY, RecordedTavily, make_service
+
+
+pytestmark = pytest.mark.benchmark
+
+
+@pytest.mark.parametrize('max_concurrency', [1, 3, 8])
+def test_search_many(max_concurrency):
+    queries = [f'service {i}' for i in range(8)]
+    api = RecordedTavily(latency=LATENCY)
+    service = make_service(api, max_concurrency=max_concurrency)
+
+    async def run():
+        began = time.perf_counter()
+        await service.search_many(queries)
+        cold = time.perf_counter() - began
+        began = time.perf_counter()
+        await service.search_many(queries)
+        return cold, time.perf_counter() - began
+
+    cold, warm = asyncio.run(run())
+    print(
+        f'\n{len(queries)} queries at most {max_concurrency} at a time: '
+        f'{cold * 1e3:.0f}ms ({len(queries) * LATENCY * 1e3:.0f}ms one '
+        f'after the other), {warm * 1e3:.2f}ms cached'
+    )
@@ -0,0 +1,139 @@
+"""Test cases for the host agent's AgentRouter"""
+
+import pytest
+
+from a2a.types import AgentCapabilities, AgentCard, AgentSkill
+from hosts.multiagent.agent_router import AgentRouter, tokenize
+
+
+# Agent name -> (description, tags, examples), with the overlaps a real
+# catalog has: hotels and flights for travel and for expense claims, costs
+# for the cloud bill and for reimbursements, reports for documents and for
+# cloud costs.
+CATALOG = {
+    'currency_agent': (
+        'Converts amounts between currencies with live exchange rates',
+        ['currency', 'exchange', 'conversion', 'forex', 'usd', 'eur', 'jpy'],
+        ['What is the USD to EUR exchange rate?', 'Convert 100 USD to JPY'],
+    ),
+    'weather_agent': (
+        'Gives current weather conditions and forecasts for a city',
+        ['weather', 'forecast', 'temperature', 'rain', 'wind'],
+        ['Will it rain in Seoul tomorrow?', 'How cold is it in Busan?'],
+    ),
+    'travel_agent': (
+        'Books flights and hotels and plans trip itineraries',
+        ['travel', 'flight', 'hotel', 'booking', 'itinerary'],
+        ['Book a flight from Seoul to Tokyo', 'Find a hotel near the airport'],
+    ),
+    'cloud_cost_agent': (
+        'Reports AWS cloud costs by service, region and usage type',
+        ['aws', 'cloud', 'cost', 'billing', 'usage', 'region'],
+        ['What did EC2 cost last month?', 'Show our AWS bill by region'],
+    ),
+    'reimbursement_agent': (
+        'Files employee expense claims so that costs paid out of pocket are'
+        ' refunded',
+        ['reimbursement', 'expense', 'receipt', 'claim', 'refund'],
+        ['Reimburse my taxi receipt', 'File a claim for a business dinner'],
+    ),
+    'doc_writer_agent': (
+        'Writes and edits documents and reports in markdown',
+        ['document', 'writing', 'editing', 'markdown', 'report'],
+        ['Draft a report on the quarterly results', 'Edit the intro section'],
+    ),
+    'research_agent': (
+        'Searches the web and summarizes what the sources say',
+        ['search', 'web', 'research', 'sources', 'summary'],
+        ['Find recent articles about fusion energy', 'Research competitors'],
+    ),
+    'image_agent': (
+        'Generates images and pictures from a text description',
+        ['image', 'picture', 'drawing', 'generate', 'png'],
+        ['Draw a cat wearing a hat', 'Generate a logo for a coffee shop'],
+    ),
+    'calendar_agent': (
+        'Schedules meetings, sends invites and sets reminders',
+        ['calendar', 'meeting', 'schedule', 'invite', 'reminder'],
+        ['Set up a meeting with the team on Friday', 'Remind me at 3pm'],
+    ),
+}
+
+
+def make_card(name: str) -> AgentCard:
+    description, tags, examples = CATALOG[name]
+    return AgentCard(
+        name=name,
+        description=description,
+        url='http://localhost:10000',
+        version='1.0.0',
+        capabilities=AgentCapabilities(streaming=True),
+        defaultInputModes=['text'],
+        defaultOutputModes=['text'],
+        skills=[
+            AgentSkill(
+                id=name,
+                name=name.replace('_', ' '),
+                description=description,
+                tags=tags,
+                examples=examples,
+            )
+        ],
+    )
+
+
+@pytest.fixture
+def router() -> AgentRouter:
+    router = AgentRouter()
+    for name in CATALOG:
+        router.add(make_card(name))
+    return router
+
+
+# --- Test Cases ---
+
+
+@pytest.mark.parametrize(
+    'query, expected',
+    [
+        ("How much is 250 USD in euros at today's rate?", 'currency_agent'),
+        ('Should I bring an umbrella, is rain expected?', 'weather_agent'),
+        ('I need a hotel and a flight for my trip to Osaka', 'travel_agent'),
+        ('Which region made our AWS bill go up?', 'cloud_cost_agent'),
+        ('What was the cost of S3 usage last month?', 'cloud_cost_agent'),
+        (
+            'I paid for a hotel on a business trip, how do I get refunded?',
+            'reimbursement_agent',
+        ),
+        ('Put together a markdown report on last quarter', 'doc_writer_agent'),
+        (
+            'Look up what sources on the web say about solid state batteries',
+            'research_agent',
+        ),
+        ('Make a picture of a dog surfing', 'image_agent'),
+        ('Invite the design team to a meeting next Tuesday', 'calendar_agent'),
+    ],
+)
+def test_paraphrased_queries_route_to_the_right_agent(router, query, expected):
+    """Queries in the user's own words, not the card's, rank its agent first."""
+    ranked = router.search(query, 3)
+    assert ranked[0][0] == expected
+    assert len(ranked) <= 3
+
+
+def test_function_words_do_not_match():
+    """Queries sharing only function words with the cards match nothing."""
+    router = AgentRouter()
+    router.add(make_card('reimbursement_agent'))
+    assert tokenize('What is the rate of a USD?') == ['rate', 'usd']
+    assert router.search('what is the status of my order', 5) == []
+    assert AgentRouter().search('currency', 5) == []
+
+
+def test_add_replaces_existing_card(router):
+    """Re-registering a card by name updates it in place."""
+    card = make_card('currency_agent')
+    card.skills[0].tags.append('bitcoin')
+    router.add(card)
+    assert len(router) == len(CATALOG)
+    assert router.search('bitcoin', 5)[0][0] == card.name
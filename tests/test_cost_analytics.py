@@ -0,0 +1,90 @@
+"""Test cases for the FitCloud cost analytics"""
+
+import json
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from agents.langgraph.agent.cost_analytics import (
+    CostAnalytics,
+    normalize_records,
+)
+
+
+FEE_JSON = (
+    Path(__file__).parents[1]
+    / 'samples/python/agents/langgraph/agent/fee.json'
+)
+
+
+@pytest.fixture(scope='module')
+def records() -> list[dict]:
+    return json.loads(FEE_JSON.read_text())
+
+
+def test_rollups_match_pandas(records):
+    costs = CostAnalytics()
+    assert costs.load({'body': records}) == ['202505']
+    summary = costs.summary('202505')
+
+    df = pd.DataFrame(records)
+    df['usage_fee'] = pd.to_numeric(df['usage_fee'])
+    assert summary.total_fee == pytest.approx(df['usage_fee'].sum())
+    assert summary.line_items == len(records)
+    assert summary.currency_code == 'USD'
+    for rollup, key in [
+        (summary.by_service, 'service_name'),
+        (summary.by_region, 'product_region_name'),
+        (summary.by_usage_type, 'usage_type'),
+    ]:
+        expected = df.groupby(key)['usage_fee'].sum()
+        assert rollup == pytest.approx(expected.to_dict())
+        fees = list(rollup.values())
+        assert fees == sorted(fees, reverse=True)
+    assert sum(row['usage_fee'] for row in summary.breakdown) == pytest.approx(
+        summary.total_fee
+    )
+    assert 'Elastic Compute Cloud' in summary.report()
+
+
+def test_records_are_normalized_once_per_field(records):
+    frame = normalize_records(records)
+
+    assert len(frame.columns) == 14
+    assert 'usageFee' not in frame
+    assert frame['usage_fee'].dtype == 'float64'
+    assert frame['service_name'].dtype == 'category'
+    # camelCase copies fill in missing snake_case fields.
+    camel_only = {'billingPeriod': '202506', 'usageFee': '1.5'}
+    frame = normalize_records([camel_only, {'usage_fee': 'n/a'}])
+    assert frame['billing_period'][0] == '202506'
+    assert frame['usage_fee'][0] == 1.5
+    assert pd.isna(frame['usage_fee'][1])
+
+
+def test_summaries_are_cached_per_period(records):
+    costs = CostAnalytics()
+    may = [{**r, 'billing_period': '202505'} for r in records]
+    june = [{**r, 'billing_period': '202506', 'usage_fee': '1'} for r in records]
+    costs.load(may)
+    costs.load(june)
+
+    summaries = costs.summaries()
+    assert list(summaries) == ['202505', '202506']
+    assert summaries['202506'].total_fee == len(records)
+    assert costs.summary('202505') is summaries['202505']
+
+    # The same records loaded again keep the cached summary.
+    costs.load(june)
+    assert costs.summary('202506') is summaries['202506']
+    assert len(costs.frame) == 2 * len(records)
+
+    # Loading a period again replaces its records and its summary only.
+    costs.load([{**r, 'usage_fee': '2'} for r in june])
+    assert len(costs.frame) == 2 * len(records)
+    assert costs.summary('202505') is summaries['202505']
+    assert costs.summary('202506').total_fee == 2 * len(records)
+    with pytest.raises(KeyError):
+        costs.summary('202507')
@@ -0,0 +1,247 @@
+"""Test cases for the FitCloud cost warehouse against a local API stub"""
+
+import datetime
+import json
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import pytest
+import requests
+
+from agents.langgraph.agent.cost_warehouse import (
+    CostWarehouse,
+    FitCloudClient,
+)
+
+
+SERVICES = {
+    'Elastic Compute Cloud': ('Asia Pacific (Seoul)', 'APN2-BoxUsage:t3.small'),
+    'Amazon OpenSearch Service': ('US East (N. Virginia)', 'USE1-IndexingOCU'),
+    'Virtual Private Cloud': ('Asia Pacific (Seoul)', 'APN2-PublicIPv4'),
+}
+
+
+def fee(day: datetime.date, service: str) -> float:
+    """A fee that differs by day and service, so sums can be checked."""
+    return day.day + len(service) / 100
+
+
+def day_records(day: datetime.date) -> list[dict]:
+    records = []
+    for service, (region, usage_type) in SERVICES.items():
+        # Line items split in two, with the camelCase copies FitCloud sends.
+        for part in (0.25, 0.75):
+            records.append(
+                {
+                    'billing_period': f'{day:%Y%m}',
+                    'service_name': service,
+                    'serviceName': service,
+                    'product_region_name': region,
+                    'productRegionName': region,
+                    'usage_type': usage_type,
+                    'usageType': usage_type,
+                    'usage_fee': str(fee(day, service) * part),
+                    'usageFee': str(fee(day, service) * part),
+                    'usage_amount': '1.0',
+                    'currency_code': 'USD',
+                }
+            )
+    return records
+
+
+class FitCloudStub(BaseHTTPRequestHandler):
+    """Serves the daily costs endpoint, one day per request.
+
+    Counts the requests it serves at once.
+    """
+
+    requests: list[tuple[str, str]] = []
+    latency = 0.0
+    failing_days: set[str] = set()
+    active = 0
+    max_active = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        length = int(self.headers['Content-Length'])
+        form = parse_qs(self.rfile.read(length).decode())
+        first, last = form['from'][0], form['to'][0]
+        stub = type(self)
+        with stub.lock:
+            stub.requests.append((first, last))
+            stub.active += 1
+            stub.max_active = max(stub.max_active, stub.active)
+        time.sleep(self.latency)
+        with stub.lock:
+            stub.active -= 1
+        if self.path != '/api/v1/costs/ondemand/corp/daily' or (
+            self.headers['Authorization'] != 'Bearer test-token'
+        ):
+            self.send_error(404)
+            return
+        if first in self.failing_days:
+            self.send_error(503)
+            return
+        day = datetime.datetime.strptime(first, '%Y%m%d').date()
+        body = json.dumps({'body': day_records(day)}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def api():
+    FitCloudStub.requests = []
+    FitCloudStub.latency = 0.0
+    FitCloudStub.failing_days = set()
+    FitCloudStub.max_active = 0
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FitCloudStub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield FitCloudStub, f'http://127.0.0.1:{server.server_port}/api/v1'
+    server.shutdown()
+    server.server_close()
+
+
+def make_warehouse(url: str, path: str = ':memory:', **kwargs):
+    return CostWarehouse(
+        path, client=FitCloudClient('test-token', base_url=url), **kwargs
+    )
+
+
+def expected_total(days) -> float:
+    return sum(fee(day, service) for day in days for service in SERVICES)
+
+
+def may(first: int, last: int) -> list[datetime.date]:
+    return [datetime.date(2025, 5, d) for d in range(first, last + 1)]
+
+
+def test_repeated_question_is_answered_locally(api):
+    stub, url = api
+    stub.latency = 0.02
+    warehouse = make_warehouse(url)
+
+    first = warehouse.costs('20250501', '20250531', 'month')
+    second = warehouse.costs('202505', '202505', 'month')
+
+    assert len(stub.requests) == 31
+    assert warehouse.upstream_calls == 31
+    assert first == second
+    month = second['2025-05']
+    assert month['total_fee'] == pytest.approx(expected_total(may(1, 31)))
+    assert list(month['by_service'])[0] == 'Amazon OpenSearch Service'
+    # Days are fetched several at a time.
+    assert stub.max_active > 1
+
+
+def test_only_missing_days_are_fetched(api):
+    stub, url = api
+    warehouse = make_warehouse(url)
+
+    warehouse.costs('20250501', '20250510')
+    stub.requests.clear()
+    days = warehouse.costs('20250505', '20250515')
+
+    assert sorted(first for first, _ in stub.requests) == [
+        f'202505{d:02d}' for d in range(11, 16)
+    ]
+    assert list(days) == [f'2025-05-{d:02d}' for d in range(5, 16)]
+    assert days['2025-05-07']['total_fee'] == pytest.approx(
+        expected_total(may(7, 7))
+    )
+    day = datetime.date(2025, 5, 7)
+    assert days['2025-05-07']['by_region'] == pytest.approx(
+        {
+            'US East (N. Virginia)': fee(day, 'Amazon OpenSearch Service'),
+            'Asia Pacific (Seoul)': fee(day, 'Elastic Compute Cloud')
+            + fee(day, 'Virtual Private Cloud'),
+        }
+    )
+
+
+def test_weeks_and_months_cut_by_the_range(api):
+    _, url = api
+    warehouse = make_warehouse(url)
+    warehouse.costs('20250401', '20250630')
+
+    # 2025-05-14 is a Wednesday, so its week is cut at both ends.
+    weeks = warehouse.costs('20250514', '20250601', 'week')
+    assert list(weeks) == ['2025-05-12', '2025-05-19', '2025-05-26']
+    assert weeks['2025-05-12']['total_fee'] == pytest.approx(
+        expected_total(may(14, 18))
+    )
+    assert weeks['2025-05-19']['total_fee'] == pytest.approx(
+        expected_total(may(19, 25))
+    )
+    assert weeks['2025-05-26']['total_fee'] == pytest.approx(
+        expected_total(may(26, 31) + [datetime.date(2025, 6, 1)])
+    )
+    months = warehouse.costs('20250510', '20250630', 'month')
+    assert months['2025-05']['total_fee'] == pytest.approx(
+        expected_total(may(10, 31))
+    )
+    june = [datetime.date(2025, 6, d) for d in range(1, 31)]
+    assert months['2025-06']['total_fee'] == pytest.approx(expected_total(june))
+
+
+def test_fetched_days_survive_a_restart(api, tmp_path):
+    stub, url = api
+    path = str(tmp_path / 'costs.db')
+    with make_warehouse(url, path) as warehouse:
+        warehouse.costs('20250501', '20250507', 'week')
+    stub.requests.clear()
+
+    with make_warehouse(url, path) as warehouse:
+        weeks = warehouse.costs('20250505', '20250511', 'week')
+        warehouse.costs('20250501', '20250507', 'day')
+    assert sorted(stub.requests) == [
+        (f'202505{d:02d}', f'202505{d:02d}') for d in range(8, 12)
+    ]
+    assert weeks['2025-05-05']['total_fee'] == pytest.approx(
+        expected_total(may(5, 11))
+    )
+
+
+def test_recent_days_are_fetched_again(api):
+    stub, url = api
+    warehouse = make_warehouse(url, settle_days=3, recent_ttl=0)
+    today = datetime.date.today()
+    start = today - datetime.timedelta(days=6)
+
+    warehouse.costs(f'{start:%Y%m%d}', f'{today:%Y%m%d}')
+    stub.requests.clear()
+    warehouse.costs(f'{start:%Y%m%d}', f'{today:%Y%m%d}')
+
+    assert len(stub.requests) == 3
+    # Days to come are not requested.
+    stub.requests.clear()
+    later = today + datetime.timedelta(days=9)
+    warehouse.costs(f'{today:%Y%m%d}', f'{later:%Y%m%d}')
+    assert len(stub.requests) == 1
+
+
+def test_days_fetched_before_a_failure_are_kept(api):
+    stub, url = api
+    stub.failing_days = {'20250503'}
+    warehouse = make_warehouse(url)
+
+    with pytest.raises(requests.HTTPError):
+        warehouse.costs('20250501', '20250505')
+    stub.failing_days = set()
+    stub.requests.clear()
+    days = warehouse.costs('20250501', '20250505')
+    # Only the failed day is asked for again.
+    assert stub.requests == [('20250503', '20250503')]
+    assert len(days) == 5
+    assert days['2025-05-03']['total_fee'] == pytest.approx(
+        expected_total(may(3, 3))
+    )
@@ -0,0 +1,156 @@
+"""Test cases for the BM25 index over parsed documents"""
+
+import random
+import re
+
+from agents.llama_index_file_chat.document_index import (
+    DocumentIndex,
+    cited_lines,
+    line_tag,
+    tokenize,
+)
+
+
+WORDS = (
+    'model layer attention training data loss encoder decoder results table '
+    'figure section method baseline accuracy sequence token batch learning '
+    'rate optimizer gradient network parameters evaluation experiment'
+).split()
+
+
+def full_prompt(lines: list[str]) -> str:
+    """The document as the chat step used to put it in every prompt."""
+    return ''.join(line_tag(idx, line) for idx, line in enumerate(lines))
+
+
+def find_cited_lines(document_text: str, line_numbers: list[int]) -> list[str]:
+    """The lookup the chat step used to make in the tagged document."""
+    texts = []
+    for line_number in line_numbers:
+        start_idx = document_text.find(f"<line idx='{line_number}'>")
+        end_idx = document_text.find(f"<line idx='{line_number + 1}'>")
+        texts.append(
+            document_text[
+                start_idx + len(f"<line idx='{line_number}'>") : end_idx
+            ]
+            .replace('</line>', '')
+            .strip()
+        )
+    return texts
+
+
+def shown_lines(text: str) -> dict[int, str]:
+    return {
+        int(idx): line
+        for idx, line in re.findall(r"<line idx='(\d+)'>(.*)</line>", text)
+    }
+
+
+def synthetic_document(line_count: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    return [
+        ' '.join(rng.choice(WORDS) for _ in range(rng.randint(4, 20)))
+        for _ in range(line_count)
+    ]
+
+
+def test_chunks_hold_whole_lines():
+    lines = [f'line {i} ' + 'x' * 30 for i in range(100)]
+    index = DocumentIndex(lines, chunk_chars=200)
+
+    assert index.starts[0] == 0
+    assert index.starts[-1] == len(lines)
+    assert all(index.starts[1:] > index.starts[:-1])
+    for chunk in range(index.chunk_count):
+        first, last = index.starts[chunk], index.starts[chunk + 1]
+        assert sum(len(line) + 1 for line in lines[first:last]) <= 200
+    # A line longer than a chunk gets a chunk of its own.
+    index = DocumentIndex(['short', 'y' * 500, 'short'], chunk_chars=200)
+    assert index.starts.tolist() == [0, 1, 2, 3]
+
+
+def test_search_ranks_by_bm25():
+    lines = synthetic_document(400)
+    lines[123] = 'The warmup schedule uses 4000 warmup steps'
+    lines[321] = 'Dropout of 0.1 is applied after every warmup'
+    index = DocumentIndex(lines, chunk_chars=500)
+
+    scores = index.scores('How many warmup steps?')
+    best = int(scores.argmax())
+    assert index.starts[best] <= 123 < index.starts[best + 1]
+    assert (scores > 0).sum() == 2
+    chunks = index.search('How many warmup steps?', max_chunks=1)
+    assert chunks == [best]
+    # Results come back in document order, not by score.
+    chunks = index.search('warmup dropout', max_chunks=4)
+    assert len(chunks) == 2
+    assert chunks == sorted(chunks)
+    assert tokenize('Warm-up, STEPS!') == ['warm', 'up', 'steps']
+
+
+def test_search_falls_back_to_the_start():
+    index = DocumentIndex(synthetic_document(400), chunk_chars=500)
+
+    assert index.search('zebra', max_chunks=3) == [0, 1, 2]
+    assert index.search('', max_chunks=3) == [0, 1, 2]
+    small = DocumentIndex(['only line'])
+    assert small.search('zebra') == [0]
+    assert DocumentIndex([]).search('zebra') == [0]
+
+
+def test_render_keeps_line_numbers():
+    lines = [f'line {i}' for i in range(30)]
+    index = DocumentIndex(lines, chunk_chars=40)
+    chunks = [1, 3]
+    text = index.render(chunks)
+
+    shown = shown_lines(text)
+    for chunk in chunks:
+        for idx in range(index.starts[chunk], index.starts[chunk + 1]):
+            assert shown.pop(idx) == lines[idx]
+    assert not shown
+    first = int(index.starts[1])
+    assert text.startswith(f"<omitted lines='0-{first - 1}'/>\n")
+    assert text.endswith(
+        f"<omitted lines='{index.starts[4]}-{len(lines) - 1}'/>\n"
+    )
+    assert index.render(range(index.chunk_count)) == full_prompt(lines)
+
+
+def test_prompt_holds_a_fraction_of_a_long_document():
+    lines = synthetic_document(5000)
+    needle = random.Random(1).randrange(len(lines))
+    lines[needle] = 'Label smoothing of 0.1 hurts perplexity but improves BLEU'
+    index = DocumentIndex(lines)
+
+    chunks = index.search('What label smoothing was used when training?')
+    prompt = index.render(chunks)
+    assert shown_lines(prompt)[needle] == lines[needle]
+    assert len(prompt) * 20 < len(full_prompt(lines))
+
+
+def test_cited_lines_match_the_tagged_document():
+    lines = ['  first  ', 'second', '', 'has </line> inside', 'last']
+    text = full_prompt(lines)
+    line_numbers = [0, 1, 2, 3, 4, 1]
+
+    assert cited_lines(lines, line_numbers) == find_cited_lines(
+        text, line_numbers
+    )
+    # Line numbers the document does not have are skipped.
+    assert cited_lines(lines, [-1, 4, 5]) == ['last']
+
+
+def test_citations_across_a_long_document():
+    lines = synthetic_document(5000)
+    text = full_prompt(lines)
+    rng = random.Random(2)
+    # Citations of one to three lines, spread over the document.
+    citations = [
+        [start + i for i in range(rng.randint(1, 3))]
+        for start in (rng.randrange(len(lines) - 3) for _ in range(50))
+    ]
+
+    assert [cited_lines(lines, numbers) for numbers in citations] == [
+        find_cited_lines(text, numbers) for numbers in citations
+    ]
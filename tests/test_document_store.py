@@ -0,0 +1,103 @@
+"""Test cases for the line-indexed document store"""
+
+import random
+
+import pytest
+
+from common.utils import document_store
+from common.utils.document_store import DocumentStore
+
+
+def reference_insert(lines: list[str], inserts: dict[int, str]) -> list[str]:
+    """The list based edit the document tools used to make."""
+    lines = list(lines)
+    for line_number, text in sorted(inserts.items()):
+        lines.insert(line_number - 1, text + '\n')
+    return lines
+
+
+@pytest.fixture
+def store(tmp_path):
+    with DocumentStore(tmp_path) as store:
+        yield store
+
+
+def test_read_ranges(store):
+    lines = [f'line {i}\n' for i in range(10)]
+    store.write('doc.txt', ''.join(lines))
+
+    assert store.line_count('doc.txt') == 10
+    assert store.read('doc.txt') == ''.join(lines)
+    assert store.read('doc.txt', 3, 6) == ''.join(lines[3:6])
+    assert store.read('doc.txt', 7) == ''.join(lines[7:])
+    assert store.read('doc.txt', -2) == ''.join(lines[-2:])
+    assert store.read('doc.txt', 8, 20) == ''.join(lines[8:20])
+    assert store.read('doc.txt', 6, 3) == ''
+
+
+def test_lines_without_final_newline_and_empty_documents(store):
+    store.write('doc.txt', '한국어\nlast')
+    store.write('empty.txt', '')
+
+    assert store.read('doc.txt', 1) == 'last'
+    assert store.line_count('empty.txt') == 0
+    assert store.read('empty.txt') == ''
+    store.insert('doc.txt', {3: 'after'})
+    store.insert('empty.txt', {1: 'first'})
+    assert store.read('doc.txt') == '한국어\nlast\nafter\n'
+    assert store.read('empty.txt') == 'first\n'
+
+
+def test_inserts_match_sequential_list_inserts(store):
+    rng = random.Random(0)
+    lines = [f'{i} ' * rng.randrange(5) + '\n' for i in range(200)]
+    store.write('doc.txt', ''.join(lines))
+
+    for _ in range(20):
+        inserts = {}
+        for _ in range(rng.randrange(1, 10)):
+            line_number = rng.randrange(1, len(lines) + 2)
+            inserts[line_number] = f'inserted at {line_number}'
+        # Keys past the end are only valid if the lines before fill up.
+        inserts = {
+            k: v for k, v in inserts.items() if k <= len(lines) + 1
+        }
+        lines = reference_insert(lines, inserts)
+        store.insert('doc.txt', inserts)
+        assert store.line_count('doc.txt') == len(lines)
+        assert store.read('doc.txt') == ''.join(lines)
+        start = rng.randrange(len(lines))
+        assert store.read('doc.txt', start, start + 5) == ''.join(
+            lines[start : start + 5]
+        )
+
+
+def test_out_of_range_insert_changes_nothing(store, tmp_path):
+    store.write('doc.txt', 'a\nb\n')
+
+    with pytest.raises(ValueError):
+        store.insert('doc.txt', {1: 'ok', 5: 'too far'})
+    assert (tmp_path / 'doc.txt').read_text() == 'a\nb\n'
+    # No temporary file is left behind.
+    assert {p.name for p in tmp_path.iterdir()} == {'doc.txt', '.doc.txt.lines'}
+
+
+def test_index_is_reused_across_stores(tmp_path, monkeypatch):
+    with DocumentStore(tmp_path) as store:
+        store.write('doc.txt', 'a\nb\nc\n')
+
+    def scan_lines(data, size):
+        raise AssertionError('the saved index was not used')
+
+    monkeypatch.setattr(document_store, 'scan_lines', scan_lines)
+    with DocumentStore(tmp_path) as store:
+        assert store.read('doc.txt', 1, 2) == 'b\n'
+
+
+def test_outside_changes_are_noticed(store, tmp_path):
+    store.write('doc.txt', 'a\nb\n')
+    assert store.read('doc.txt', 1) == 'b\n'
+
+    (tmp_path / 'doc.txt').write_text('x\ny\nz\n')
+    assert store.line_count('doc.txt') == 3
+    assert store.read('doc.txt', 1) == 'y\nz\n'
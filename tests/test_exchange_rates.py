@@ -0,0 +1,161 @@
+"""Test cases for the cached exchange rate service"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from common.utils.exchange_rates import ExchangeRateService
+
+
+TABLES = {
+    'USD': {'EUR': 0.88, 'GBP': 0.74, 'JPY': 143.5},
+    'EUR': {'USD': 1.14, 'GBP': 0.84, 'JPY': 163.1},
+}
+
+
+class StubRatesAPI:
+    """A local stand-in for Frankfurter that counts its requests."""
+
+    def __init__(self, latency: float = 0.0, failures: int = 0):
+        self.latency = latency
+        self.failures = failures
+        self.requests: list[httpx.URL] = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request.url)
+        await asyncio.sleep(self.latency)
+        if self.failures:
+            self.failures -= 1
+            return httpx.Response(503)
+        base = request.url.params['from']
+        if base not in TABLES:
+            return httpx.Response(404, json={'message': 'not found'})
+        date = request.url.path.strip('/')
+        return httpx.Response(
+            200,
+            json={
+                'amount': 1.0,
+                'base': base,
+                'date': '2025-06-02' if date == 'latest' else date,
+                'rates': TABLES[base],
+            },
+        )
+
+
+def make_service(api: StubRatesAPI, **kwargs) -> ExchangeRateService:
+    return ExchangeRateService(
+        base_url='http://rates.local',
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(api)),
+        **kwargs,
+    )
+
+
+def test_repeated_pair_is_fetched_once():
+    api = StubRatesAPI()
+    service = make_service(api)
+
+    async def run():
+        first = await service.get_rate('usd', 'eur')
+        second = await service.get_rate('USD', 'EUR')
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first == second
+    assert first['rates'] == {'EUR': 0.88}
+    assert first['date'] == '2025-06-02'
+    assert len(api.requests) == 1
+    # The whole table is requested, not one pair.
+    assert 'to' not in api.requests[0].params
+
+
+def test_cross_pair_uses_cached_table():
+    api = StubRatesAPI()
+    service = make_service(api)
+
+    async def run():
+        await service.get_rate('USD', 'EUR')
+        return await service.get_rate('GBP', 'JPY')
+
+    result = asyncio.run(run())
+    assert len(api.requests) == 1
+    assert result['base'] == 'GBP'
+    assert result['rates']['JPY'] == pytest.approx(143.5 / 0.74)
+
+
+def test_concurrent_requests_collapse_into_one_call():
+    api = StubRatesAPI(latency=0.05)
+    service = make_service(api)
+
+    async def run():
+        return await asyncio.gather(
+            *(service.get_rate('USD', 'GBP') for _ in range(20))
+        )
+
+    results = asyncio.run(run())
+    assert len(api.requests) == 1
+    assert all(r['rates'] == {'GBP': 0.74} for r in results)
+
+
+def test_latest_expires_before_historical():
+    api = StubRatesAPI()
+    service = make_service(api, latest_ttl=0, historical_ttl=3600)
+
+    async def run():
+        for _ in range(2):
+            await service.get_rate('USD', 'EUR')
+            await service.get_rate('USD', 'EUR', '2024-01-02')
+
+    asyncio.run(run())
+    paths = [url.path for url in api.requests]
+    assert paths == ['/latest', '/2024-01-02', '/latest']
+
+
+def test_failures_are_not_cached():
+    api = StubRatesAPI(failures=1)
+    service = make_service(api)
+
+    async def run():
+        with pytest.raises(httpx.HTTPStatusError):
+            await service.get_rate('USD', 'EUR')
+        return await service.get_rate('USD', 'EUR')
+
+    assert asyncio.run(run())['rates'] == {'EUR': 0.88}
+    assert len(api.requests) == 2
+
+
+def test_unknown_currency():
+    service = make_service(StubRatesAPI())
+
+    async def run():
+        with pytest.raises(ValueError):
+            await service.get_rate('USD', 'XYZ')
+        with pytest.raises(httpx.HTTPStatusError):
+            await service.get_rate('XYZ', 'USD')
+
+    asyncio.run(run())
+
+
+def test_each_event_loop_gets_its_own_client():
+    # Like the module-level service of the currency agent.
+    service = ExchangeRateService()
+
+    async def run():
+        client = service.http_client
+        assert service.http_client is client
+        await service.close()
+        return client
+
+    first = asyncio.run(run())
+    second = asyncio.run(run())
+    assert first is not second
+    assert first.is_closed and second.is_closed
+
+
+def test_cached_tables_outlive_the_loop():
+    api = StubRatesAPI()
+    service = make_service(api)
+
+    for _ in range(2):
+        asyncio.run(service.get_rate('USD', 'EUR'))
+    assert len(api.requests) == 1
@@ -0,0 +1,335 @@
+"""Test cases for the multiagent HostAgent against mocked remote agents"""
+
+import asyncio
+import json
+
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from a2a.types import (
+    AgentCapabilities,
+    AgentCard,
+    Task,
+    TaskArtifactUpdateEvent,
+    TaskStatusUpdateEvent,
+)
+from hosts.multiagent.host_agent import HostAgent, RemoteUpdate
+
+
+def make_card(name: str, streaming: bool = False) -> AgentCard:
+    return AgentCard(
+        name=name,
+        description=f'The {name} agent',
+        url=f'http://{name}/',
+        version='1.0.0',
+        capabilities=AgentCapabilities(streaming=streaming),
+        defaultInputModes=['text'],
+        defaultOutputModes=['text'],
+        skills=[],
+    )
+
+
+def card_handler(requested: list[str]):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(request.url.host)
+        if request.url.host == 'down':
+            raise httpx.ConnectError('refused')
+        return httpx.Response(
+            200, json=make_card(request.url.host).model_dump(mode='json')
+        )
+
+    return handler
+
+
+def sse(request_id: str, result: dict) -> bytes:
+    body = {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+    return f'data: {json.dumps(body)}\n\n'.encode()
+
+
+def streaming_agent(relayed: asyncio.Event, sent: list[str]):
+    """Streams an answer in two chunks, then its final status.
+
+    The final status is held back until the first chunk has been relayed,
+    so a host that only reports at the end never gets it.
+    """
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        request_id = json.loads(request.content)['id']
+        ids = {'taskId': 'task-1', 'contextId': 'context-1'}
+
+        async def events():
+            sent.append('task')
+            yield sse(
+                request_id,
+                {
+                    'kind': 'task',
+                    'id': 'task-1',
+                    'contextId': 'context-1',
+                    'status': {'state': 'working'},
+                },
+            )
+            for text, append in (('The rate ', False), ('is 1.08', True)):
+                sent.append(text)
+                yield sse(
+                    request_id,
+                    {
+                        'kind': 'artifact-update',
+                        **ids,
+                        'artifact': {
+                            'artifactId': 'answer',
+                            'parts': [{'kind': 'text', 'text': text}],
+                        },
+                        'append': append,
+                    },
+                )
+            await asyncio.wait_for(relayed.wait(), 1)
+            sent.append('completed')
+            yield sse(
+                request_id,
+                {
+                    'kind': 'status-update',
+                    **ids,
+                    'status': {'state': 'completed'},
+                    'final': True,
+                },
+            )
+
+        return httpx.Response(
+            200,
+            headers={'Content-Type': 'text/event-stream'},
+            content=events(),
+        )
+
+    return handler
+
+
+def tool_context() -> SimpleNamespace:
+    return SimpleNamespace(
+        state={'context_id': 'context-1'},
+        function_call_id='call-1',
+        actions=SimpleNamespace(skip_summarization=False, escalate=False),
+    )
+
+
+def task_tracker():
+    """A task callback keeping the task and its one streamed artifact."""
+    tracked: Task | None = None
+
+    def callback(event, card: AgentCard) -> Task:
+        nonlocal tracked
+        if isinstance(event, Task):
+            tracked = event
+        elif isinstance(event, TaskStatusUpdateEvent):
+            tracked.status = event.status
+        elif isinstance(event, TaskArtifactUpdateEvent):
+            artifact = event.artifact.model_copy(deep=True)
+            if event.append and tracked.artifacts:
+                artifact.parts = [*tracked.artifacts[0].parts, *artifact.parts]
+            tracked.artifacts = [artifact]
+        return tracked
+
+    return callback
+
+
+# --- Test Cases ---
+
+
+def test_create_resolves_cards_on_the_running_loop():
+    """create registers the cards before returning, with no loop of its own."""
+    requested = []
+
+    async def run():
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(card_handler(requested))
+        ) as client:
+            host = await HostAgent.create(
+                ['http://currency', 'http://weather', 'http://down'],
+                client,
+                card_retry_delay=60,
+            )
+            assert sorted(host.cards) == ['currency', 'weather']
+            assert 'currency' in host.agents
+            # Unreachable addresses are retried in the background.
+            assert len(host._background_tasks) == 1
+            for task in host._background_tasks:
+                task.cancel()
+
+    asyncio.run(run())
+    assert sorted(requested) == ['currency', 'down', 'weather']
+
+
+def test_constructor_defers_resolution_to_the_first_turn():
+    """The constructor sends nothing, the first instruction resolves once."""
+    requested = []
+
+    class Context:
+        state = {}
+        user_content = None
+
+    async def run():
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(card_handler(requested))
+        ) as client:
+            host = HostAgent(['http://currency'], client)
+            assert requested == []
+            assert host.cards == {}
+            instruction = await host.root_instruction(Context())
+            assert 'currency' in instruction
+            await host.root_instruction(Context())
+
+    asyncio.run(run())
+    assert requested == ['currency']
+
+
+def test_send_message_relays_parts_before_the_task_is_done():
+    """part_callback sees each chunk while the remote task still works."""
+    updates = []
+
+    async def run():
+        relayed = asyncio.Event()
+        sent = []
+
+        async def part_callback(agent_name, update, context):
+            updates.append((agent_name, update, list(sent)))
+            relayed.set()
+
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(streaming_agent(relayed, sent))
+        ) as client:
+            host = HostAgent(
+                [], client, task_tracker(), part_callback=part_callback
+            )
+            host.register_agent_card(make_card('currency', streaming=True))
+            context = tool_context()
+            response = await host.send_message(
+                'currency', 'How many euros is a dollar?', context
+            )
+        return response, context
+
+    response, context = asyncio.run(run())
+    assert [(name, update) for name, update, _ in updates] == [
+        ('currency', RemoteUpdate(['The rate '])),
+        ('currency', RemoteUpdate(['is 1.08'], append=True)),
+    ]
+    # The agent only completes once the first chunk has reached the caller.
+    assert 'completed' not in updates[0][2]
+    # The tool still returns the finished task's output.
+    assert response == ['The rate ', 'is 1.08']
+    assert context.state['task_id'] == 'task-1'
+    assert context.state['session_active'] is False
+
+
+def test_stream_message_yields_updates_in_order():
+    """stream_message yields each update, then applies the final state."""
+
+    async def run():
+        relayed = asyncio.Event()
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(streaming_agent(relayed, []))
+        ) as client:
+            host = HostAgent([], client, task_tracker())
+            host.register_agent_card(make_card('currency', streaming=True))
+            context = tool_context()
+            updates = []
+            async for update in host.stream_message(
+                'currency', 'How many euros is a dollar?', context
+            ):
+                updates.append(update)
+                relayed.set()
+        return updates, context
+
+    updates, context = asyncio.run(run())
+    assert [update.parts for update in updates] == [['The rate '], ['is 1.08']]
+    assert context.state['session_active'] is False
+
+
+def test_unfinished_tasks_are_polled():
+    """A task returned while still working is polled until it completes."""
+    methods = []
+    updates = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        methods.append(body['method'])
+        task = {
+            'kind': 'task',
+            'id': 'task-1',
+            'contextId': 'context-1',
+            'status': {'state': 'working'},
+        }
+        if methods.count('tasks/get') == 3:
+            task['status'] = {'state': 'completed'}
+            task['artifacts'] = [
+                {
+                    'artifactId': 'answer',
+                    'parts': [{'kind': 'text', 'text': 'The rate is 1.08'}],
+                }
+            ]
+        return httpx.Response(
+            200, json={'jsonrpc': '2.0', 'id': body['id'], 'result': task}
+        )
+
+    async def part_callback(agent_name, update, context):
+        updates.append(update)
+
+    async def run():
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        ) as client:
+            host = HostAgent(
+                [],
+                client,
+                task_tracker(),
+                part_callback=part_callback,
+                task_poll_interval=0.01,
+            )
+            host.register_agent_card(make_card('currency'))
+            context = tool_context()
+            response = await host.send_message(
+                'currency', 'How many euros is a dollar?', context
+            )
+        return response, context
+
+    response, context = asyncio.run(run())
+    assert methods == ['message/send'] + ['tasks/get'] * 3
+    # Unchanged polls are not relayed again.
+    assert updates == [RemoteUpdate(['The rate is 1.08'])]
+    assert response == ['The rate is 1.08']
+    assert context.state['session_active'] is False
+
+
+def test_polling_gives_up_after_the_timeout():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        return httpx.Response(
+            200,
+            json={
+                'jsonrpc': '2.0',
+                'id': body['id'],
+                'result': {
+                    'kind': 'task',
+                    'id': 'task-1',
+                    'contextId': 'context-1',
+                    'status': {'state': 'working'},
+                },
+            },
+        )
+
+    async def run():
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        ) as client:
+            host = HostAgent(
+                [],
+                client,
+                task_tracker(),
+                task_poll_interval=0.01,
+                task_poll_timeout=0.1,
+            )
+            host.register_agent_card(make_card('currency'))
+            await host.send_message('currency', 'Hello', tool_context())
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(run())
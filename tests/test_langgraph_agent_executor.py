@@ -0,0 +1,149 @@
+"""Test cases for token streaming in the LangGraph agent executor"""
+
+import asyncio
+
+from a2a.server.agent_execution import RequestContext
+from a2a.types import (
+    Message,
+    MessageSendParams,
+    Part,
+    Role,
+    TaskArtifactUpdateEvent,
+    TaskState,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+from agents.langgraph.agent_executor import LangGraphAgentExecutor
+
+
+NUM_TOKENS = 30
+
+
+class ScriptedAgent:
+    """Streams a status update, tokens with pauses, then a response.
+
+    Each token is logged as it is yielded, next to the queued events.
+    """
+
+    def __init__(self, pauses: list[float], final: dict):
+        self.pauses = pauses
+        self.final = final
+        self.log: list = []
+
+    async def stream(self, query, session_id, stream_tokens=False):
+        yield {
+            'is_task_complete': False,
+            'require_user_input': False,
+            'content': 'Looking up the exchange rates...',
+        }
+        for i, pause in enumerate(self.pauses):
+            await asyncio.sleep(pause)
+            if stream_tokens:
+                self.log.append(f'token {i}')
+                yield {
+                    'is_task_complete': False,
+                    'require_user_input': False,
+                    'content': f'{i} ',
+                    'is_token': True,
+                }
+        yield self.final
+
+
+class RecordingQueue:
+    """Records the events in the order they are enqueued."""
+
+    def __init__(self, log: list):
+        self.log = log
+        self.events: list = []
+
+    def enqueue_event(self, event):
+        self.log.append(event)
+        self.events.append(event)
+
+    def artifact_chunks(self) -> list[TaskArtifactUpdateEvent]:
+        return [
+            e for e in self.events if isinstance(e, TaskArtifactUpdateEvent)
+        ]
+
+
+COMPLETED = {
+    'is_task_complete': True,
+    'require_user_input': False,
+    'content': 'The rate is 0.88',
+}
+
+
+def run(agent, **kwargs) -> RecordingQueue:
+    context = RequestContext(
+        request=MessageSendParams(
+            message=Message(
+                role=Role.user,
+                parts=[Part(root=TextPart(text='USD to EUR?'))],
+                messageId='message-1',
+                contextId='context-1',
+            )
+        )
+    )
+    queue = RecordingQueue(agent.log)
+    executor = LangGraphAgentExecutor(agent, **kwargs)
+    asyncio.run(executor.execute(context, queue))
+    return queue
+
+
+def test_tokens_are_coalesced_into_appended_chunks():
+    agent = ScriptedAgent([0] * NUM_TOKENS, COMPLETED)
+    # No flush falls due, so the tokens after the first are sent together.
+    queue = run(agent, stream_tokens=True, flush_interval=60)
+
+    *chunks, final = queue.artifact_chunks()
+    # The first token goes out at once, the rest are coalesced.
+    assert agent.log.index(chunks[0]) < agent.log.index('token 1')
+    assert [c.artifact.parts[0].root.text for c in chunks] == [
+        '0 ',
+        ''.join(f'{i} ' for i in range(1, NUM_TOKENS)),
+    ]
+    assert [c.append for c in chunks] == [False, True]
+    assert not any(c.lastChunk for c in chunks)
+    assert len({c.artifact.artifactId for c in [*chunks, final]}) == 1
+    # The response replaces the streamed tokens.
+    assert final.append is False
+    assert final.lastChunk is True
+    assert final.artifact.parts[0].root.text == 'The rate is 0.88'
+    assert queue.events[-1].status.state == TaskState.completed
+
+
+def test_buffered_tokens_are_flushed_while_the_model_stalls():
+    agent = ScriptedAgent([0, 0, 0.3], COMPLETED)
+    queue = run(agent, stream_tokens=True, flush_interval=0.05)
+
+    chunks = queue.artifact_chunks()
+    assert [c.artifact.parts[0].root.text for c in chunks[:2]] == ['0 ', '1 ']
+    # The second token is sent on the timer, not with the third.
+    assert agent.log.index(chunks[1]) < agent.log.index('token 2')
+
+
+def test_input_required_closes_the_streamed_artifact():
+    agent = ScriptedAgent(
+        [0, 0],
+        {
+            'is_task_complete': False,
+            'require_user_input': True,
+            'content': 'Which currency?',
+        },
+    )
+    queue = run(agent, stream_tokens=True)
+
+    chunks = queue.artifact_chunks()
+    assert chunks[-1].lastChunk is True
+    assert chunks[-1].append is True
+    status = queue.events[-1]
+    assert isinstance(status, TaskStatusUpdateEvent)
+    assert status.status.state == TaskState.input_required
+
+
+def test_without_token_streaming_one_artifact_is_sent():
+    agent = ScriptedAgent([0, 0], COMPLETED)
+    queue = run(agent)
+
+    [artifact] = queue.artifact_chunks()
+    assert artifact.artifact.parts[0].root.text == 'The rate is 0.88'
@@ -0,0 +1,179 @@
+"""Test cases for the LangGraph currency agent"""
+
+import asyncio
+import json
+import uuid
+
+import httpx
+import pytest
+
+from agents.langgraph.agent import currency
+from common.utils.exchange_rates import ExchangeRateService
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, ToolMessage
+from langchain_core.outputs import (
+    ChatGeneration,
+    ChatGenerationChunk,
+    ChatResult,
+)
+from langchain_core.runnables import RunnableLambda
+from langgraph.checkpoint.memory import MemorySaver
+
+
+LATENCY = 0.05
+NUM_SESSIONS = 50
+
+
+# Model calls waiting at once, and the most seen since the last reset.
+in_flight = {'now': 0, 'peak': 0}
+
+
+async def remote_call():
+    """Waits LATENCY seconds without blocking, like a remote model."""
+    in_flight['now'] += 1
+    in_flight['peak'] = max(in_flight['peak'], in_flight['now'])
+    try:
+        await asyncio.sleep(LATENCY)
+    finally:
+        in_flight['now'] -= 1
+
+
+TOOL_CALL = {
+    'name': 'get_exchange_rate',
+    'args': {'currency_from': 'USD', 'currency_to': 'EUR'},
+}
+
+
+class FakeCurrencyModel(BaseChatModel):
+    """Calls the exchange rate tool once, then answers with its result.
+
+    Every call is a remote_call, and streamed answers arrive word by word.
+    """
+
+    @property
+    def _llm_type(self) -> str:
+        return 'fake-currency'
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def with_structured_output(self, schema, **kwargs):
+        async def respond(messages):
+            await remote_call()
+            return schema(status='completed', message=messages[-1].content)
+
+        return RunnableLambda(respond)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        raise NotImplementedError('the agent must not call the model sync')
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        await remote_call()
+        if isinstance(messages[-1], ToolMessage):
+            message = AIMessage(content=answer(messages[-1].content))
+        else:
+            message = AIMessage(
+                content='',
+                tool_calls=[{**TOOL_CALL, 'id': str(uuid.uuid4())}],
+            )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        if not isinstance(messages[-1], ToolMessage):
+            await remote_call()
+            chunk = AIMessageChunk(
+                content='',
+                tool_call_chunks=[
+                    {
+                        'name': TOOL_CALL['name'],
+                        'args': json.dumps(TOOL_CALL['args']),
+                        'id': str(uuid.uuid4()),
+                        'index': 0,
+                    }
+                ],
+            )
+            yield ChatGenerationChunk(message=chunk)
+            return
+        for word in answer(messages[-1].content).split(' '):
+            await asyncio.sleep(LATENCY / 10)
+            chunk = AIMessageChunk(content=f'{word} ')
+            yield ChatGenerationChunk(message=chunk)
+
+
+def answer(tool_result: str) -> str:
+    rate = json.loads(tool_result)['rates']['EUR']
+    return f'One US dollar is worth {rate} euros today'
+
+
+async def rates_api(request: httpx.Request) -> httpx.Response:
+    await asyncio.sleep(LATENCY)
+    return httpx.Response(
+        200,
+        json={
+            'amount': 1.0,
+            'base': request.url.params['from'],
+            'date': '2025-06-02',
+            'rates': {'EUR': 0.88, 'GBP': 0.74},
+        },
+    )
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    monkeypatch.setitem(in_flight, 'peak', 0)
+    monkeypatch.setattr(
+        currency,
+        'rates',
+        ExchangeRateService(
+            http_client=httpx.AsyncClient(
+                transport=httpx.MockTransport(rates_api)
+            )
+        ),
+    )
+    return currency.CurrencyAgent(
+        model=FakeCurrencyModel(), checkpointer=MemorySaver()
+    )
+
+
+async def converse(agent, session_id: str, **kwargs) -> list[dict]:
+    return [
+        item
+        async for item in agent.stream(
+            'How much is 1 USD in EUR?', session_id, **kwargs
+        )
+    ]
+
+
+def test_stream_reports_progress_and_result(agent):
+    items = asyncio.run(converse(agent, 'session'))
+
+    assert [item['content'] for item in items[:2]] == [
+        'Looking up the exchange rates...',
+        'Processing the exchange rates..',
+    ]
+    assert items[-1]['is_task_complete']
+    assert '0.88' in items[-1]['content']
+
+
+def test_stream_tokens_of_the_answer(agent):
+    items = asyncio.run(converse(agent, 'session', stream_tokens=True))
+
+    tokens = [item['content'] for item in items if item.get('is_token')]
+    assert len(tokens) > 1
+    assert ''.join(tokens).strip() == 'One US dollar is worth 0.88 euros today'
+    # Tokens come before the final response.
+    assert not items[-1].get('is_token')
+    assert items[-1]['is_task_complete']
+
+
+def test_concurrent_sessions_overlap(agent):
+    """Sessions wait on the model together, none blocks the event loop."""
+
+    async def run():
+        return await asyncio.gather(
+            *(converse(agent, f'session-{i}') for i in range(NUM_SESSIONS))
+        )
+
+    results = asyncio.run(run())
+    assert all(items[-1]['is_task_complete'] for items in results)
+    assert in_flight['peak'] > 1
@@ -0,0 +1,152 @@
+"""Test cases for remote agent health tracking and hedged task reads"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from a2a.types import AgentCapabilities, AgentCard, Task
+from hosts.multiagent.agent_health import AgentHealth, CircuitState
+from hosts.multiagent.remote_agent_connection import (
+    RemoteAgentConnections,
+    RemoteAgentUnavailableError,
+)
+
+
+CARD = AgentCard(
+    name='remote',
+    description='A remote agent',
+    url='http://remote/',
+    version='1.0.0',
+    capabilities=AgentCapabilities(streaming=False),
+    defaultInputModes=['text'],
+    defaultOutputModes=['text'],
+    skills=[],
+)
+
+
+def task_response(request: httpx.Request) -> httpx.Response:
+    body = json.loads(request.content)
+    return httpx.Response(
+        200,
+        json={
+            'jsonrpc': '2.0',
+            'id': body['id'],
+            'result': {
+                'kind': 'task',
+                'id': body['params']['id'],
+                'contextId': 'context',
+                'status': {'state': 'working'},
+            },
+        },
+    )
+
+
+# --- Test Cases ---
+
+
+def test_circuit_opens_after_failures_and_recovers():
+    """The breaker opens on errors, probes once, and closes on success."""
+    health = AgentHealth(min_calls=3, open_seconds=0.0)
+    for _ in range(3):
+        health.record_failure()
+    assert health.state == CircuitState.OPEN
+    assert not health.healthy
+    # open_seconds elapsed, a single probe is let through.
+    assert health.allow_request()
+    assert health.state == CircuitState.HALF_OPEN
+    assert not health.allow_request()
+    health.record_success(0.1)
+    assert health.state == CircuitState.CLOSED
+    assert health.latency_ewma == pytest.approx(0.1)
+
+
+def test_p95_latency():
+    """p95 comes from the recent latency window."""
+    health = AgentHealth()
+    assert health.p95_latency() is None
+    for i in range(100):
+        health.record_success(i / 100)
+    assert health.p95_latency() == pytest.approx(0.95)
+
+
+def test_get_task_hedges_slow_attempt():
+    """A second tasks/get is sent when the first is slower than the hedge."""
+    calls = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(5)
+        return task_response(request)
+
+    async def get_task():
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        ) as client:
+            connection = RemoteAgentConnections(client, CARD, hedge_delay=0.05)
+            return await asyncio.wait_for(connection.get_task('task-1'), 1)
+
+    task = asyncio.run(get_task())
+    assert isinstance(task, Task)
+    assert task.id == 'task-1'
+    assert calls == 2
+
+
+def test_open_circuit_rejects_requests():
+    """Requests fail fast while the agent's circuit is open."""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError('refused')
+
+    async def run():
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        ) as client:
+            connection = RemoteAgentConnections(
+                client, CARD, health=AgentHealth(min_calls=2, open_seconds=60)
+            )
+            for _ in range(2):
+                with pytest.raises(Exception):
+                    await connection.get_task('task-1')
+            assert connection.health.state == CircuitState.OPEN
+            with pytest.raises(RemoteAgentUnavailableError):
+                await connection.get_task('task-1')
+
+    asyncio.run(run())
+
+
+def test_hedged_attempts_must_be_positive():
+    """A connection that would never send a request is rejected."""
+    with pytest.raises(ValueError):
+        RemoteAgentConnections(httpx.AsyncClient(), CARD, hedged_attempts=0)
+
+
+def test_half_open_probe_is_not_hedged():
+    """Only the probe is sent while the circuit is half open."""
+    calls = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.2)
+        return task_response(request)
+
+    async def run():
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        ) as client:
+            health = AgentHealth(min_calls=1, open_seconds=0.0)
+            health.record_failure()
+            connection = RemoteAgentConnections(
+                client, CARD, hedge_delay=0.01, health=health
+            )
+            task = await connection.get_task('task-1')
+            assert health.state == CircuitState.CLOSED
+            return task
+
+    task = asyncio.run(run())
+    assert task.id == 'task-1'
+    assert calls == 1
@@ -0,0 +1,151 @@
+"""Test cases for the SQLite LangGraph checkpointer"""
+
+import ormsgpack
+
+from langchain_core.messages import AIMessage
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import START, MessagesState, StateGraph
+
+from common.utils.sqlite_checkpointer import SqliteCheckpointSaver
+
+
+def reply(state: MessagesState):
+    turn = len(state['messages']) // 2
+    return {'messages': [AIMessage(content=f'reply {turn} ' * 20)]}
+
+
+def make_graph(checkpointer):
+    builder = StateGraph(MessagesState)
+    builder.add_node('reply', reply)
+    builder.add_edge(START, 'reply')
+    return builder.compile(checkpointer=checkpointer)
+
+
+def converse(graph, thread_id: str, turns: int, first: int = 0):
+    config = {'configurable': {'thread_id': thread_id}}
+    for turn in range(first, first + turns):
+        graph.invoke({'messages': [('user', f'question {turn}')]}, config)
+    return graph.get_state(config)
+
+
+def contents(state) -> list[str]:
+    return [m.content for m in state.values['messages']]
+
+
+def message_blobs(saver: SqliteCheckpointSaver, thread_id: str):
+    return saver.conn.execute(
+        "SELECT kind, depth, length FROM blobs WHERE thread_id = ? AND "
+        "channel = 'messages' ORDER BY version",
+        (thread_id,),
+    ).fetchall()
+
+
+def test_state_survives_a_restart(tmp_path):
+    path = str(tmp_path / 'checkpoints.db')
+    expected = contents(converse(make_graph(MemorySaver()), 'thread', 6))
+
+    with SqliteCheckpointSaver(path) as saver:
+        converse(make_graph(saver), 'thread', 3)
+    with SqliteCheckpointSaver(path) as saver:
+        state = converse(make_graph(saver), 'thread', 3, first=3)
+
+    assert contents(state) == expected
+
+
+def test_growing_messages_are_delta_encoded():
+    saver = SqliteCheckpointSaver(max_checkpoints=100)
+    state = converse(make_graph(saver), 'thread', 10)
+
+    blobs = message_blobs(saver, 'thread')
+    assert blobs[0][0] == 'list'
+    assert all(kind == 'delta' for kind, _, _ in blobs[1:])
+    assert blobs[-1][2] == 20
+    stored = saver.conn.execute(
+        "SELECT sum(length(data)) FROM blobs WHERE channel = 'messages'"
+    ).fetchone()[0]
+    full = len(
+        ormsgpack.packb(
+            [list(saver.serde.dumps_typed(m)) for m in state.values['messages']]
+        )
+    )
+    # Each message is stored once, where whole versions would store the
+    # list about ten times over.
+    assert stored < 1.5 * full
+
+
+def test_keyframes_bound_delta_chains():
+    saver = SqliteCheckpointSaver(max_checkpoints=100, keyframe_interval=4)
+    state = converse(make_graph(saver), 'thread', 10)
+
+    blobs = message_blobs(saver, 'thread')
+    assert max(depth for _, depth, _ in blobs) == 3
+    assert [kind for kind, _, _ in blobs].count('list') > 1
+    assert len(contents(state)) == 20
+
+
+def test_retention_compacts_old_checkpoints():
+    saver = SqliteCheckpointSaver(max_checkpoints=3, keyframe_interval=8)
+    graph = make_graph(saver)
+    expected = contents(converse(make_graph(MemorySaver()), 'thread', 12))
+    state = converse(graph, 'thread', 12)
+
+    config = {'configurable': {'thread_id': 'thread'}}
+    assert len(list(saver.list(config))) == 3
+    assert contents(state) == expected
+    # Only the values the kept checkpoints need remain, back to their
+    # keyframe.
+    assert len(message_blobs(saver, 'thread')) <= 8 + 3
+    writes = saver.conn.execute('SELECT count(*) FROM writes').fetchone()[0]
+    assert writes <= 3 * 2
+
+
+def test_compaction_cost_does_not_grow_with_the_thread():
+    saver = SqliteCheckpointSaver(max_checkpoints=3, keyframe_interval=8)
+    graph = make_graph(saver)
+    converse(graph, 'thread', 5)
+    statements = []
+    saver.conn.set_trace_callback(statements.append)
+
+    counts = []
+    for turn in range(5, 40):
+        statements.clear()
+        converse(graph, 'thread', 1, first=turn)
+        counts.append(len(statements))
+    # Statements per turn cycle with the keyframes, but do not grow.
+    assert max(counts[-8:]) <= max(counts[:8])
+    # Values are looked up by channel, never by scanning the whole thread.
+    assert not any(
+        'FROM blobs' in sql and 'channel =' not in sql for sql in statements
+    )
+
+
+def test_agents_sharing_a_file_keep_their_own_threads(tmp_path):
+    path = str(tmp_path / 'checkpoints.db')
+    # A host sends the same contextId, the thread id, to every agent.
+    config = {'configurable': {'thread_id': 'context'}}
+    currency = SqliteCheckpointSaver(path, namespace='currency')
+    weather = SqliteCheckpointSaver(path, namespace='weather')
+    converse(make_graph(currency), 'context', 2)
+    converse(make_graph(weather), 'context', 1)
+
+    assert len(contents(make_graph(currency).get_state(config))) == 4
+    assert len(contents(make_graph(weather).get_state(config))) == 2
+    assert len(list(weather.list(None))) == 3
+    weather.delete_thread('context')
+    assert weather.get_tuple(config) is None
+    assert currency.get_tuple(config) is not None
+    currency.close()
+    weather.close()
+
+
+def test_idle_threads_are_pruned():
+    saver = SqliteCheckpointSaver(thread_ttl=3600)
+    converse(make_graph(saver), 'old', 1)
+    converse(make_graph(saver), 'new', 1)
+    saver.conn.execute(
+        "UPDATE threads SET updated = 0 WHERE thread_id = 'old'"
+    )
+
+    assert saver.prune_idle() == 1
+    assert saver.get_tuple({'configurable': {'thread_id': 'old'}}) is None
+    assert saver.get_tuple({'configurable': {'thread_id': 'new'}}) is not None
@@ -0,0 +1,181 @@
+"""Test cases for the cached Tavily search service and the ResearchAgent"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from agents.langgraph.agent import researcher
+from common.utils.web_search import TavilySearchService, normalize_query
+
+
+LATENCY = 0.05
+
+# A Tavily response recorded for a marketplace query, trimmed.
+RECORDED = {
+    'query': 'fitcloud 마켓플레이스 서비스 백업',
+    'answer': 'FitCloud offers managed backup services.',
+    'results': [
+        {
+            'title': 'AWS Backup 관리형 서비스',
+            'url': 'https://www.fitcloud.co.kr/marketplace/backup',
+            'content': '정책 기반으로 AWS 리소스를 자동 백업합니다.\n' * 20,
+            'score': 0.82,
+            'raw_content': '백업 ' * 5000,
+        },
+        {
+            'title': '재해 복구 컨설팅',
+            'url': 'https://www.fitcloud.co.kr/marketplace/dr',
+            'content': '멀티 리전 재해 복구 아키텍처를 설계합니다.',
+            'score': 0.64,
+            'raw_content': None,
+        },
+        {
+            'title': 'FitCloud 소개',
+            'url': 'https://www.fitcloud.co.kr/',
+            'content': 'FitCloud 클라우드 비용 관리 플랫폼',
+            'score': 0.12,
+            'raw_content': None,
+        },
+    ],
+    'response_time': 1.42,
+}
+
+
+class RecordedTavily:
+    """Replays the recorded response and counts the searches made."""
+
+    def __init__(self, latency: float = 0.0, failures: int = 0):
+        self.latency = latency
+        self.failures = failures
+        self.queries: list[str] = []
+        self.active = 0
+        self.max_active = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        self.queries.append(body['query'])
+        assert request.headers['Authorization'] == 'Bearer test-key'
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(self.latency)
+        self.active -= 1
+        if self.failures:
+            self.failures -= 1
+            return httpx.Response(500)
+        return httpx.Response(200, json={**RECORDED, 'query': body['query']})
+
+
+def make_service(api: RecordedTavily, **kwargs) -> TavilySearchService:
+    return TavilySearchService(
+        api_key='test-key',
+        base_url='http://tavily.local',
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(api)),
+        **kwargs,
+    )
+
+
+def test_normalize_query():
+    assert normalize_query('  AWS   Backup\n') == 'aws backup'
+    assert normalize_query('ＡＷＳ Backup') == 'aws backup'
+
+
+def test_equivalent_queries_are_searched_once():
+    api = RecordedTavily()
+    service = make_service(api, search_depth='advanced')
+
+    async def run():
+        first = await service.search('AWS Backup')
+        second = await service.search('aws  backup ')
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first is second
+    assert api.queries == ['aws backup']
+
+
+def test_results_expire():
+    api = RecordedTavily()
+    service = make_service(api, ttl=0)
+
+    async def run():
+        await service.search('backup')
+        await service.search('backup')
+
+    asyncio.run(run())
+    assert len(api.queries) == 2
+
+
+def test_failures_are_not_cached():
+    api = RecordedTavily(failures=1)
+    service = make_service(api)
+
+    async def run():
+        with pytest.raises(httpx.HTTPStatusError):
+            await service.search('backup')
+        return await service.search('backup')
+
+    assert len(asyncio.run(run())) == 3
+    assert len(api.queries) == 2
+
+
+def test_search_many_runs_queries_concurrently():
+    api = RecordedTavily(latency=LATENCY)
+    service = make_service(api, max_concurrency=3)
+
+    results = asyncio.run(
+        service.search_many(
+            ['backup', 'dr', 'monitoring', 'security', 'Backup']
+        )
+    )
+    assert len(results) == 5
+    assert results[0] is results[4]
+    assert sorted(api.queries) == ['backup', 'dr', 'monitoring', 'security']
+    # At most three at a time, not one after the other.
+    assert api.max_active == 3
+
+
+def test_service_runs_on_several_event_loops():
+    api = RecordedTavily(latency=LATENCY)
+    service = make_service(api, max_concurrency=1, ttl=0)
+
+    # A contended semaphore or a pending search would be bound to the
+    # first loop.
+    for _ in range(2):
+        asyncio.run(service.search_many(['backup', 'dr']))
+    assert api.max_active == 1
+    assert len(api.queries) == 4
+
+
+@pytest.fixture
+def search_api(monkeypatch):
+    api = RecordedTavily(latency=LATENCY)
+    monkeypatch.setenv('TAVILY_API_KEY', 'test-key')
+    monkeypatch.setattr(researcher, 'search_service', make_service(api))
+    return api
+
+
+def test_marketplace_search_formats_the_best_results(search_api):
+    output = asyncio.run(
+        researcher.search_fitcloud_marketplace.ainvoke({'query': '백업'})
+    )
+
+    assert search_api.queries == ['fitcloud 마켓플레이스 서비스 백업']
+    assert output.index('AWS Backup') < output.index('재해 복구 컨설팅')
+    # Results scoring under 0.3 and raw page content are left out.
+    assert 'FitCloud 소개' not in output
+    assert '백업 백업' not in output
+    assert '...' in output
+
+
+def test_comparisons_are_searched_in_parallel(search_api):
+    output = asyncio.run(
+        researcher.search_fitcloud_marketplace.ainvoke(
+            {'query': '백업', 'compare_with': ['재해 복구', '모니터링']}
+        )
+    )
+    assert len(search_api.queries) == 3
+    assert search_api.max_active == 3
+    for query in ['백업', '재해 복구', '모니터링']:
+        assert f"'{query}'에 대한" in output